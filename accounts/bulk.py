@@ -0,0 +1,148 @@
+"""
+Bulk user creation for POST /users/bulk.
+
+Rows come as a JSON array or NDJSON and are validated one by one, so a bad row
+fails alone. Existing usernames are found with a single username__in query.
+Passwords are hashed in a thread pool: PBKDF2 (hashlib) releases the GIL, so
+hashes run on all cores. Valid rows are inserted with bulk_create (multi-row
+INSERT ... RETURNING id).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import msgspec
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import IntegrityError
+
+from accounts.create import normalize_user_fields
+from accounts.models import Role
+from accounts.schemas import UserBulkResultSchema, UserBulkRowSchema, UserCreateSchema
+
+User = get_user_model()
+
+VALID_ROLES = {Role.ADMIN, Role.SHOPKEEPER, Role.CUSTOMER}
+MAX_BULK_ROWS = 10_000
+INSERT_BATCH_SIZE = 1000
+USERNAME_MAX_LENGTH = User._meta.get_field("username").max_length
+
+_hash_pool = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 4, thread_name_prefix="password-hash"
+)
+_row_decoder = msgspec.json.Decoder(UserCreateSchema)
+_array_decoder = msgspec.json.Decoder(list[msgspec.Raw])
+
+
+def split_rows(body: bytes) -> list[bytes]:
+    """Split a JSON array or NDJSON body into raw row documents."""
+    stripped = body.lstrip()
+    if stripped.startswith(b"["):
+        try:
+            return [bytes(raw) for raw in _array_decoder.decode(stripped)]
+        except msgspec.DecodeError as e:
+            raise ValueError(f"Invalid JSON array: {e}") from None
+    return [line for line in body.splitlines() if line.strip()]
+
+
+def _validate(
+    rows: list[bytes],
+) -> tuple[list[tuple[int, UserCreateSchema]], dict[int, str]]:
+    valid: list[tuple[int, UserCreateSchema]] = []
+    errors: dict[int, str] = {}
+    seen: set[str] = set()
+    for i, raw in enumerate(rows):
+        try:
+            row = _row_decoder.decode(raw)
+        except msgspec.DecodeError as e:
+            errors[i] = f"Invalid row: {e}"
+            continue
+        # Same normalization as POST /users (accounts.create)
+        row.username, row.email = normalize_user_fields(row.username, row.email)
+        row.role = (row.role or Role.CUSTOMER).strip().upper()
+        if not row.username or not row.password:
+            errors[i] = "username and password are required"
+        elif len(row.username) > USERNAME_MAX_LENGTH:
+            errors[i] = f"username longer than {USERNAME_MAX_LENGTH} characters"
+        elif row.role not in VALID_ROLES:
+            errors[i] = f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}"
+        elif row.username in seen:
+            errors[i] = "Duplicate username in request"
+        else:
+            seen.add(row.username)
+            valid.append((i, row))
+    return valid, errors
+
+
+async def _hash_passwords(passwords: list[str]) -> list[str]:
+    loop = asyncio.get_running_loop()
+    return await asyncio.gather(
+        *(loop.run_in_executor(_hash_pool, make_password, p) for p in passwords)
+    )
+
+
+async def _existing_usernames(usernames: list[str]) -> set[str]:
+    return {
+        name
+        async for name in User.objects.filter(username__in=usernames).values_list(
+            "username", flat=True
+        )
+    }
+
+
+async def bulk_create_users(body: bytes) -> UserBulkResultSchema:
+    """Create users from a JSON array / NDJSON body; returns per-row results."""
+    start = time.perf_counter()
+    rows = split_rows(body)
+    if len(rows) > MAX_BULK_ROWS:
+        raise ValueError(f"Too many rows: {len(rows)} (max {MAX_BULK_ROWS})")
+    valid, errors = _validate(rows)
+
+    existing = await _existing_usernames([row.username for _, row in valid])
+    for i, row in valid:
+        if row.username in existing:
+            errors[i] = "Username already exists"
+    valid = [(i, row) for i, row in valid if i not in errors]
+
+    hashes = await _hash_passwords([row.password for _, row in valid])
+    users = [
+        User(username=row.username, password=h, email=row.email, role=row.role)
+        for (_, row), h in zip(valid, hashes)
+    ]
+    try:
+        created = await User.objects.abulk_create(users, batch_size=INSERT_BATCH_SIZE)
+    except IntegrityError:
+        # A concurrent request inserted some of these usernames: drop them, retry once.
+        taken = await _existing_usernames([u.username for u in users])
+        kept = []
+        for (i, row), user in zip(valid, users):
+            if row.username in taken:
+                errors[i] = "Username already exists"
+            else:
+                kept.append((i, row, user))
+        valid = [(i, row) for i, row, _ in kept]
+        created = await User.objects.abulk_create(
+            [user for _, _, user in kept], batch_size=INSERT_BATCH_SIZE
+        )
+
+    results: dict[int, UserBulkRowSchema] = {
+        i: UserBulkRowSchema(row=i, status="error", error=message)
+        for i, message in errors.items()
+    }
+    for (i, row), user in zip(valid, created):
+        results[i] = UserBulkRowSchema(
+            row=i, status="created", username=row.username, id=user.id
+        )
+    elapsed = time.perf_counter() - start
+    return UserBulkResultSchema(
+        created=len(created),
+        failed=len(errors),
+        elapsed_ms=round(elapsed * 1000, 2),
+        # Throughput counts created rows only; rejected rows cost no INSERT
+        rows_per_sec=round(len(created) / elapsed, 1) if elapsed > 0 else 0.0,
+        results=[results[i] for i in sorted(results)],
+    )
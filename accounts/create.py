@@ -0,0 +1,84 @@
+"""
+Single-statement user creation for POST /users (Bolt and DRF).
+
+The user row, role included, is written by one
+INSERT ... ON CONFLICT (username) DO NOTHING RETURNING id. A taken username,
+including one inserted by a concurrent request a moment earlier, returns no
+row instead of raising IntegrityError, so callers answer 400 rather than 500
+and never need an exists() query first. Password hashing and the INSERT share
+one sync_to_async call (Django has no async cursor).
+"""
+
+from __future__ import annotations
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.db import connections, router
+
+from accounts.models import Role
+
+User = get_user_model()
+
+
+class UsernameTaken(Exception):
+    """The username already exists."""
+
+
+_sql_cache: dict[str, tuple[str, tuple]] = {}
+
+
+def _insert_sql(connection) -> tuple[str, tuple]:
+    """INSERT statement for all non-pk columns of User (cached per database vendor)."""
+    if connection.vendor in _sql_cache:
+        return _sql_cache[connection.vendor]
+    quote = connection.ops.quote_name
+    fields = tuple(f for f in User._meta.concrete_fields if not f.primary_key)
+    columns = ", ".join(quote(f.column) for f in fields)
+    placeholders = ", ".join(["%s"] * len(fields))
+    username = quote(User._meta.get_field(User.USERNAME_FIELD).column)
+    sql = (
+        f"INSERT INTO {quote(User._meta.db_table)} ({columns}) VALUES ({placeholders}) "
+        f"ON CONFLICT ({username}) DO NOTHING RETURNING {quote(User._meta.pk.column)}"
+    )
+    _sql_cache[connection.vendor] = sql, fields
+    return sql, fields
+
+
+def normalize_user_fields(username: str, email: str = "") -> tuple[str, str]:
+    """Username and email as stored: stripped, NFKC username, lower-case email domain."""
+    return (
+        User.normalize_username(username.strip()),
+        User.objects.normalize_email((email or "").strip()),
+    )
+
+
+def insert_user(
+    username: str, password: str, email: str = "", role: str = Role.CUSTOMER
+) -> User | None:
+    """Hash the password and insert the user in one statement; None if the username is taken."""
+    username, email = normalize_user_fields(username, email)
+    user = User(username=username, email=email, role=role)
+    user.set_password(password)
+    alias = router.db_for_write(User)
+    connection = connections[alias]
+    sql, fields = _insert_sql(connection)
+    values = [f.get_db_prep_save(f.pre_save(user, True), connection) for f in fields]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, values)
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    user.pk = row[0]
+    user._state.adding = False
+    user._state.db = alias
+    return user
+
+
+async def create_user(
+    username: str, password: str, email: str = "", role: str = Role.CUSTOMER
+) -> User:
+    """Async insert_user; raises UsernameTaken on conflict."""
+    user = await sync_to_async(insert_user)(username, password, email, role)
+    if user is None:
+        raise UsernameTaken(username)
+    return user
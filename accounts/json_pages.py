@@ -0,0 +1,22 @@
+"""
+GET /users pages rendered by PostgreSQL (USERS_LIST_RENDER=db) for Bolt and DRF.
+
+The filtered QuerySet is compiled to SQL and wrapped by common.db_json.page_sql,
+so search / role filters stay the ORM's; one statement returns the count and
+the page's JSON array (one sync_to_async hop, no model instances).
+"""
+
+from __future__ import annotations
+
+from django.db import connections
+
+from common.db_json import page_sql
+
+
+def fetch_json_page(qs, limit: int, offset: int) -> tuple[int, str]:
+    """(total, JSON array text) of one page of a User queryset, ordered by id."""
+    qs = qs.order_by().values_list("id", "username", "role")
+    sql, params = qs.query.get_compiler(using=qs.db).as_sql()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(page_sql(sql, "%s", "%s"), (*params, limit, offset))
+        return cursor.fetchone()
@@ -0,0 +1,75 @@
+from django.db import migrations, models
+
+TABLE = "accounts_user"
+
+POSTGRES_TRIGGER = """
+CREATE OR REPLACE FUNCTION accounts_bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO accounts_tableversion (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, (extract(epoch FROM clock_timestamp()) * 1000000)::bigint, now())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = accounts_tableversion.version + 1, updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER accounts_user_version
+AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON accounts_user
+FOR EACH STATEMENT EXECUTE FUNCTION accounts_bump_table_version();
+"""
+
+POSTGRES_DROP = """
+DROP TRIGGER IF EXISTS accounts_user_version ON accounts_user;
+DROP FUNCTION IF EXISTS accounts_bump_table_version();
+"""
+
+# SQLite (USE_SQLITE_FOR_TESTS): row-level triggers, one per operation.
+SQLITE_UPSERT = """
+INSERT INTO accounts_tableversion (table_name, version, updated_at)
+VALUES ('{table}', CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER),
+        strftime('%Y-%m-%d %H:%M:%f', 'now'))
+ON CONFLICT (table_name) DO UPDATE
+SET version = version + 1, updated_at = excluded.updated_at;
+"""
+
+
+def create_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_TRIGGER)
+    elif vendor == "sqlite":
+        for op in ("INSERT", "UPDATE", "DELETE"):
+            schema_editor.execute(
+                f"CREATE TRIGGER {TABLE}_version_{op.lower()} AFTER {op} ON {TABLE} "
+                f"BEGIN {SQLITE_UPSERT.format(table=TABLE)} END"
+            )
+
+
+def drop_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP)
+    elif vendor == "sqlite":
+        for op in ("insert", "update", "delete"):
+            schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABLE}_version_{op}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TableVersion",
+            fields=[
+                (
+                    "table_name",
+                    models.CharField(max_length=63, primary_key=True, serialize=False),
+                ),
+                ("version", models.BigIntegerField()),
+                ("updated_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,135 @@
+"""
+accounts_user.role: nullable varchar(255) -> NOT NULL enum user_role (PostgreSQL).
+
+1. Backfill NULL, empty and non-canonical roles in batches of BATCH_SIZE rows,
+   one short transaction each, so the table is never locked for the whole pass.
+2. Create the enum type and convert the column (ALTER ... TYPE user_role USING
+   role::user_role, SET NOT NULL). This rewrites the table under an exclusive
+   lock; every row is already valid, so the cast cannot fail halfway.
+3. Build the covering indexes with CREATE INDEX CONCURRENTLY on PostgreSQL.
+
+The migration is non-atomic so that steps 1 and 3 can commit as they go.
+On SQLite (USE_SQLITE_FOR_TESTS) the column stays a varchar.
+"""
+
+from django.db import migrations, models, transaction
+
+import accounts.models
+
+TABLE = "accounts_user"
+ROLES = ("ADMIN", "SHOPKEEPER", "CUSTOMER")
+BATCH_SIZE = 10_000
+
+INDEXES = [
+    models.Index(
+        fields=["id"], include=["username", "role"], name="accounts_user_id_cover"
+    ),
+    models.Index(
+        fields=["role", "id"], include=["username"], name="accounts_user_role_id"
+    ),
+]
+
+
+def backfill_roles(apps, schema_editor):
+    """Set every role to an enum label: upper-cased if it matches one, else CUSTOMER."""
+    connection = schema_editor.connection
+    labels = ", ".join(f"'{r}'" for r in ROLES)
+    sql = (
+        f"UPDATE {TABLE} SET role = CASE WHEN UPPER(TRIM(role)) IN ({labels}) "
+        f"THEN UPPER(TRIM(role)) ELSE 'CUSTOMER' END "
+        f"WHERE id IN (SELECT id FROM {TABLE} WHERE role IS NULL OR role NOT IN ({labels}) "
+        f"ORDER BY id LIMIT {BATCH_SIZE})"
+    )
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(sql)
+            if cursor.rowcount < BATCH_SIZE:
+                return
+
+
+def role_field():
+    field = accounts.models.RoleField(
+        choices=[
+            ("ADMIN", "Administrator"),
+            ("SHOPKEEPER", "Shopkeeper"),
+            ("CUSTOMER", "Customer"),
+        ],
+        default="CUSTOMER",
+        max_length=16,
+    )
+    field.set_attributes_from_name("role")
+    return field
+
+
+def to_enum(apps, schema_editor):
+    model = apps.get_model("accounts", "User")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.alter_field(model, model._meta.get_field("role"), role_field())
+        return
+    labels = ", ".join(f"'{r}'" for r in ROLES)
+    with transaction.atomic(using=schema_editor.connection.alias):
+        schema_editor.execute(f"CREATE TYPE user_role AS ENUM ({labels})")
+        # Django adds USING only when the internal type changes; both are CharField
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN role TYPE user_role USING role::user_role, "
+            "ALTER COLUMN role SET NOT NULL"
+        )
+
+
+def to_varchar(apps, schema_editor):
+    model = apps.get_model("accounts", "User")
+    if schema_editor.connection.vendor != "postgresql":
+        schema_editor.alter_field(model, role_field(), model._meta.get_field("role"))
+        return
+    with transaction.atomic(using=schema_editor.connection.alias):
+        schema_editor.execute(
+            f"ALTER TABLE {TABLE} ALTER COLUMN role TYPE varchar(255) USING role::text, "
+            "ALTER COLUMN role DROP NOT NULL"
+        )
+        schema_editor.execute("DROP TYPE user_role")
+
+
+def add_indexes(apps, schema_editor):
+    model = apps.get_model("accounts", "User")
+    concurrently = schema_editor.connection.vendor == "postgresql"
+    for index in INDEXES:
+        if concurrently:
+            schema_editor.add_index(model, index, concurrently=True)
+        else:
+            schema_editor.add_index(model, index)
+
+
+def remove_indexes(apps, schema_editor):
+    model = apps.get_model("accounts", "User")
+    concurrently = schema_editor.connection.vendor == "postgresql"
+    for index in INDEXES:
+        if concurrently:
+            schema_editor.remove_index(model, index, concurrently=True)
+        else:
+            schema_editor.remove_index(model, index)
+
+
+class Migration(migrations.Migration):
+    atomic = False
+
+    dependencies = [
+        ("accounts", "0002_tableversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_roles, migrations.RunPython.noop),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(to_enum, to_varchar)],
+            state_operations=[
+                migrations.AlterField(
+                    model_name="user", name="role", field=role_field()
+                ),
+            ],
+        ),
+        migrations.SeparateDatabaseAndState(
+            database_operations=[migrations.RunPython(add_indexes, remove_indexes)],
+            state_operations=[
+                migrations.AddIndex(model_name="user", index=index) for index in INDEXES
+            ],
+        ),
+    ]
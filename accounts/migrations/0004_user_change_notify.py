@@ -0,0 +1,79 @@
+"""
+NOTIFY accounts_user_changed after every write to accounts_user (PostgreSQL).
+
+Statement-level triggers with transition tables, so a bulk insert sends one
+notification. The payload is the comma-separated ids of the changed rows, or
+"*" for TRUNCATE and when the ids do not fit in a NOTIFY payload. Notifications
+are sent on commit and identical ones in a transaction are merged. Each worker's
+response cache listens on the channel (common/invalidation.py). Nothing on
+SQLite: there is no LISTEN there and the cache falls back to its TTL.
+"""
+
+from django.db import migrations
+
+POSTGRES_TRIGGERS = """
+CREATE OR REPLACE FUNCTION accounts_user_notify() RETURNS trigger AS $$
+DECLARE
+    ids text;
+BEGIN
+    IF TG_OP = 'INSERT' OR TG_OP = 'UPDATE' THEN
+        SELECT string_agg(id::text, ',') INTO ids FROM changed_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT string_agg(id::text, ',') INTO ids FROM removed_rows;
+    ELSE
+        ids := '*';
+    END IF;
+    IF ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+    IF octet_length(ids) > 7900 THEN
+        ids := '*';
+    END IF;
+    PERFORM pg_notify('accounts_user_changed', ids);
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER accounts_user_notify_insert AFTER INSERT ON accounts_user
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounts_user_notify();
+
+CREATE TRIGGER accounts_user_notify_update AFTER UPDATE ON accounts_user
+REFERENCING NEW TABLE AS changed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounts_user_notify();
+
+CREATE TRIGGER accounts_user_notify_delete AFTER DELETE ON accounts_user
+REFERENCING OLD TABLE AS removed_rows
+FOR EACH STATEMENT EXECUTE FUNCTION accounts_user_notify();
+
+CREATE TRIGGER accounts_user_notify_truncate AFTER TRUNCATE ON accounts_user
+FOR EACH STATEMENT EXECUTE FUNCTION accounts_user_notify();
+"""
+
+POSTGRES_DROP = """
+DROP TRIGGER IF EXISTS accounts_user_notify_insert ON accounts_user;
+DROP TRIGGER IF EXISTS accounts_user_notify_update ON accounts_user;
+DROP TRIGGER IF EXISTS accounts_user_notify_delete ON accounts_user;
+DROP TRIGGER IF EXISTS accounts_user_notify_truncate ON accounts_user;
+DROP FUNCTION IF EXISTS accounts_user_notify();
+"""
+
+
+def create_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_TRIGGERS)
+
+
+def drop_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(POSTGRES_DROP)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0003_user_role_enum"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_triggers, drop_triggers),
+    ]
@@ -0,0 +1,125 @@
+"""
+Spread the accounts_user change counter over TABLE_VERSION_SLOTS rows.
+
+With one row per table every write to accounts_user upserted the same row and
+held its lock until commit, so concurrent writers on all stacks queued behind
+each other. The trigger now bumps the row of slot pg_backend_pid() % SLOTS, so
+two transactions only wait for each other when their backends share a slot.
+Readers take sum(version) and max(updated_at) over the slots
+(TableVersion.aget); the counter stays transactional, so an ETag still never
+runs ahead of the data it tags.
+"""
+
+from django.db import migrations, models
+
+TABLE = "accounts_user"
+
+TABLE_VERSION_SLOTS = 32
+
+POSTGRES_FUNCTION = f"""
+CREATE OR REPLACE FUNCTION accounts_bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO accounts_tableversion (table_name, slot, version, updated_at)
+    VALUES (TG_TABLE_NAME, pg_backend_pid() % {TABLE_VERSION_SLOTS},
+            (extract(epoch FROM clock_timestamp()) * 1000000)::bigint, now())
+    ON CONFLICT (table_name, slot) DO UPDATE
+    SET version = accounts_tableversion.version + 1, updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# 0002's single-row function, restored when migrating backwards.
+POSTGRES_FUNCTION_SINGLE_ROW = """
+CREATE OR REPLACE FUNCTION accounts_bump_table_version() RETURNS trigger AS $$
+BEGIN
+    INSERT INTO accounts_tableversion (table_name, version, updated_at)
+    VALUES (TG_TABLE_NAME, (extract(epoch FROM clock_timestamp()) * 1000000)::bigint, now())
+    ON CONFLICT (table_name) DO UPDATE
+    SET version = accounts_tableversion.version + 1, updated_at = EXCLUDED.updated_at;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+"""
+
+# SQLite has a single writer: everything goes to slot 0.
+SQLITE_UPSERT = """
+INSERT INTO accounts_tableversion (table_name, slot, version, updated_at)
+VALUES ('{table}', 0, CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER),
+        strftime('%Y-%m-%d %H:%M:%f', 'now'))
+ON CONFLICT (table_name, slot) DO UPDATE
+SET version = version + 1, updated_at = excluded.updated_at;
+"""
+
+SQLITE_UPSERT_SINGLE_ROW = """
+INSERT INTO accounts_tableversion (table_name, version, updated_at)
+VALUES ('{table}', CAST((julianday('now') - 2440587.5) * 86400000000 AS INTEGER),
+        strftime('%Y-%m-%d %H:%M:%f', 'now'))
+ON CONFLICT (table_name) DO UPDATE
+SET version = version + 1, updated_at = excluded.updated_at;
+"""
+
+
+def _sqlite_triggers(schema_editor, upsert: str) -> None:
+    for op in ("INSERT", "UPDATE", "DELETE"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {TABLE}_version_{op.lower()}")
+        schema_editor.execute(
+            f"CREATE TRIGGER {TABLE}_version_{op.lower()} AFTER {op} ON {TABLE} "
+            f"BEGIN {upsert.format(table=TABLE)} END"
+        )
+
+
+def slotted_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        # params=None: the driver must not read the modulo "%" as a placeholder
+        schema_editor.execute(POSTGRES_FUNCTION, params=None)
+    elif vendor == "sqlite":
+        _sqlite_triggers(schema_editor, SQLITE_UPSERT)
+
+
+def single_row_triggers(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(POSTGRES_FUNCTION_SINGLE_ROW)
+    elif vendor == "sqlite":
+        _sqlite_triggers(schema_editor, SQLITE_UPSERT_SINGLE_ROW)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("accounts", "0004_user_change_notify"),
+    ]
+
+    # The counter restarts from the current time in microseconds, so versions
+    # issued before this migration are not reused.
+    operations = [
+        migrations.DeleteModel(name="TableVersion"),
+        migrations.CreateModel(
+            name="TableVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("table_name", models.CharField(max_length=63)),
+                ("slot", models.SmallIntegerField()),
+                ("version", models.BigIntegerField()),
+                ("updated_at", models.DateTimeField()),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("table_name", "slot"),
+                        name="accounts_tableversion_slot",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(slotted_triggers, single_row_triggers),
+    ]
@@ -9,17 +9,82 @@ class Role(models.TextChoices):
     CUSTOMER = "CUSTOMER", "Customer"
 
 
+class RoleField(models.CharField):
+    """
+    Role column: the PostgreSQL enum user_role (4 bytes, created by migration
+    0003) and a plain varchar elsewhere. Values read and write as strings.
+    """
+
+    def db_type(self, connection):
+        if connection.vendor == "postgresql":
+            return "user_role"
+        return super().db_type(connection)
+
+
 class User(AbstractUser):
-    role = models.CharField(
-        max_length=255,
+    role = RoleField(
+        max_length=16,
         choices=Role.choices,
         default=Role.CUSTOMER,
-        null=True,
-        blank=True,
     )
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # List / batch / get read (id, username, role) with index-only scans
+            models.Index(
+                fields=["id"],
+                include=["username", "role"],
+                name="accounts_user_id_cover",
+            ),
+            # ?role= filters, ordered by id for pagination
+            models.Index(
+                fields=["role", "id"],
+                include=["username"],
+                name="accounts_user_role_id",
+            ),
+        ]
+
     def __str__(self):
         return self.username
 
     def get_role_display(self):
         return self.role
+
+
+class TableVersion(models.Model):
+    """
+    Change counter per table, for ETag / Last-Modified (common/etag.py).
+
+    A database trigger (migrations 0002, 0005) bumps a row on every INSERT,
+    UPDATE, DELETE or TRUNCATE of the table, so writes from any stack count.
+    The counter is split into slots (one per backend, pg_backend_pid() % 32)
+    so concurrent writers do not queue on a single row lock; the table's
+    version is the sum over its slots. A new slot starts at the current time
+    in microseconds, so versions are not reused after the table is recreated.
+    """
+
+    table_name = models.CharField(max_length=63)
+    slot = models.SmallIntegerField()
+    version = models.BigIntegerField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["table_name", "slot"], name="accounts_tableversion_slot"
+            ),
+        ]
+
+    @classmethod
+    async def aget(cls, table_name: str, using: str = "default"):
+        """(version, updated_at) of table_name, or None before its first write."""
+        state = (
+            await cls.objects.using(using)
+            .filter(table_name=table_name)
+            .aaggregate(
+                version=models.Sum("version"), updated_at=models.Max("updated_at")
+            )
+        )
+        if state["version"] is None:
+            return None
+        return state["version"], state["updated_at"]
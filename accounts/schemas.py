@@ -44,10 +44,17 @@ class UserSchema(msgspec.Struct):
         return cls(
             id=user.id,
             username=user.username,
-            role=user.role or Role.CUSTOMER,
+            role=user.role,
         )
 
 
+class UserBatchSchema(msgspec.Struct):
+    """Response for GET /users/batch: users in request order, ids not found."""
+
+    items: list[UserSchema]
+    missing: list[int]
+
+
 class UserCreateSchema(msgspec.Struct):
     """Request body for POST /users (create user)."""
 
@@ -57,6 +64,26 @@ class UserCreateSchema(msgspec.Struct):
     role: str = Role.CUSTOMER
 
 
+class UserBulkRowSchema(msgspec.Struct, omit_defaults=True):
+    """Result of one row of POST /users/bulk (row = 0-based input position)."""
+
+    row: int
+    status: str
+    username: str | None = None
+    id: int | None = None
+    error: str | None = None
+
+
+class UserBulkResultSchema(msgspec.Struct):
+    """Response for POST /users/bulk."""
+
+    created: int
+    failed: int
+    elapsed_ms: float
+    rows_per_sec: float
+    results: list[UserBulkRowSchema]
+
+
 # User schema for Django Admin
 class UserAdminSchema(msgspec.Struct):
     id: int
@@ -3,8 +3,8 @@ API package – BoltAPI instance and route registration.
 
 Structure:
   api/
-    __init__.py   # BoltAPI, middleware, register all routes
-    middleware.py # Server time / response time headers
+    __init__.py   # BoltAPI, middleware sub-app, register all routes
+    middleware.py # Server time / response time headers, response micro-cache, conditional GET (ETag)
     routes/
       health.py   # /health, /ready
       auth.py     # POST /auth/login
@@ -14,12 +14,27 @@ Structure:
 
 from django_bolt import BoltAPI
 
-from api.middleware import ServerTimeMiddleware
+from api.middleware import (
+    ConditionalGetMiddleware,
+    ResponseCacheMiddleware,
+    ServerTimeMiddleware,
+)
 from api.openapi_config import get_openapi_config
-from api.routes import register_all_routes
+from api.routes import register_all_routes, register_streaming_routes
 
-api = BoltAPI(
-    middleware=[ServerTimeMiddleware],
-    openapi_config=get_openapi_config(),
+# Bolt cannot pass a StreamingResponse through the Python middleware chain, so
+# the routes are registered on a sub-app with the middleware and mounted on a
+# root API without it; only the streamed routes (GET /users/export) sit on the
+# root itself.
+middleware_app = BoltAPI(
+    middleware=[
+        ServerTimeMiddleware,
+        ResponseCacheMiddleware,
+        ConditionalGetMiddleware,
+    ],
 )
-register_all_routes(api)
+register_all_routes(middleware_app)
+
+api = BoltAPI(openapi_config=get_openapi_config())
+api.mount("", middleware_app)
+register_streaming_routes(api)
@@ -0,0 +1,138 @@
+"""
+In-process pub/sub hub for WS /ws/broadcast.
+
+A published frame is stored once (str or bytes) and the same object is queued
+for every subscriber, so fan-out cost does not include per-subscriber encoding.
+Each subscriber has a bounded queue drained by its own sender task; when a
+subscriber falls behind, the slow-consumer policy either drops its oldest
+queued frame ("drop") or disconnects it ("disconnect").
+
+The hub lives in the worker process: with several runbolt processes a message
+reaches the subscribers connected to the same process only.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from typing import Literal
+
+from django.conf import settings
+from django_bolt.websocket import WS_1008_POLICY_VIOLATION, WebSocket
+
+SlowConsumerPolicy = Literal["drop", "disconnect"]
+
+
+class Subscriber:
+    """One connected client: its WebSocket, bounded send queue and sender task."""
+
+    __slots__ = ("websocket", "queue", "task", "dropped", "closing")
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue[str | bytes] = asyncio.Queue(maxsize=queue_size)
+        self.task: asyncio.Task | None = None
+        self.dropped = 0
+        self.closing = False
+
+
+class BroadcastHub:
+    """Fan-out of published frames to all subscribers of this process."""
+
+    def __init__(self, queue_size: int = 256, policy: SlowConsumerPolicy = "drop"):
+        if policy not in ("drop", "disconnect"):
+            raise ValueError(f"Invalid slow-consumer policy: {policy}")
+        self.queue_size = queue_size
+        self.policy = policy
+        self._subscribers: set[Subscriber] = set()
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.disconnected = 0
+        # Strong references to pending disconnect tasks so the loop cannot
+        # garbage-collect them before they run.
+        self._pending: set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, websocket: WebSocket) -> Subscriber:
+        """Register an accepted WebSocket and start its sender task."""
+        subscriber = Subscriber(websocket, self.queue_size)
+        subscriber.task = asyncio.create_task(self._sender(subscriber))
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    async def unsubscribe(self, subscriber: Subscriber) -> None:
+        """Remove a subscriber and stop its sender task."""
+        self._subscribers.discard(subscriber)
+        task = subscriber.task
+        if task is not None and task is not asyncio.current_task():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
+
+    def publish(self, frame: str | bytes) -> int:
+        """Queue frame for every subscriber; returns how many accepted it."""
+        self.published += 1
+        queued = 0
+        for subscriber in tuple(self._subscribers):
+            if subscriber.closing:
+                continue
+            try:
+                subscriber.queue.put_nowait(frame)
+                queued += 1
+            except asyncio.QueueFull:
+                self._on_slow_consumer(subscriber, frame)
+        return queued
+
+    def stats(self) -> dict[str, int | str]:
+        """Counters for GET /ws/broadcast/stats."""
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "disconnected": self.disconnected,
+            "queue_size": self.queue_size,
+            "policy": self.policy,
+        }
+
+    def _on_slow_consumer(self, subscriber: Subscriber, frame: str | bytes) -> None:
+        if self.policy == "drop":
+            # Keep the newest frames: evict the oldest queued one.
+            subscriber.queue.get_nowait()
+            subscriber.queue.put_nowait(frame)
+            subscriber.dropped += 1
+            self.dropped += 1
+            return
+        subscriber.closing = True
+        self.disconnected += 1
+        self._subscribers.discard(subscriber)
+        task = asyncio.create_task(self._disconnect(subscriber))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _disconnect(self, subscriber: Subscriber) -> None:
+        await self.unsubscribe(subscriber)
+        with contextlib.suppress(Exception):
+            await subscriber.websocket.close(
+                code=WS_1008_POLICY_VIOLATION, reason="slow consumer"
+            )
+
+    async def _sender(self, subscriber: Subscriber) -> None:
+        websocket = subscriber.websocket
+        queue = subscriber.queue
+        while True:
+            frame = await queue.get()
+            if isinstance(frame, str):
+                await websocket.send_text(frame)
+            else:
+                await websocket.send_bytes(frame)
+            self.delivered += 1
+
+
+hub = BroadcastHub(
+    queue_size=getattr(settings, "BOLT_BROADCAST_QUEUE_SIZE", 256),
+    policy=getattr(settings, "BOLT_BROADCAST_SLOW_CONSUMER", "drop"),
+)
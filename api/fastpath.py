@@ -0,0 +1,94 @@
+"""
+ORM-free read path for the Bolt user routes, enabled per route with
+BOLT_FASTPATH_ROUTES (list, get, batch, me, or all).
+
+The ORM routes build a QuerySet per request and hydrate User instances only for
+UserSchema.from_user to copy three fields. Here the values_list queryset is
+built once at import, cloned per request with .using(), and each
+(id, username, role) row becomes a UserSchema directly: no model instances,
+no deferred-field bookkeeping. Handy for measuring ORM overhead within Bolt.
+"""
+
+import msgspec
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from django_bolt import PageNumberPagination
+from django_bolt.pagination import PaginatedResponse
+from accounts.json_pages import fetch_json_page
+from accounts.schemas import UserSchema
+from common.timing import phase
+
+User = get_user_model()
+
+FASTPATH_ROUTES = ("list", "get", "batch", "me")
+USER_FIELDS = ("id", "username", "role")
+
+_user_rows = User.objects.order_by("id").values_list(*USER_FIELDS)
+
+
+def enabled(route: str) -> bool:
+    """Whether `route` (one of FASTPATH_ROUTES) uses the fast path."""
+    routes = set(getattr(settings, "BOLT_FASTPATH_ROUTES", ()))
+    return route in routes or "all" in routes
+
+
+def user_from_row(row: tuple) -> UserSchema:
+    """(id, username, role) row -> UserSchema."""
+    user_id, username, role = row
+    return UserSchema(id=user_id, username=username, role=role)
+
+
+def user_rows(using: str = "default"):
+    """(id, username, role) rows ordered by id; filter like any QuerySet."""
+    return _user_rows.using(using)
+
+
+async def get_user(user_id: int, using: str = "default") -> UserSchema | None:
+    with phase("hydrate"):
+        row = await user_rows(using).filter(id=user_id).afirst()
+        return None if row is None else user_from_row(row)
+
+
+async def get_users(ids: list[int], using: str = "default") -> list[UserSchema]:
+    with phase("hydrate"):
+        return [user_from_row(row) async for row in user_rows(using).filter(id__in=ids)]
+
+
+class UserRowPagination(PageNumberPagination):
+    """PageNumberPagination over user_rows(): page items become UserSchema structs."""
+
+    async def _evaluate_queryset_slice(self, queryset) -> list[UserSchema]:
+        with phase("hydrate"):
+            return [user_from_row(row) async for row in queryset]
+
+
+_page_params = PageNumberPagination()
+
+
+async def json_page(qs, query: dict) -> PaginatedResponse:
+    """
+    USERS_LIST_RENDER=db: PageNumberPagination's page for user_rows() `qs`, with
+    the items rendered by PostgreSQL (accounts.json_pages) and embedded as raw JSON.
+    """
+    params = await _page_params.get_page_params({"query": query})
+    page, page_size = params["page"], params["page_size"]
+    fetch = sync_to_async(fetch_json_page)
+    total, items = await fetch(qs, page_size, (page - 1) * page_size)
+    total_pages = (total + page_size - 1) // page_size if total > 0 else 0
+    if page > total_pages > 0:
+        # Past the end: PageNumberPagination serves the last page instead
+        page = total_pages
+        total, items = await fetch(qs, page_size, (page - 1) * page_size)
+    return PaginatedResponse(
+        items=msgspec.Raw(items),
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        has_next=page < total_pages,
+        has_previous=page > 1,
+        next_page=page + 1 if page < total_pages else None,
+        previous_page=page - 1 if page > 1 else None,
+    )
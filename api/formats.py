@@ -0,0 +1,56 @@
+"""Bolt glue for common.formats: MessagePack and columnar responses for the user reads."""
+
+from functools import wraps
+
+import msgspec
+from django_bolt.exceptions import HTTPException
+
+from common import timing
+from common.formats import MEDIA_TYPES, columns, encode, negotiate_format, parse_layout
+
+
+def _request(args, kwargs):
+    return kwargs["request"] if "request" in kwargs else args[0]
+
+
+def negotiated(items: str | None = None):
+    """
+    Route decorator (below @api.get, above @paginate): encode the handler's
+    Struct per Accept and ?layout=. `items` names the list field that
+    ?layout=columnar turns into parallel arrays (None: single object, layout
+    ignored). JSON with rows is returned untouched, so Bolt serializes it as
+    before; other representations are encoded here and returned as a raw
+    (status, headers, body) response, bypassing the return-type validation.
+    The encoding here and Bolt's after the return count as the Server-Timing
+    "serialize" phase (timing.mark()).
+    """
+
+    def decorator(handler):
+        @wraps(handler)
+        async def wrapper(*args, **kwargs):
+            request = _request(args, kwargs)
+            try:
+                layout = parse_layout(request.query.get("layout"))
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            fmt = negotiate_format(request.headers.get("accept"))
+            result = await handler(*args, **kwargs)
+            if fmt == "json" and (layout == "rows" or items is None):
+                timing.mark()
+                return result
+            with timing.phase("serialize"):
+                if items is not None:
+                    rows = getattr(result, items)
+                    if isinstance(rows, msgspec.Raw):
+                        # USERS_LIST_RENDER=db page: JSON text cannot be embedded in MessagePack
+                        rows = msgspec.json.decode(rows)
+                    if layout == "columnar":
+                        rows = columns(rows)
+                    result = msgspec.structs.replace(result, **{items: rows})
+                body = encode(result, fmt)
+            timing.mark()
+            return 200, [("content-type", MEDIA_TYPES[fmt])], body
+
+        return wrapper
+
+    return decorator
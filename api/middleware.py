@@ -1,15 +1,46 @@
-"""Bolt API middleware: server time and response time headers."""
+"""Bolt API middleware: server time, response time, Server-Timing and DB query headers; response micro-cache; conditional GET for user reads."""
 
 import time
 from datetime import datetime
 
+from django.conf import settings
 from django.utils import timezone
+from django_bolt.middleware_response import MiddlewareResponse
+
+from accounts.models import TableVersion
+from common import timing
+from common.etag import (
+    USERS_TABLE,
+    is_conditional,
+    not_modified,
+    validators,
+    wildcard_matches,
+)
+from common.formats import request_variant
+from common.response_cache import (
+    BYPASS,
+    CACHEABLE_PATHS,
+    MISS,
+    cache_key,
+    is_private,
+)
+from config.cache import ensure_listening, response_cache
+from config.db_router import read_alias
+from config.slow_queries import slow_queries  # noqa: F401 - watches queries from startup
+from config.timing import finish_request
 
 
 class ServerTimeMiddleware:
     """
     Adds X-Server-Time (UTC) and X-Response-Time (ms) to every response.
-    Visible in Swagger UI when executing a request.
+    Visible in Swagger UI when executing a request. With SERVER_TIMING, also
+    the Server-Timing phase breakdown (common/timing.py): db (every query,
+    config.timing), hydrate (ORM and fast path evaluation in the user routes)
+    and serialize, from the return of an @negotiated handler to here (Bolt's
+    encoding and the inner middleware). The JWT check runs in Rust, before
+    this middleware, so there is no auth phase. The query count and DB time
+    go to /db/stats and, with DB_QUERY_HEADERS, X-DB-Queries and X-DB-Time
+    (config.timing).
     """
 
     def __init__(self, get_response):
@@ -17,10 +48,114 @@ class ServerTimeMiddleware:
 
     async def __call__(self, request):
         start = time.perf_counter()
-        response = await self.get_response(request)
-        duration_ms = (time.perf_counter() - start) * 1000
+        timings, token = (
+            timing.start() if settings.SERVER_TIMING.enabled else (None, None)
+        )
+        try:
+            response = await self.get_response(request)
+            if token is not None:
+                timing.since_mark("serialize")
+        finally:
+            if token is not None:
+                timing.finish(token)
+        duration = time.perf_counter() - start
+        if timings is not None:
+            finish_request(request, response, timings, duration)
+        duration_ms = duration * 1000
         utc = getattr(timezone, "UTC", timezone.UTC)
         server_time = datetime.now(utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
         response.headers["X-Server-Time"] = server_time
         response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
         return response
+
+
+class ResponseCacheMiddleware:
+    """
+    Micro-cache for the public GETs (common/response_cache.py, RESPONSE_CACHE_*).
+    Serves fresh or stale copies and stores 200 responses on a miss; X-Cache
+    tells which. Sits outside ConditionalGetMiddleware, so entries keep their
+    ETag and a matching If-None-Match gets 304 straight from the cache. Writes
+    to accounts_user evict entries in every worker (config.cache.invalidation).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    async def __call__(self, request):
+        cache = response_cache
+        if (
+            not cache.config.enabled
+            or request.method != "GET"
+            or not CACHEABLE_PATHS.match(request.path)
+        ):
+            return await self.get_response(request)
+        ensure_listening()
+        if is_private(request.headers, request.cookies, cache.config):
+            cache.bypass()
+            response = await self.get_response(request)
+            response.headers["X-Cache"] = BYPASS
+            return response
+        key = cache_key(
+            request.path, request.query.items(), request.headers, cache.config.vary
+        )
+        entry, state = cache.get(key)
+        if entry is not None:
+            if entry.not_modified(request.headers.get("if-none-match")):
+                headers = {**dict(entry.validators()), "X-Cache": state}
+                return MiddlewareResponse(304, headers, b"")
+            return MiddlewareResponse(
+                entry.status, {**dict(entry.headers), "X-Cache": state}, entry.body
+            )
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            cache.release(key)
+            raise
+        if response.set_cookies or not isinstance(response.body, bytes):
+            cache.release(key)
+        else:
+            cache.put(
+                key, response.status_code, list(response.headers.items()), response.body
+            )
+        response.headers["X-Cache"] = MISS
+        return response
+
+
+class ConditionalGetMiddleware:
+    """
+    ETag / Last-Modified on GET /users, /users/{id} and /users/batch (common/etag.py).
+    A matching If-None-Match / If-Modified-Since gets 304 before the handler runs.
+    The read alias is chosen here and kept in request.state["db_alias"], so the
+    validators and the body come from the same database. The ETag is per
+    representation (Accept, ?layout=; common.formats), hence Vary: Accept.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    async def __call__(self, request):
+        if request.method != "GET" or not is_conditional(
+            request.path, request.query.get("ids")
+        ):
+            return await self.get_response(request)
+        alias = request.state["db_alias"] = read_alias(request.cookies)
+        state = await TableVersion.aget(USERS_TABLE, alias)
+        if state is None:
+            return await self.get_response(request)
+        variant = request_variant(
+            request.headers.get("accept"), request.query.get("layout")
+        )
+        headers = validators(*state, variant)
+        headers["Vary"] = "Accept"
+        if not_modified(
+            headers["ETag"],
+            state[1],
+            request.headers.get("if-none-match"),
+            request.headers.get("if-modified-since"),
+            wildcard=wildcard_matches(request.path),
+        ):
+            return MiddlewareResponse(304, headers, b"")
+        response = await self.get_response(request)
+        if response.status_code == 200:
+            response.headers.update(headers)
+        return response
@@ -11,3 +11,8 @@ def register_all_routes(api):
     users.register(api)
     websocket.register(api)
     health.health_check(api)
+
+
+def register_streaming_routes(api):
+    """Register the StreamingResponse routes on the root BoltAPI (no Python middleware)."""
+    users.register_streaming(api)
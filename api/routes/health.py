@@ -1,8 +1,16 @@
-"""Health check routes: /health, /ready."""
+"""Health check routes: /health, /ready; response cache counters: /cache/stats; query counts: /db/stats; slow-query log: /db/slow-queries (staff)."""
 
-from django_bolt.health import add_health_check, register_health_checks
+from django_bolt import IsAuthenticated, IsStaff, JWTAuthentication, Response
+from django_bolt.auth import AllowAny
+from django_bolt.health import health_handler
 from django.http import HttpRequest
 
+from common.health import is_fresh, ready_payload
+from config.cache import invalidation, response_cache
+from config.health import db_monitor
+from config.slow_queries import slow_queries
+from config.timing import query_metrics
+
 
 async def check_custom():
     """Optional custom health check (e.g. Redis later)."""
@@ -11,8 +19,39 @@ async def check_custom():
 
 def register(api):
     """Register health endpoints on the given BoltAPI."""
-    register_health_checks(api)
-    add_health_check(check_custom)
+    api.get("/health")(health_handler)
+
+    @api.get("/ready", auth=[], guards=[AllowAny()])
+    async def ready(request: HttpRequest, fresh: str | None = None):
+        """Readiness from the cached DB monitor state (?fresh=1 for a live check). 503 if unhealthy."""
+        state = await db_monitor.get(fresh=is_fresh(fresh))
+        payload = ready_payload(state)
+        custom_ok, _ = await check_custom()
+        payload["checks"]["custom"] = "ok" if custom_ok else "error"
+        if not (state.healthy and custom_ok):
+            payload["status"] = "unhealthy"
+            return Response(payload, status_code=503)
+        return payload
+
+    @api.get("/cache/stats", auth=[], guards=[AllowAny()])
+    async def cache_stats(request: HttpRequest) -> dict:
+        """Response micro-cache counters of this worker process (hit ratio, bytes served, LISTEN state)."""
+        return {**response_cache.stats(), "invalidation": invalidation.stats()}
+
+    @api.get("/db/stats", auth=[], guards=[AllowAny()])
+    async def db_stats(request: HttpRequest) -> dict:
+        """SQL queries and DB time per endpoint of this worker process (common/query_metrics.py)."""
+        return query_metrics.stats()
+
+    @api.get(
+        "/db/slow-queries",
+        auth=[JWTAuthentication()],
+        guards=[IsAuthenticated(), IsStaff()],
+    )
+    async def db_slow_queries(request: HttpRequest) -> dict:
+        """Slow queries of this worker process with sampled EXPLAIN plans, newest first. Staff only."""
+        return slow_queries.snapshot()
+
     health_check(api)
 
 
@@ -1,6 +1,11 @@
-"""User routes: list (search, pagination, filter by role), get by id, me (JWT), create (staff, with role)."""
+"""User routes: list (search, pagination, filter by role), get by id, batch by ids, me (JWT), create, bulk create and export (staff).
+
+The reads also answer in MessagePack and ?layout=columnar (api.formats)."""
+
+from collections.abc import AsyncIterator
 
 from asgiref.sync import sync_to_async
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.http import HttpRequest
 
@@ -9,12 +14,34 @@ from django_bolt import (
     IsStaff,
     JWTAuthentication,
     PageNumberPagination,
+    Response,
+    StreamingResponse,
 )
 from django_bolt.auth import AllowAny
 from django_bolt.exceptions import HTTPException
 from django_bolt.pagination import paginate
+from api import fastpath
+from api.formats import negotiated
+from accounts.bulk import bulk_create_users
+from accounts.create import UsernameTaken
+from accounts.create import create_user as create_user_row
 from accounts.models import Role
-from accounts.schemas import UserCreateSchema, UserSchema
+from accounts.schemas import (
+    UserBatchSchema,
+    UserBulkResultSchema,
+    UserCreateSchema,
+    UserSchema,
+)
+from common.batch import in_request_order, parse_ids
+from common.timing import phase
+from config.db_router import mark_write, read_alias
+from common.export import (
+    CHUNK_ROWS,
+    EXPORT_FORMATS,
+    export_headers,
+    parse_format,
+    stream_rows,
+)
 
 User = get_user_model()
 
@@ -29,43 +56,138 @@ def _query_params(request) -> dict:
     return dict(q) if q else {}
 
 
+def _read_db(request) -> str:
+    """Database alias for a read-only query: a replica, or the primary (config.db_router).
+    Reuses the alias ConditionalGetMiddleware read the ETag version from."""
+    state = getattr(request, "state", None)
+    if state and state.get("db_alias"):
+        return state["db_alias"]
+    return read_alias(getattr(request, "cookies", None))
+
+
+def _write_headers() -> dict[str, str]:
+    """Set-Cookie pinning the client to the primary after a write; empty without replicas."""
+    cookie = mark_write()
+    return {"Set-Cookie": cookie} if cookie else {}
+
+
+async def _export_rows(qs, chunk_rows: int = CHUNK_ROWS) -> AsyncIterator[tuple]:
+    """
+    (id, username, role) rows of qs in id order: one keyset query
+    (id > last id, LIMIT chunk_rows) per chunk, each run off the event loop.
+    """
+    rows = qs.values_list("id", "username", "role").order_by("id")
+    last_id = 0
+    while True:
+        chunk = await sync_to_async(list)(rows.filter(id__gt=last_id)[:chunk_rows])
+        for row in chunk:
+            yield row
+        if len(chunk) < chunk_rows:
+            return
+        last_id = chunk[-1][0]
+
+
+def _filter_users(qs, query: dict):
+    """Apply ?search= and ?role= / ?role_code= (unknown roles ignored)."""
+    search = (query.get("search") or "").strip()
+    if search:
+        qs = qs.filter(username__icontains=search)
+    role = (query.get("role") or query.get("role_code") or "").strip().upper()
+    if role and role in VALID_ROLES:
+        qs = qs.filter(role=role)
+    return qs
+
+
 def register(api):
-    """Register user routes on the given BoltAPI."""
+    """Register user routes on the given BoltAPI (ORM or api.fastpath per BOLT_FASTPATH_ROUTES)."""
+    fast = {route: fastpath.enabled(route) for route in fastpath.FASTPATH_ROUTES}
 
-    @api.get("/users", auth=[], guards=[AllowAny()])
-    @paginate(PageNumberPagination)
-    async def list_users(request: HttpRequest):
-        """List users with optional search and role filter. Paginated. Public."""
-        qs = User.objects.only("id", "username", "role").order_by("id")
-        query = _query_params(request)
-        search = (query.get("search") or "").strip()
-        if search:
-            qs = qs.filter(username__icontains=search)
-        role = (query.get("role") or query.get("role_code") or "").strip().upper()
-        if role and role in VALID_ROLES:
-            qs = qs.filter(role=role)
-        return qs
+    if settings.USERS_LIST_RENDER == "db":
+
+        @api.get("/users", auth=[], guards=[AllowAny()])
+        @negotiated(items="items")
+        async def list_users(request: HttpRequest):
+            """List users with optional search and role filter. Page JSON rendered by PostgreSQL. Public."""
+            query = _query_params(request)
+            qs = _filter_users(fastpath.user_rows(_read_db(request)), query)
+            return await fastpath.json_page(qs, query)
+
+    else:
+
+        @api.get("/users", auth=[], guards=[AllowAny()])
+        @negotiated(items="items")
+        @paginate(fastpath.UserRowPagination if fast["list"] else PageNumberPagination)
+        async def list_users(request: HttpRequest):
+            """List users with optional search and role filter. Paginated. Public."""
+            if fast["list"]:
+                qs = fastpath.user_rows(_read_db(request))
+            else:
+                qs = (
+                    User.objects.using(_read_db(request))
+                    .only("id", "username", "role")
+                    .order_by("id")
+                )
+            return _filter_users(qs, _query_params(request))
+
+    @api.get("/users/batch", auth=[], guards=[AllowAny()])
+    @negotiated(items="items")
+    async def get_users_batch(request: HttpRequest) -> UserBatchSchema:
+        """Get up to 100 users by ?ids=1,2,3 in one query, in request order. Public."""
+        try:
+            ids = parse_ids(_query_params(request).get("ids"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if fast["batch"]:
+            found, missing = in_request_order(
+                ids, await fastpath.get_users(ids, _read_db(request))
+            )
+            return UserBatchSchema(items=found, missing=missing)
+        with phase("hydrate"):
+            users = [
+                u
+                async for u in User.objects.using(_read_db(request))
+                .only("id", "username", "role")
+                .filter(id__in=ids)
+            ]
+            found, missing = in_request_order(ids, users)
+            items = [UserSchema.from_user(u) for u in found]
+        return UserBatchSchema(items=items, missing=missing)
 
     @api.get("/users/{user_id}", auth=[], guards=[AllowAny()])
+    @negotiated()
     async def get_user(request: HttpRequest, user_id: int) -> UserSchema:
         """Get user by ID. Public."""
-        user = (
-            await User.objects.only("id", "username", "role")
-            .filter(id=user_id)
-            .afirst()
-        )
+        if fast["get"]:
+            schema = await fastpath.get_user(user_id, _read_db(request))
+            if schema is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            return schema
+        with phase("hydrate"):
+            user = (
+                await User.objects.using(_read_db(request))
+                .only("id", "username", "role")
+                .filter(id=user_id)
+                .afirst()
+            )
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
         return UserSchema.from_user(user)
 
     @api.get("/users/me", auth=[JWTAuthentication()], guards=[IsAuthenticated()])
+    @negotiated()
     async def get_me(request: HttpRequest) -> UserSchema:
         """Current user. Requires JWT."""
-        user = (
-            await User.objects.only("id", "username", "role")
-            .filter(id=request.user.id)
-            .afirst()
-        )
+        if fast["me"]:
+            schema = await fastpath.get_user(request.user.id)
+            if schema is None:
+                raise HTTPException(status_code=404, detail="User not found")
+            return schema
+        with phase("hydrate"):
+            user = (
+                await User.objects.only("id", "username", "role")
+                .filter(id=request.user.id)
+                .afirst()
+            )
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
         return UserSchema.from_user(user)
@@ -76,19 +198,56 @@ def register(api):
         guards=[IsAuthenticated(), IsStaff()],
     )
     async def create_user(request: HttpRequest, body: UserCreateSchema) -> UserSchema:
-        """Create user with role. Staff only. Default role: CUSTOMER."""
-        if await User.objects.filter(username=body.username).aexists():
-            raise HTTPException(status_code=400, detail="Username already exists")
+        """Create user with role in one INSERT ... ON CONFLICT. Staff only. Default role: CUSTOMER."""
         role = (body.role or Role.CUSTOMER).strip().upper()
         if role not in VALID_ROLES:
             raise HTTPException(
                 status_code=400,
                 detail=f"Invalid role. Must be one of: {', '.join(VALID_ROLES)}",
             )
-        user = await sync_to_async(User.objects.create_user)(
-            username=body.username,
-            password=body.password,
-            email=body.email or "",
-            role=role,
+        try:
+            user = await create_user_row(
+                body.username, body.password, body.email or "", role
+            )
+        except UsernameTaken:
+            raise HTTPException(status_code=400, detail="Username already exists")
+        return Response(UserSchema.from_user(user), headers=_write_headers())
+
+    @api.post(
+        "/users/bulk",
+        auth=[JWTAuthentication()],
+        guards=[IsAuthenticated(), IsStaff()],
+    )
+    async def create_users_bulk(request: HttpRequest) -> UserBulkResultSchema:
+        """Create users from a JSON array or NDJSON body (max 10000 rows). Staff only."""
+        try:
+            result = await bulk_create_users(request.body)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return Response(result, headers=_write_headers())
+
+
+def register_streaming(api):
+    """
+    Register the streamed user routes on the root BoltAPI, which has no Python
+    middleware: Bolt cannot pass a StreamingResponse through the middleware chain.
+    """
+
+    @api.get(
+        "/users/export",
+        auth=[JWTAuthentication()],
+        guards=[IsAuthenticated(), IsStaff()],
+    )
+    async def export_users(request: HttpRequest):
+        """Stream matching users as NDJSON or CSV (?format=csv), fetched in keyset chunks. Staff only."""
+        query = _query_params(request)
+        try:
+            fmt = parse_format(query.get("format"))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        qs = _filter_users(User.objects.using(_read_db(request)), query)
+        return StreamingResponse(
+            stream_rows(_export_rows(qs), fmt),
+            media_type=EXPORT_FORMATS[fmt],
+            headers=export_headers(fmt),
         )
-        return UserSchema.from_user(user)
@@ -1,26 +1,106 @@
-"""WebSocket route: WS /ws echo."""
+"""WebSocket routes: WS /ws echo, WS /ws/broadcast fan-out.
 
-import json
+JSON frames are echoed as {"echo": <payload>} by splicing the original payload
+into the envelope: msgspec only validates it (decode to Raw), nothing is
+parsed into Python objects or re-serialized. Text and binary frames are both
+accepted; with ?batch=1 a frame may carry newline-delimited messages and all
+echoes go back in a single frame.
 
+/ws/broadcast delivers every frame a client sends to all subscribers of the
+worker process (see api/broadcast.py); ?subscribe=0 opens a publish-only
+connection.
+"""
+
+import msgspec
+from django.http import HttpRequest
+
+from django_bolt.auth import AllowAny
 from django_bolt.websocket import WebSocket
 
+from api.broadcast import hub
+
+_raw_decoder = msgspec.json.Decoder(msgspec.Raw)
+
+
+def is_json(payload: str | bytes) -> bool:
+    """Cheap validity check: msgspec scans the document without building objects."""
+    try:
+        _raw_decoder.decode(payload)
+    except msgspec.DecodeError:
+        return False
+    return True
+
+
+def echo_text(data: str) -> str:
+    """Echo for one text message: JSON envelope or 'Echo: <text>'."""
+    if is_json(data):
+        return '{"echo":' + data + "}"
+    return f"Echo: {data}"
+
+
+def echo_bytes(data: bytes) -> bytes:
+    """Echo for one binary message: JSON envelope or b'Echo: <bytes>'."""
+    if is_json(data):
+        return b'{"echo":' + data + b"}"
+    return b"Echo: " + data
+
+
+def echo_batch_text(data: str) -> str:
+    """Echo every newline-delimited message of a text frame, one reply frame."""
+    return "\n".join(echo_text(line) for line in data.split("\n") if line)
+
+
+def echo_batch_bytes(data: bytes) -> bytes:
+    """Echo every newline-delimited message of a binary frame, one reply frame."""
+    return b"\n".join(echo_bytes(line) for line in data.split(b"\n") if line)
+
 
 def register(api):
-    """Register WebSocket route on the given BoltAPI."""
+    """Register WebSocket routes on the given BoltAPI."""
 
     @api.websocket("/ws")
     async def ws_echo(websocket: WebSocket):
-        """Echo WebSocket: send back text and JSON."""
+        """Echo WebSocket: text, JSON and binary frames (?batch=1 for NDJSON batches)."""
         await websocket.accept()
+        batch = websocket.query_params.get("batch") in ("1", "true")
+        on_text = echo_batch_text if batch else echo_text
+        on_bytes = echo_batch_bytes if batch else echo_bytes
         try:
             while True:
-                data = await websocket.receive_text()
-                if not data:
+                message = await websocket.receive()
+                text = message.get("text")
+                if text is not None:
+                    if text:
+                        await websocket.send_text(on_text(text))
                     continue
-                try:
-                    obj = json.loads(data)
-                    await websocket.send_json({"echo": obj})
-                except json.JSONDecodeError:
-                    await websocket.send_text(f"Echo: {data}")
+                data = message.get("bytes")
+                if data:
+                    await websocket.send_bytes(on_bytes(data))
+        except Exception:
+            await websocket.close()
+
+    @api.websocket("/ws/broadcast")
+    async def ws_broadcast(websocket: WebSocket):
+        """Pub/sub fan-out: frames sent by any client go to every subscriber."""
+        await websocket.accept()
+        subscriber = None
+        if websocket.query_params.get("subscribe") not in ("0", "false"):
+            subscriber = hub.subscribe(websocket)
+        try:
+            while True:
+                message = await websocket.receive()
+                frame = message.get("text")
+                if frame is None:
+                    frame = message.get("bytes")
+                if frame:
+                    hub.publish(frame)
         except Exception:
             await websocket.close()
+        finally:
+            if subscriber is not None:
+                await hub.unsubscribe(subscriber)
+
+    @api.get("/ws/broadcast/stats", auth=[], guards=[AllowAny()])
+    async def ws_broadcast_stats(request: HttpRequest) -> dict:
+        """Broadcast counters for this worker process. Public."""
+        return hub.stats()
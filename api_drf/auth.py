@@ -5,6 +5,8 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from rest_framework import authentication
 
+from common.timing import phase
+
 User = get_user_model()
 
 
@@ -20,6 +22,10 @@ class BoltJWTAuthentication(authentication.BaseAuthentication):
         token = auth_header[len(self.keyword) + 1 :].strip()
         if not token:
             return None
+        with phase("auth"):
+            return self._authenticate_token(token)
+
+    def _authenticate_token(self, token: str):
         try:
             secret = getattr(settings, "BOLT_JWT_SECRET", None) or settings.SECRET_KEY
             algorithm = getattr(settings, "BOLT_JWT_ALGORITHM", "HS256")
@@ -0,0 +1,234 @@
+"""DRF (Django ASGI) middleware: X-Server-Time, X-Response-Time, Server-Timing, X-DB-Queries / X-DB-Time (common.timing); Accept-Encoding negotiated compression (common.compression); response micro-cache (common.response_cache); conditional GET for user reads (common.etag)."""
+
+import re
+import time
+from datetime import datetime, timezone
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from accounts.models import TableVersion
+from common import timing
+from common.compression import compress, compressor, negotiate
+from common.etag import (
+    USERS_TABLE,
+    is_conditional,
+    not_modified,
+    validators,
+    wildcard_matches,
+)
+from common.response_cache import (
+    BYPASS,
+    CACHEABLE_PATHS,
+    MISS,
+    cache_key,
+    is_private,
+)
+from config.cache import ensure_listening, response_cache
+from config.db_router import read_alias
+from config.slow_queries import slow_queries  # noqa: F401 - watches queries from startup
+from config.timing import finish_request
+
+_strong_etag = re.compile(r'^"')
+
+
+def _compress_stream(chunks, encoding: str, level: int):
+    c = compressor(encoding, level)
+    for chunk in chunks:
+        if out := c.compress(chunk):
+            yield out
+    yield c.flush()
+
+
+async def _acompress_stream(chunks, encoding: str, level: int):
+    c = compressor(encoding, level)
+    async for chunk in chunks:
+        if out := c.compress(chunk):
+            yield out
+    yield c.flush()
+
+
+class TimingMiddleware:
+    """
+    Adds X-Server-Time (UTC) and X-Response-Time (ms) like the Bolt
+    ServerTimeMiddleware and, with SERVER_TIMING, the Server-Timing phase
+    breakdown (common/timing.py): auth (BoltJWTAuthentication), db (every
+    query, config.timing), hydrate and serialize (UserViewSet, the JSON
+    renderer). First in MIDDLEWARE, so the total covers the other middleware.
+    Query counts and DB time as in the Bolt middleware (config.timing).
+    """
+
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        start = time.perf_counter()
+        timings, token = (
+            timing.start() if settings.SERVER_TIMING.enabled else (None, None)
+        )
+        try:
+            response = await self.get_response(request)
+        finally:
+            if token is not None:
+                timing.finish(token)
+        duration = time.perf_counter() - start
+        if timings is not None:
+            finish_request(request, response, timings, duration)
+        server_time = (
+            datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        )
+        response.headers["X-Server-Time"] = server_time
+        response.headers["X-Response-Time"] = f"{duration * 1000:.2f}ms"
+        return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with gzip, brotli or zstd per COMPRESSION_* settings
+    (settings.COMPRESSION). Like Django's GZipMiddleware: skips small or already
+    encoded bodies, keeps the original when compression does not help, and
+    weakens strong ETags.
+    """
+
+    def process_response(self, request, response):
+        config = settings.COMPRESSION
+        if response.has_header("Content-Encoding"):
+            return response
+        if not config.compressible(response.get("Content-Type")):
+            return response
+        if not response.streaming and len(response.content) < config.min_size:
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(request.headers.get("Accept-Encoding"), config.available)
+        if encoding is None:
+            return response
+        level = config.level(encoding)
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _acompress_stream(
+                    response.streaming_content, encoding, level
+                )
+            else:
+                response.streaming_content = _compress_stream(
+                    response.streaming_content, encoding, level
+                )
+            del response.headers["Content-Length"]
+        else:
+            compressed = compress(response.content, encoding, level)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        if etag := response.get("ETag"):
+            response.headers["ETag"] = _strong_etag.sub('W/"', etag)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+
+class ResponseCacheMiddleware:
+    """
+    Micro-cache for the public GETs under /drf/ (common/response_cache.py,
+    RESPONSE_CACHE_*). Serves fresh or stale copies and stores 200 responses on
+    a miss; X-Cache tells which. Sits between compression and conditional GET,
+    so entries are uncompressed and keep their ETag. Writes to accounts_user
+    evict entries in every worker (config.cache.invalidation).
+    """
+
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        cache = response_cache
+        if (
+            not cache.config.enabled
+            or request.method != "GET"
+            or not CACHEABLE_PATHS.match(request.path_info)
+        ):
+            return await self.get_response(request)
+        ensure_listening()
+        if is_private(request.headers, request.COOKIES, cache.config):
+            cache.bypass()
+            response = await self.get_response(request)
+            response.headers["X-Cache"] = BYPASS
+            return response
+        query = [(k, v) for k, values in request.GET.lists() for v in values]
+        key = cache_key(request.path_info, query, request.headers, cache.config.vary)
+        entry, state = cache.get(key)
+        if entry is not None:
+            if entry.not_modified(request.headers.get("If-None-Match")):
+                response = HttpResponseNotModified(headers=dict(entry.validators()))
+            else:
+                response = HttpResponse(
+                    entry.body, status=entry.status, headers=dict(entry.headers)
+                )
+            response.headers["X-Cache"] = state
+            return response
+        try:
+            response = await self.get_response(request)
+        except BaseException:
+            cache.release(key)
+            raise
+        if response.streaming or response.cookies:
+            cache.release(key)
+        else:
+            cache.put(
+                key, response.status_code, list(response.items()), response.content
+            )
+        response.headers["X-Cache"] = MISS
+        return response
+
+
+class ConditionalGetMiddleware:
+    """
+    ETag / Last-Modified on GET /drf/users/, /drf/users/{id}/ and /drf/users/batch/.
+    A matching If-None-Match / If-Modified-Since gets 304 before the view runs.
+    The read alias is kept in request.db_alias for UserViewSet.get_queryset.
+    """
+
+    sync_capable = False
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    async def __call__(self, request):
+        if request.method != "GET" or not is_conditional(
+            request.path_info, request.GET.get("ids")
+        ):
+            return await self.get_response(request)
+        request.db_alias = read_alias(request.COOKIES)
+        state = await TableVersion.aget(USERS_TABLE, request.db_alias)
+        if state is None:
+            return await self.get_response(request)
+        headers = validators(*state)
+        if not_modified(
+            headers["ETag"],
+            state[1],
+            request.headers.get("If-None-Match"),
+            request.headers.get("If-Modified-Since"),
+            wildcard=wildcard_matches(request.path_info),
+        ):
+            return HttpResponseNotModified(headers=headers)
+        response = await self.get_response(request)
+        if response.status_code == 200:
+            for name, value in headers.items():
+                response.headers[name] = value
+        return response
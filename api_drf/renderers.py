@@ -0,0 +1,13 @@
+"""DRF renderers: JSON rendering timed as the Server-Timing "serialize" phase (common/timing.py)."""
+
+from rest_framework import renderers
+
+from common.timing import phase
+
+
+class JSONRenderer(renderers.JSONRenderer):
+    """rest_framework's JSONRenderer; render() counts as "serialize"."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with phase("serialize"):
+            return super().render(data, accepted_media_type, renderer_context)
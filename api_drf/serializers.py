@@ -2,8 +2,10 @@
 
 from rest_framework import serializers
 
+from accounts.create import insert_user
 from accounts.models import Role
 from django.contrib.auth import get_user_model
+from django.contrib.auth.validators import UnicodeUsernameValidator
 
 User = get_user_model()
 
@@ -15,26 +17,29 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ("id", "username", "role")
 
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
-        data["role"] = getattr(instance, "role", None) or Role.CUSTOMER
-        return data
-
 
 class UserCreateSerializer(serializers.ModelSerializer):
-    """Create user with role."""
+    """
+    Create user with role. Username uniqueness is enforced by the INSERT's
+    ON CONFLICT clause (accounts.create) instead of a UniqueValidator query.
+    """
 
     class Meta:
         model = User
         fields = ("username", "password", "email", "role")
+        extra_kwargs = {
+            "username": {"validators": [UnicodeUsernameValidator()]},
+        }
 
     def create(self, validated_data):
-        role = validated_data.pop("role", Role.CUSTOMER)
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            password=validated_data["password"],
-            email=validated_data.get("email", ""),
+        user = insert_user(
+            validated_data["username"],
+            validated_data["password"],
+            validated_data.get("email", ""),
+            validated_data.get("role", Role.CUSTOMER),
         )
-        user.role = role
-        user.save(update_fields=["role"])
+        if user is None:
+            raise serializers.ValidationError(
+                {"username": ["A user with that username already exists."]}
+            )
         return user
@@ -28,6 +28,9 @@ urlpatterns = [
     path("health/", views.health_view),
     path("health/test/", views.health_test_view),
     path("ready/", views.ready_view),
+    path("cache/stats/", views.cache_stats_view),
+    path("db/stats/", views.db_stats_view),
+    path("db/slow-queries/", views.db_slow_queries_view),
     path("roles/", views.role_list_view),
     path("roles/code/<str:code>/", views.role_detail_view),
     # Bolt-compatible: access_token, expires_in, token_type
@@ -3,7 +3,7 @@
 from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import authenticate
-from django.db import connection
+from django.http import HttpResponse
 from rest_framework import serializers as rf_serializers
 
 from drf_spectacular.utils import OpenApiParameter, extend_schema, inline_serializer
@@ -18,7 +18,17 @@ from adrf.views import APIView as AsyncAPIView
 from adrf.viewsets import ViewSet
 from django_bolt import create_jwt_for_user
 
+from accounts.json_pages import fetch_json_page
 from accounts.models import Role
+from common.batch import in_request_order, parse_ids
+from common.db_json import dumps
+from common.health import is_fresh, ready_payload
+from common.timing import phase
+from config.cache import invalidation, response_cache
+from config.db_router import mark_write, read_alias
+from config.health import db_monitor
+from config.slow_queries import slow_queries
+from config.timing import query_metrics
 from django.contrib.auth import get_user_model
 
 from .serializers import UserCreateSerializer, UserSerializer
@@ -72,7 +82,7 @@ async def health_test_view(request):
 @extend_schema(
     tags=["Health"],
     summary="Readiness probe",
-    description="Returns service readiness status. Verifies database connectivity. Returns 503 if DB is unreachable.",
+    description="Returns service readiness status from a background database monitor (checked every HEALTH_CHECK_INTERVAL seconds). ?fresh=1 forces a live check. Returns 503 if DB is unreachable.",
     responses={
         200: {
             "type": "object",
@@ -99,15 +109,50 @@ async def health_test_view(request):
 @api_view(["GET"])
 @permission_classes([permissions.AllowAny])
 async def ready_view(request):
-    """GET /ready - readiness (DB check)."""
-    try:
-        await sync_to_async(connection.ensure_connection)()
-        return Response({"status": "healthy", "checks": {"database": "ok"}})
-    except Exception:
-        return Response(
-            {"status": "unhealthy", "checks": {"database": "error"}},
-            status=status.HTTP_503_SERVICE_UNAVAILABLE,
-        )
+    """GET /ready - readiness from the cached DB monitor state (?fresh=1 for a live check)."""
+    state = await db_monitor.get(fresh=is_fresh(request.query_params.get("fresh")))
+    if state.healthy:
+        return Response(ready_payload(state))
+    return Response(ready_payload(state), status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+@extend_schema(
+    tags=["Health"],
+    summary="Response cache counters",
+    description="Micro-cache counters of this worker process: entries, bytes, hits, stale hits, misses, bypasses, evictions, invalidations, hit ratio, bytes served from cache and the LISTEN/NOTIFY invalidation state.",
+    responses={200: {"type": "object"}},
+)
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+async def cache_stats_view(request):
+    """GET /cache/stats - response micro-cache counters (this worker process)."""
+    return Response({**response_cache.stats(), "invalidation": invalidation.stats()})
+
+
+@extend_schema(
+    tags=["Health"],
+    summary="SQL query counts",
+    description="Per endpoint of this worker process: requests, SQL queries (total, per request, max in one request) and DB time (total, per request, share of response time).",
+    responses={200: {"type": "object"}},
+)
+@api_view(["GET"])
+@permission_classes([permissions.AllowAny])
+async def db_stats_view(request):
+    """GET /db/stats - SQL queries and DB time per endpoint (this worker process)."""
+    return Response(query_metrics.stats())
+
+
+@extend_schema(
+    tags=["Health"],
+    summary="Slow-query log",
+    description="Queries of this worker process that took at least SLOW_QUERY_MS, newest first: SQL, parameter types, duration, database and, for a sample, the EXPLAIN (ANALYZE, BUFFERS) plan. Staff only.",
+    responses={200: {"type": "object"}},
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+async def db_slow_queries_view(request):
+    """GET /db/slow-queries - slow queries with sampled plans (this worker process). Staff only."""
+    return Response(slow_queries.snapshot())
 
 
 # ----- Roles (async) -----
@@ -246,15 +291,49 @@ class UserPagination(PageNumberPagination):
     page_size_query_param = "page_size"
 
 
+class JsonPageRows:
+    """
+    USERS_LIST_RENDER=db: stands in for the queryset in UserPagination. count()
+    and the page slice come from one fetch_json_page() statement (run again only
+    if the paginator asks for another offset, e.g. ?page=last). The page holds
+    a single item: its JSON array text.
+    """
+
+    def __init__(self, qs, page_size: int, offset: int):
+        self.qs = qs
+        self.page_size = page_size
+        self.offset = offset
+        self.total = self.items = None
+
+    def _fetch(self, offset: int) -> None:
+        self.offset = offset
+        self.total, self.items = fetch_json_page(self.qs, self.page_size, offset)
+
+    def count(self) -> int:
+        if self.total is None:
+            self._fetch(self.offset)
+        return self.total
+
+    def __getitem__(self, key: slice) -> list[str]:
+        if self.items is None or key.start != self.offset:
+            self._fetch(key.start)
+        return [self.items]
+
+
 class UserViewSet(ViewSet):
-    """Async user endpoints: list, retrieve, create, me."""
+    """Async user endpoints: list, retrieve, batch, create, me."""
 
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny]
     pagination_class = UserPagination
 
     def get_queryset(self):
-        return User.objects.only("id", "username", "role").order_by("id")
+        """Read-only user queryset on a replica when one is healthy (config.db_router).
+        Reuses the alias ConditionalGetMiddleware read the ETag version from."""
+        alias = getattr(self.request, "db_alias", None) or read_alias(
+            self.request.COOKIES
+        )
+        return User.objects.using(alias).only("id", "username", "role").order_by("id")
 
     def _filter_queryset(self, qs):
         search = (self.request.query_params.get("search") or "").strip()
@@ -316,16 +395,44 @@ class UserViewSet(ViewSet):
         """GET /users - paginated list with search and role filter."""
         qs = self.get_queryset()
         qs = await sync_to_async(self._filter_queryset)(qs)
+        if settings.USERS_LIST_RENDER == "db":
+            return await self._alist_json(request, qs)
         paginator = self.pagination_class()
-        page = await sync_to_async(paginator.paginate_queryset)(qs, request, view=self)
+        with phase("hydrate"):
+            page = await sync_to_async(paginator.paginate_queryset)(
+                qs, request, view=self
+            )
         if page is not None:
             serializer = UserSerializer(page, many=True)
-            data = await sync_to_async(lambda: serializer.data)()
+            with phase("serialize"):
+                data = await sync_to_async(lambda: serializer.data)()
             return paginator.get_paginated_response(data)
         serializer = UserSerializer(qs, many=True)
-        data = await sync_to_async(lambda: serializer.data)()
+        with phase("serialize"):
+            data = await sync_to_async(lambda: serializer.data)()
         return Response(data)
 
+    async def _alist_json(self, request, qs):
+        """USERS_LIST_RENDER=db: alist's page and envelope, results rendered by PostgreSQL."""
+        paginator = self.pagination_class()
+        page_size = paginator.get_page_size(request)
+        try:
+            page = int(request.query_params.get(paginator.page_query_param) or 1)
+        except ValueError:
+            page = 1
+        rows = JsonPageRows(qs, page_size, (page - 1) * page_size)
+        items = await sync_to_async(paginator.paginate_queryset)(
+            rows, request, view=self
+        )
+        with phase("serialize"):
+            body = (
+                f'{{"count":{rows.total},"next":{dumps(paginator.get_next_link())},'
+                f'"previous":{dumps(paginator.get_previous_link())},"results":{items[0]}}}'
+            )
+            # JSONRenderer escapes these two as well
+            body = body.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
+        return HttpResponse(body.encode(), content_type="application/json")
+
     @extend_schema(
         tags=["Users"],
         summary="Get user by ID",
@@ -342,16 +449,58 @@ class UserViewSet(ViewSet):
     )
     async def aretrieve(self, request, pk=None):
         """GET /users/{id} - get user by ID."""
-        user = await User.objects.filter(pk=pk).only("id", "username", "role").afirst()
+        with phase("hydrate"):
+            user = await self.get_queryset().filter(pk=pk).afirst()
         if user is None:
             return Response(
                 {"detail": "User not found"},
                 status=status.HTTP_404_NOT_FOUND,
             )
         serializer = UserSerializer(user)
-        data = await sync_to_async(lambda: serializer.data)()
+        with phase("serialize"):
+            data = await sync_to_async(lambda: serializer.data)()
         return Response(data)
 
+    @extend_schema(
+        tags=["Users"],
+        summary="Get users by IDs",
+        description="Up to 100 users by ?ids=1,2,3 in one query. Items follow request order; unknown ids are listed in `missing`.",
+        parameters=[
+            OpenApiParameter(
+                "ids",
+                OpenApiTypes.STR,
+                OpenApiParameter.QUERY,
+                required=True,
+                description="Comma-separated user IDs (max 100)",
+            ),
+        ],
+        responses={
+            200: inline_serializer(
+                name="UserBatchResponse",
+                fields={
+                    "items": UserSerializer(many=True),
+                    "missing": rf_serializers.ListField(
+                        child=rf_serializers.IntegerField()
+                    ),
+                },
+            ),
+        },
+    )
+    @action(detail=False, methods=["get"], url_path="batch")
+    async def abatch(self, request):
+        """GET /users/batch?ids= - users by IDs, request order, missing ids reported."""
+        try:
+            ids = parse_ids(request.query_params.get("ids"))
+        except ValueError as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        with phase("hydrate"):
+            users = [u async for u in self.get_queryset().filter(id__in=ids)]
+        found, missing = in_request_order(ids, users)
+        serializer = UserSerializer(found, many=True)
+        with phase("serialize"):
+            data = await sync_to_async(lambda: serializer.data)()
+        return Response({"items": data, "missing": missing})
+
     @extend_schema(
         tags=["Users"],
         summary="Create user",
@@ -365,8 +514,13 @@ class UserViewSet(ViewSet):
         await sync_to_async(serializer.is_valid)(raise_exception=True)
         user = await sync_to_async(serializer.save)()
         out = UserSerializer(user)
-        data = await sync_to_async(lambda: out.data)()
-        return Response(data, status=status.HTTP_201_CREATED)
+        with phase("serialize"):
+            data = await sync_to_async(lambda: out.data)()
+        response = Response(data, status=status.HTTP_201_CREATED)
+        cookie = mark_write()
+        if cookie:
+            response["Set-Cookie"] = cookie
+        return response
 
     @extend_schema(
         tags=["Users"],
@@ -383,5 +537,6 @@ class UserViewSet(ViewSet):
     async def ame(self, request):
         """GET /users/me - current user."""
         serializer = UserSerializer(request.user)
-        data = await sync_to_async(lambda: serializer.data)()
+        with phase("serialize"):
+            data = await sync_to_async(lambda: serializer.data)()
         return Response(data)
@@ -0,0 +1 @@
+"""Framework-agnostic helpers shared by the Bolt, DRF and FastAPI stacks."""
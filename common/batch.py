@@ -0,0 +1,50 @@
+"""Batch lookup helpers for GET /users/batch?ids= (all Python stacks)."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+MAX_BATCH_IDS = 100
+
+
+def parse_ids(raw: str | None, limit: int = MAX_BATCH_IDS) -> list[int]:
+    """
+    Parse a comma-separated id list, keeping request order and dropping duplicates.
+
+    Raises ValueError with a client-facing message (mapped to 400 by the routes).
+    """
+    if not raw or not raw.strip():
+        raise ValueError("ids is required (comma-separated user ids)")
+    ids: list[int] = []
+    seen: set[int] = set()
+    for part in raw.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        try:
+            value = int(part)
+        except ValueError:
+            raise ValueError(f"Invalid id: {part[:20]}") from None
+        if value < 1:
+            raise ValueError(f"Invalid id: {value}")
+        if value not in seen:
+            seen.add(value)
+            ids.append(value)
+    if not ids:
+        raise ValueError("ids is required (comma-separated user ids)")
+    if len(ids) > limit:
+        raise ValueError(f"Too many ids: {len(ids)} (max {limit})")
+    return ids
+
+
+def in_request_order(
+    ids: list[int], rows: Iterable[T], key=lambda row: row.id
+) -> tuple[list[T], list[int]]:
+    """Order fetched rows as requested; return (found rows, missing ids)."""
+    by_id = {key(row): row for row in rows}
+    items = [by_id[i] for i in ids if i in by_id]
+    missing = [i for i in ids if i not in by_id]
+    return items, missing
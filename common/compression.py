@@ -0,0 +1,181 @@
+"""
+Response compression settings and codecs shared by the Python stacks.
+
+Configured from the environment (same variables for every stack):
+
+  COMPRESSION_ENCODINGS   server preference order, e.g. "zstd,br,gzip"; "" = off
+  COMPRESSION_MIN_SIZE    smallest body worth compressing (bytes)
+  COMPRESSION_TYPES       media types to compress (prefix match, e.g. "text/")
+  COMPRESSION_GZIP_LEVEL / COMPRESSION_BROTLI_LEVEL / COMPRESSION_ZSTD_LEVEL
+
+Bolt compresses in Rust from settings.BOLT_COMPRESSION (first encoding, minimum
+size, gzip fallback); levels and the type allowlist apply to DRF and FastAPI,
+which compress here. brotli and zstd need the optional `brotli` and `zstandard`
+packages; encodings whose package is missing are skipped in Python.
+"""
+
+from __future__ import annotations
+
+import os
+import zlib
+from dataclasses import dataclass
+
+try:
+    import brotli
+except ImportError:  # optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # optional
+    zstandard = None
+
+ENCODINGS = ("zstd", "br", "gzip")
+DEFAULT_TYPES = (
+    "application/json",
+    "application/msgpack",
+    "application/x-ndjson",
+    "application/javascript",
+    "application/xml",
+    "text/",
+)
+DEFAULT_LEVELS = {"gzip": 6, "br": 4, "zstd": 3}
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    """Negotiable encodings (server preference order), thresholds and levels."""
+
+    encodings: tuple[str, ...] = ("gzip",)
+    min_size: int = 500
+    content_types: tuple[str, ...] = DEFAULT_TYPES
+    gzip_level: int = DEFAULT_LEVELS["gzip"]
+    brotli_level: int = DEFAULT_LEVELS["br"]
+    zstd_level: int = DEFAULT_LEVELS["zstd"]
+
+    def __post_init__(self):
+        unknown = set(self.encodings) - set(ENCODINGS)
+        if unknown:
+            raise ValueError(
+                f"Unknown encoding(s) {sorted(unknown)}; use {', '.join(ENCODINGS)}"
+            )
+
+    @property
+    def available(self) -> tuple[str, ...]:
+        """Configured encodings whose codec is installed (what Python can produce)."""
+        return tuple(e for e in self.encodings if codec_available(e))
+
+    def level(self, encoding: str) -> int:
+        return {
+            "gzip": self.gzip_level,
+            "br": self.brotli_level,
+            "zstd": self.zstd_level,
+        }[encoding]
+
+    def compressible(self, content_type: str | None) -> bool:
+        """Whether the media type is on the allowlist."""
+        media_type = (content_type or "").split(";", 1)[0].strip().lower()
+        return bool(media_type) and any(
+            media_type.startswith(t) for t in self.content_types
+        )
+
+
+def _split(value: str) -> tuple[str, ...]:
+    return tuple(v.strip().lower() for v in value.split(",") if v.strip())
+
+
+def compression_settings(environ=os.environ) -> CompressionSettings:
+    """CompressionSettings from COMPRESSION_* variables."""
+    types = environ.get("COMPRESSION_TYPES")
+    return CompressionSettings(
+        encodings=_split(environ.get("COMPRESSION_ENCODINGS", "gzip")),
+        min_size=int(environ.get("COMPRESSION_MIN_SIZE", "500")),
+        content_types=_split(types) if types else DEFAULT_TYPES,
+        gzip_level=int(environ.get("COMPRESSION_GZIP_LEVEL", DEFAULT_LEVELS["gzip"])),
+        brotli_level=int(environ.get("COMPRESSION_BROTLI_LEVEL", DEFAULT_LEVELS["br"])),
+        zstd_level=int(environ.get("COMPRESSION_ZSTD_LEVEL", DEFAULT_LEVELS["zstd"])),
+    )
+
+
+def codec_available(encoding: str) -> bool:
+    if encoding == "br":
+        return brotli is not None
+    if encoding == "zstd":
+        return zstandard is not None
+    return encoding == "gzip"
+
+
+def negotiate(accept_encoding: str | None, encodings: tuple[str, ...]) -> str | None:
+    """
+    Pick the encoding for a request: the client's highest q-value among `encodings`,
+    ties broken by server preference (order of `encodings`). None = send identity.
+    """
+    if not accept_encoding or not encodings:
+        return None
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[token] = q
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = accepted.get(encoding, accepted.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush()
+
+
+class _Brotli:
+    def __init__(self, level: int):
+        self._c = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.process(data)
+
+    def flush(self) -> bytes:
+        return self._c.finish()
+
+
+class _Zstd:
+    def __init__(self, level: int):
+        self._c = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._c.compress(data)
+
+    def flush(self) -> bytes:
+        return self._c.flush()
+
+
+_CODECS = {"gzip": _Gzip, "br": _Brotli, "zstd": _Zstd}
+
+
+def compressor(encoding: str, level: int):
+    """Incremental compressor with compress(chunk) -> bytes and flush() -> bytes."""
+    return _CODECS[encoding](level)
+
+
+def compress(body: bytes, encoding: str, level: int) -> bytes:
+    """Compress a whole body."""
+    c = compressor(encoding, level)
+    return c.compress(body) + c.flush()
@@ -0,0 +1,51 @@
+"""
+Database-rendered JSON pages for GET /users (USERS_LIST_RENDER=db).
+
+PostgreSQL returns the row count and one page of users as a JSON array in a
+single statement; each stack splices that text into its usual envelope without
+building or serializing per-user objects. The array is byte-identical to what
+msgspec, DRF's JSONRenderer and FastAPI's JSONResponse produce: compact
+separators, keys in UserSchema order, non-ASCII left as is. json_agg /
+json_build_object are not used because their output has spaces (" : ", ", ").
+"""
+
+from __future__ import annotations
+
+import json
+
+LIST_RENDERERS = ("python", "db")
+
+# One user as compact JSON; to_json() escapes strings as the Python encoders do
+USER_JSON = (
+    "'{\"id\":' || id || ',\"username\":' || to_json(username)::text"
+    " || ',\"role\":' || to_json(role::text)::text || '}'"
+)
+
+
+def list_renderer(value: str | None) -> str:
+    """Validated USERS_LIST_RENDER value ("python" by default)."""
+    value = (value or "python").strip().lower()
+    if value not in LIST_RENDERERS:
+        raise ValueError(
+            f"USERS_LIST_RENDER must be one of {', '.join(LIST_RENDERERS)}, got {value!r}"
+        )
+    return value
+
+
+def page_sql(filtered: str, limit: str, offset: str) -> str:
+    """
+    SELECT (total, items) for one page of `filtered`, an unordered SELECT of
+    id, username, role. `limit` / `offset` are the driver's placeholders.
+    The CTE is inlined, so the count and the page each use their own index.
+    """
+    return (
+        f"WITH f AS NOT MATERIALIZED ({filtered}) "
+        "SELECT (SELECT COUNT(*) FROM f)::int, "
+        f"(SELECT '[' || COALESCE(string_agg({USER_JSON}, ',' ORDER BY id), '') || ']' "
+        f"FROM (SELECT id, username, role FROM f ORDER BY id LIMIT {limit} OFFSET {offset}) p)"
+    )
+
+
+def dumps(value) -> str:
+    """Compact JSON for envelope fields (next / previous links, null)."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
@@ -0,0 +1,108 @@
+"""
+Conditional GET for the public user reads (GET /users, /users/{id}, /users/batch).
+
+Validators come from the accounts_user change counter (accounts.TableVersion):
+a database trigger bumps version and updated_at on every write, whichever stack
+makes it. Each stack reads the counter before the data, from the same database
+alias, so an ETag is never newer than the body it tags. A matching If-None-Match
+(or, when absent, If-Modified-Since) is answered with 304 before the handler
+queries or serializes anything.
+"""
+
+from __future__ import annotations
+
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from common.batch import parse_ids
+
+USERS_TABLE = "accounts_user"
+
+# Bolt / FastAPI paths and their DRF (/drf/..., trailing slash) equivalents
+CONDITIONAL_PATHS = re.compile(r"^(?:/drf)?/users(?:/\d+|/batch)?/?$")
+BATCH_PATH = re.compile(r"^(?:/drf)?/users/batch/?$")
+# Single users: may not exist, so "If-None-Match: *" is left to the handler
+RESOURCE_PATH = re.compile(r"^(?:/drf)?/users/\d+/?$")
+
+
+def wildcard_matches(path: str) -> bool:
+    """Whether "If-None-Match: *" can get 304 before the handler runs (the list and batch always exist)."""
+    return not RESOURCE_PATH.match(path)
+
+
+def is_conditional(path: str, ids: str | None = None) -> bool:
+    """
+    Whether a GET gets validators. Batch requests whose ?ids= the handler will
+    reject with 400 are skipped, so they cost no counter lookup.
+    """
+    if not CONDITIONAL_PATHS.match(path):
+        return False
+    if BATCH_PATH.match(path):
+        try:
+            parse_ids(ids)
+        except ValueError:
+            return False
+    return True
+
+
+def users_etag(version: int, variant: str = "") -> str:
+    """Weak ETag for a counter value; `variant` tags non-default representations (common.formats)."""
+    return f'W/"users-{version}-{variant}"' if variant else f'W/"users-{version}"'
+
+
+def http_date(value: datetime) -> str:
+    """Last-Modified value (naive datetimes are taken as UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True)
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: str | None, etag: str, wildcard: bool = True) -> bool:
+    """Weak comparison of If-None-Match against etag ("*" matches anything when `wildcard`)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return wildcard
+    target = _opaque(etag)
+    return any(_opaque(tag) == target for tag in if_none_match.split(","))
+
+
+def not_modified(
+    etag: str,
+    updated_at: datetime,
+    if_none_match: str | None,
+    if_modified_since: str | None,
+    wildcard: bool = True,
+) -> bool:
+    """
+    Whether a GET can be answered with 304 (If-None-Match wins over If-Modified-Since).
+    With wildcard=False, "If-None-Match: *" does not match (see wildcard_matches).
+    """
+    if if_none_match:
+        return etag_matches(if_none_match, etag, wildcard)
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    if updated_at.tzinfo is None:
+        updated_at = updated_at.replace(tzinfo=timezone.utc)
+    # HTTP dates have whole seconds
+    return updated_at.replace(microsecond=0) <= since
+
+
+def validators(version: int, updated_at: datetime, variant: str = "") -> dict[str, str]:
+    """ETag and Last-Modified headers for a counter state."""
+    return {
+        "ETag": users_etag(version, variant),
+        "Last-Modified": http_date(updated_at),
+    }
@@ -0,0 +1,120 @@
+"""
+Response formats for the public user reads (Bolt and FastAPI).
+
+Negotiated per request, on top of the usual JSON:
+
+  Accept: application/msgpack   MessagePack body (msgspec) instead of JSON
+  ?layout=columnar              list / batch items as parallel arrays,
+                                {"id": [...], "username": [...], "role": [...]},
+                                so each key is sent once per page, not once per user
+
+JSON with rows stays the default and wins ties (Accept: */*, no Accept header).
+The envelope (count, next, page, missing, ...) is the same in every format; only
+the items and the encoding change. The representation is part of the ETag
+(common.etag), so a JSON page never satisfies a conditional MessagePack request.
+"""
+
+from __future__ import annotations
+
+from operator import attrgetter, itemgetter
+
+import msgspec
+
+USER_FIELDS = ("id", "username", "role")
+LAYOUTS = ("rows", "columnar")
+MEDIA_TYPES = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+# Accept media types per format (MessagePack has no single registered type)
+_ACCEPT_TYPES = {
+    "application/json": "json",
+    "application/msgpack": "msgpack",
+    "application/x-msgpack": "msgpack",
+    "application/vnd.msgpack": "msgpack",
+}
+
+_encoders = {
+    "json": msgspec.json.Encoder(),
+    "msgpack": msgspec.msgpack.Encoder(),
+}
+
+
+def negotiate_format(accept: str | None) -> str:
+    """
+    "msgpack" when Accept ranks a MessagePack type above JSON, else "json".
+    Exact media types override */* and application/*; ties go to JSON.
+    """
+    if not accept or "msgpack" not in accept:
+        return "json"
+    exact: dict[str, float] = {}
+    wildcard = 0.0
+    for part in accept.split(","):
+        media_type, *params = part.split(";")
+        media_type = media_type.strip().lower()
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        fmt = _ACCEPT_TYPES.get(media_type)
+        if fmt is not None:
+            exact[fmt] = max(exact.get(fmt, 0.0), q)
+        elif media_type in ("*/*", "application/*"):
+            wildcard = max(wildcard, q)
+    msgpack_q = exact.get("msgpack", wildcard)
+    return "msgpack" if msgpack_q > exact.get("json", wildcard) else "json"
+
+
+def parse_layout(value: str | None) -> str:
+    """?layout= value (default rows); raises ValueError for unknown layouts."""
+    layout = (value or "rows").strip().lower()
+    if layout not in LAYOUTS:
+        raise ValueError(f"Invalid layout. Must be one of: {', '.join(LAYOUTS)}")
+    return layout
+
+
+def variant(fmt: str, layout: str) -> str:
+    """Representation tag for the ETag: "" for JSON rows, else e.g. "msgpack-columnar"."""
+    return "-".join(v for v in (fmt, layout) if v not in ("json", "rows"))
+
+
+def request_variant(accept: str | None, layout: str | None) -> str:
+    """variant() from raw request values; an invalid ?layout= counts as rows (the route answers 400)."""
+    try:
+        layout = parse_layout(layout)
+    except ValueError:
+        layout = "rows"
+    return variant(negotiate_format(accept), layout)
+
+
+def _getter(rows, fields: tuple[str, ...]):
+    """itemgetter for dicts / database records, attrgetter for structs and models."""
+    first = rows[0]
+    if isinstance(first, dict) or callable(getattr(first, "keys", None)):
+        return itemgetter(*fields)
+    return attrgetter(*fields)
+
+
+def columns(rows, fields: tuple[str, ...] = USER_FIELDS) -> dict[str, list]:
+    """Rows (dicts, records or objects) as parallel arrays {field: [values]}."""
+    if not rows:
+        return {field: [] for field in fields}
+    values = zip(*map(_getter(rows, fields), rows))
+    return {field: list(column) for field, column in zip(fields, values)}
+
+
+def records(rows, fields: tuple[str, ...] = USER_FIELDS) -> list[dict]:
+    """Rows (dicts, records or objects) as plain dicts with `fields`, for the encoders."""
+    if not rows:
+        return []
+    pick = _getter(rows, fields)
+    return [dict(zip(fields, pick(row))) for row in rows]
+
+
+def encode(value, fmt: str) -> bytes:
+    """Compact JSON or MessagePack for dicts, lists and msgspec Structs."""
+    return _encoders[fmt].encode(value)
@@ -0,0 +1,140 @@
+"""
+Background health monitor: probes a dependency on an interval and caches the result.
+
+/ready handlers read the cached state instead of hitting the database on every
+probe. The first read, a stale state (monitor not running) or ?fresh=1 run a
+live check; concurrent live checks share one probe.
+
+FastAPI starts the monitor in its lifespan; Bolt and DRF have no startup hook,
+so they call get(), which starts the loop lazily on the running event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class HealthState:
+    """Result of the latest probe."""
+
+    healthy: bool
+    consecutive_failures: int
+    latency_ms: float
+    checked_at: float
+    error: str | None = None
+
+    def as_dict(self) -> dict:
+        """Monitor details for the /ready response (age_ms 0 = live check)."""
+        return {
+            "age_ms": round((time.monotonic() - self.checked_at) * 1000, 1),
+            "latency_ms": round(self.latency_ms, 2),
+            "consecutive_failures": self.consecutive_failures,
+        }
+
+
+class HealthMonitor:
+    """
+    Runs `probe` every `interval` seconds; the probe raises on failure.
+
+    The dependency is reported unhealthy after `failure_threshold` consecutive
+    failures. A state older than `max_age` (default 3 intervals) is not trusted.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], Awaitable[object]],
+        interval: float = 5.0,
+        timeout: float = 2.0,
+        failure_threshold: int = 1,
+        max_age: float | None = None,
+    ):
+        self.probe = probe
+        self.interval = interval
+        self.timeout = timeout
+        self.failure_threshold = max(1, failure_threshold)
+        self.max_age = max_age if max_age is not None else interval * 3
+        self.state: HealthState | None = None
+        self.checks = 0
+        self.failures = 0
+        self._task: asyncio.Task | None = None
+        self._inflight: asyncio.Task | None = None
+
+    async def check(self) -> HealthState:
+        """Run a live probe now (shared with any probe already in flight)."""
+        inflight = self._inflight
+        if inflight is None or inflight.done() or not _on_running_loop(inflight):
+            inflight = self._inflight = asyncio.create_task(self._probe_once())
+        return await asyncio.shield(inflight)
+
+    async def get(self, fresh: bool = False) -> HealthState:
+        """Cached state; live probe if fresh, missing or stale."""
+        self.ensure_started()
+        state = self.state
+        if fresh or state is None or time.monotonic() - state.checked_at > self.max_age:
+            state = await self.check()
+        return state
+
+    def ensure_started(self) -> None:
+        """Start the background loop on the running event loop if it is not running."""
+        task = self._task
+        if task is not None and not task.done() and _on_running_loop(task):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background loop."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.interval)
+
+    async def _probe_once(self) -> HealthState:
+        start = time.perf_counter()
+        error = None
+        try:
+            await asyncio.wait_for(self.probe(), self.timeout)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        latency_ms = (time.perf_counter() - start) * 1000
+        previous = self.state.consecutive_failures if self.state else 0
+        failures = previous + 1 if error else 0
+        self.checks += 1
+        if error:
+            self.failures += 1
+        self.state = HealthState(
+            healthy=failures < self.failure_threshold,
+            consecutive_failures=failures,
+            latency_ms=latency_ms,
+            checked_at=time.monotonic(),
+            error=error,
+        )
+        return self.state
+
+
+def ready_payload(state: HealthState) -> dict:
+    """/ready body shared by the stacks: status, per-check result, monitor details."""
+    return {
+        "status": "healthy" if state.healthy else "unhealthy",
+        "checks": {"database": "ok" if state.healthy else "error"},
+        "monitor": state.as_dict(),
+    }
+
+
+def is_fresh(value: str | None) -> bool:
+    """?fresh=1 / ?fresh=true forces a live check."""
+    return value in ("1", "true")
+
+
+def _on_running_loop(task: asyncio.Task) -> bool:
+    return task.get_loop() is asyncio.get_running_loop()
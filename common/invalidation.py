@@ -0,0 +1,185 @@
+"""
+Cross-worker invalidation of the response cache via PostgreSQL LISTEN/NOTIFY.
+
+Triggers on accounts_user (migration accounts.0004) send NOTIFY on CHANNEL after
+every INSERT, UPDATE, DELETE or TRUNCATE, so writes from any stack and any
+worker are seen. The payload is the comma-separated ids of the changed rows, or
+"*" when there are too many to fit (NOTIFY payloads are limited to 8000 bytes)
+and for TRUNCATE. Notifications are delivered when the writing transaction
+commits.
+
+Each worker process runs one InvalidationListener: a background task on one
+dedicated asyncpg connection (outside the request pools, no broker). For every
+notification it evicts the cached user list and batch pages and the detail pages
+of the changed ids. The cache is cleared whenever the LISTEN connection is
+(re)established, because writes made while it was down were not seen.
+
+FastAPI starts the listener in its lifespan; Bolt and DRF start it lazily from
+the cache middleware, like the health monitor.
+
+LISTEN needs a session. With DB_POOL_MODE=transaction (PgBouncer transaction
+pooling) notifications would be lost, so listen_address() requires
+DB_LISTEN_HOST (and optionally DB_LISTEN_PORT) pointing at PostgreSQL or a
+session pool, and refuses to start otherwise.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import re
+from collections.abc import Awaitable, Callable
+
+CHANNEL = "accounts_user_changed"
+ALL = "*"
+
+# /users, /users/batch, /users/{id} and their /drf/ equivalents
+USER_PATHS = re.compile(r"^(?:/drf)?/users(?:/(\d+)|/batch)?/?$")
+
+
+def listen_address(
+    host: str, port: int, pool_mode: str, listening: bool, environ=os.environ
+) -> tuple[str, int]:
+    """
+    (host, port) of the LISTEN connection: DB_LISTEN_HOST / DB_LISTEN_PORT, else
+    the main database. Raises ValueError when `listening` behind a transaction
+    pooler without DB_LISTEN_HOST.
+    """
+    listen_host = environ.get("DB_LISTEN_HOST", "").strip()
+    listen_port = int(environ.get("DB_LISTEN_PORT") or port)
+    if listen_host:
+        return listen_host, listen_port
+    if listening and pool_mode == "transaction":
+        raise ValueError(
+            "DB_POOL_MODE=transaction: LISTEN needs a session. Set DB_LISTEN_HOST "
+            "(and DB_LISTEN_PORT) to PostgreSQL or a session pool, or "
+            "RESPONSE_CACHE_LISTEN=0 to rely on the TTL."
+        )
+    return host, listen_port
+
+
+def parse_payload(payload: str) -> frozenset[int] | None:
+    """Changed user ids from a notification; None means all users."""
+    if not payload or payload == ALL:
+        return None
+    try:
+        return frozenset(int(part) for part in payload.split(","))
+    except ValueError:
+        return None
+
+
+def user_paths(ids: frozenset[int] | None) -> Callable[[str], bool]:
+    """Path predicate: list and batch pages always, detail pages of `ids` (all if None)."""
+
+    def match(path: str) -> bool:
+        m = USER_PATHS.match(path)
+        if m is None:
+            return False
+        user_id = m.group(1)
+        return user_id is None or ids is None or int(user_id) in ids
+
+    return match
+
+
+class InvalidationListener:
+    """
+    Keeps a LISTEN connection to CHANNEL open and evicts from `cache` (a
+    ResponseCache) on each notification. `connect` opens a new asyncpg
+    connection. A lost connection is reopened after `retry` seconds, and an
+    idle one is checked every `keepalive` seconds.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], Awaitable[object]],
+        cache,
+        channel: str = CHANNEL,
+        retry: float = 1.0,
+        keepalive: float = 30.0,
+    ):
+        self.connect = connect
+        self.cache = cache
+        self.channel = channel
+        self.retry = retry
+        self.keepalive = keepalive
+        self.connected = False
+        self.notifications = 0
+        self.evicted = 0
+        self.connects = 0
+        self.errors = 0
+        self.last_error: str | None = None
+        self._task: asyncio.Task | None = None
+
+    def ensure_started(self) -> None:
+        """Start the background task on the running event loop if it is not running."""
+        task = self._task
+        if (
+            task is not None
+            and not task.done()
+            and task.get_loop() is asyncio.get_running_loop()
+        ):
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background task (closes the connection)."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    def notify(self, payload: str) -> int:
+        """Evict the entries a notification payload invalidates; returns how many."""
+        self.notifications += 1
+        evicted = self.cache.evict(user_paths(parse_payload(payload)))
+        self.evicted += evicted
+        return evicted
+
+    def stats(self) -> dict:
+        """Counters for GET /cache/stats (this worker process)."""
+        return {
+            "channel": self.channel,
+            "connected": self.connected,
+            "connects": self.connects,
+            "notifications": self.notifications,
+            "evicted": self.evicted,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e) or type(e).__name__
+            await asyncio.sleep(self.retry)
+
+    async def _listen(self) -> None:
+        conn = await self.connect()
+        lost = asyncio.Event()
+        try:
+            conn.add_termination_listener(lambda _conn: lost.set())
+            await conn.add_listener(
+                self.channel,
+                lambda _conn, _pid, _channel, payload: self.notify(payload),
+            )
+            # Writes while no connection was listening were missed
+            self.cache.clear()
+            self.connects += 1
+            self.connected = True
+            while not lost.is_set():
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(lost.wait(), self.keepalive)
+                if not lost.is_set():
+                    await asyncio.wait_for(conn.execute("SELECT 1"), self.retry + 5)
+            raise ConnectionError("LISTEN connection lost")
+        finally:
+            self.connected = False
+            with contextlib.suppress(Exception):
+                await conn.close(timeout=1)
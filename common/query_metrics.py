@@ -0,0 +1,89 @@
+"""
+Per-endpoint SQL query counts and DB time of one worker process.
+
+The timing middleware of each stack records every timed request (its
+common.timing.Timings) under "METHOD /path", with numeric path segments folded
+to {id} so /users/1 and /users/2 share a row. /db/stats returns the totals:
+
+    {"requests": 120, "queries": 240, "endpoints": {"GET /users/{id}": {
+        "requests": 120, "queries": 240, "queries_per_request": 2.0,
+        "max_queries": 2, "db_ms": 61.3, "db_ms_per_request": 0.511,
+        "db_share": 0.38}}}
+
+A new query on a hot path shows up as queries_per_request going up; db_share
+is the part of the endpoint's response time spent executing queries.
+"""
+
+from __future__ import annotations
+
+import re
+
+from common.timing import Timings
+
+# Endpoints beyond this many (scanners, typos) are counted under OTHER
+MAX_ENDPOINTS = 256
+OTHER = "other"
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint(method: str, path: str) -> str:
+    """Metrics key of a request: "GET /users/{id}"."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class _Endpoint:
+    __slots__ = ("db_seconds", "max_queries", "queries", "requests", "seconds")
+
+    def __init__(self):
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_seconds = 0.0
+        self.seconds = 0.0
+
+
+class QueryMetrics:
+    """Query count and DB time totals per endpoint (see module docstring)."""
+
+    def __init__(self, max_endpoints: int = MAX_ENDPOINTS):
+        self.max_endpoints = max_endpoints
+        self._endpoints: dict[str, _Endpoint] = {}
+
+    def record(self, method: str, path: str, timings: Timings, total: float) -> None:
+        key = endpoint(method, path)
+        row = self._endpoints.get(key)
+        if row is None:
+            if len(self._endpoints) >= self.max_endpoints:
+                key = OTHER
+                row = self._endpoints.get(key)
+            if row is None:
+                row = self._endpoints[key] = _Endpoint()
+        row.requests += 1
+        row.queries += timings.queries
+        row.max_queries = max(row.max_queries, timings.queries)
+        row.db_seconds += timings.durations.get("db", 0.0)
+        row.seconds += total
+
+    def clear(self) -> None:
+        self._endpoints.clear()
+
+    def stats(self) -> dict:
+        endpoints = {}
+        for key, row in sorted(self._endpoints.items()):
+            endpoints[key] = {
+                "requests": row.requests,
+                "queries": row.queries,
+                "queries_per_request": round(row.queries / row.requests, 2),
+                "max_queries": row.max_queries,
+                "db_ms": round(row.db_seconds * 1000, 2),
+                "db_ms_per_request": round(row.db_seconds * 1000 / row.requests, 3),
+                "db_share": round(row.db_seconds / row.seconds, 3)
+                if row.seconds
+                else 0.0,
+            }
+        return {
+            "requests": sum(row.requests for row in self._endpoints.values()),
+            "queries": sum(row.queries for row in self._endpoints.values()),
+            "endpoints": endpoints,
+        }
@@ -0,0 +1,102 @@
+"""
+Read-replica selection with lag-aware fallback and read-your-writes stickiness.
+
+Each replica has a HealthMonitor whose probe measures replication lag and fails
+when it exceeds max_lag; pick() returns a healthy replica (round robin) or None,
+meaning "read from the primary". After a write, mark_write() pins reads of this
+process to the primary for sticky_seconds; callers can extend that to other
+processes with a client cookie (see PRIMARY_COOKIE).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import time
+from collections.abc import Awaitable, Callable
+
+from common.health import HealthMonitor
+
+# Seconds since the last replayed transaction; 0 when the replica has replayed
+# everything it received (an idle primary would otherwise look like lag) or
+# when the server is not in recovery (it is a primary).
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+# Set on write responses; while present, the client's reads go to the primary.
+PRIMARY_COOKIE = "db_primary"
+
+
+class ReplicaLagError(Exception):
+    """Replica is further behind than max_lag."""
+
+
+class ReplicaSet:
+    """Healthy-replica picker; lag_query(name) returns the lag of replica `name` in seconds."""
+
+    def __init__(
+        self,
+        names: list[str],
+        lag_query: Callable[[str], Awaitable[float]],
+        max_lag: float = 5.0,
+        check_interval: float = 1.0,
+        sticky_seconds: float = 5.0,
+    ):
+        self.names = list(names)
+        self.max_lag = max_lag
+        self.sticky_seconds = sticky_seconds
+        self.lag: dict[str, float] = {}
+        self.monitors = {
+            name: HealthMonitor(
+                self._lag_probe(name, lag_query),
+                interval=check_interval,
+                timeout=max(check_interval, 2.0),
+            )
+            for name in self.names
+        }
+        self._rr = itertools.cycle(self.names)
+        self._primary_until = 0.0
+
+    def _lag_probe(self, name: str, lag_query) -> Callable[[], Awaitable[None]]:
+        async def probe() -> None:
+            lag = float(await lag_query(name))
+            self.lag[name] = lag
+            if lag > self.max_lag:
+                raise ReplicaLagError(f"{name} lag {lag:.1f}s > {self.max_lag:g}s")
+
+        return probe
+
+    def mark_write(self) -> None:
+        """Pin this process's reads to the primary for sticky_seconds."""
+        self._primary_until = time.monotonic() + self.sticky_seconds
+
+    def pick(self, sticky: bool = False) -> str | None:
+        """A healthy replica, or None to read from the primary."""
+        if not self.names:
+            return None
+        self._ensure_monitors()
+        if sticky or time.monotonic() < self._primary_until:
+            return None
+        for _ in range(len(self.names)):
+            name = next(self._rr)
+            state = self.monitors[name].state
+            if state is not None and state.healthy:
+                return name
+        return None
+
+    async def stop(self) -> None:
+        for monitor in self.monitors.values():
+            await monitor.stop()
+
+    def _ensure_monitors(self) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        for monitor in self.monitors.values():
+            monitor.ensure_started()
@@ -0,0 +1,404 @@
+"""
+Micro-cache of whole responses for the public GET endpoints (Bolt, DRF, FastAPI).
+
+GET /users, /users/{id}, /users/batch, /roles, /roles/code/{code} and
+/health/test (and their /drf/ equivalents) are kept in process memory for a
+short TTL, keyed by path, the query parameters (sorted) and the request headers
+listed in RESPONSE_CACHE_VARY. Configured from the environment (same variables
+for every stack):
+
+  RESPONSE_CACHE_TTL              seconds an entry is fresh, e.g. 0.1 to 5; 0 = off
+  RESPONSE_CACHE_STALE            further seconds an expired entry may be served
+                                  while one request refreshes it
+  RESPONSE_CACHE_MAX_BYTES        memory budget (bodies and headers), LRU eviction
+  RESPONSE_CACHE_MAX_ENTRY_BYTES  larger responses are never stored
+  RESPONSE_CACHE_VARY             request headers in the key (default: accept)
+  RESPONSE_CACHE_LISTEN           1 (default): evict on writes to accounts_user
+                                  via LISTEN/NOTIFY (common.invalidation); 0 = TTL only
+  RESPONSE_CACHE_BACKEND          memory (default): LRU per worker process;
+                                  shared: one table in shared memory for all the
+                                  workers on the host (common.shm_cache)
+  RESPONSE_CACHE_SLOT_BYTES       shared: slot size, 16 KiB; larger responses are
+                                  not stored (MAX_BYTES / SLOT_BYTES slots)
+
+Stale-while-revalidate is single-flight: the first request after expiry runs the
+handler and refreshes the entry, and concurrent requests for the same key get the
+stale copy meanwhile, so there is no background task and no stampede. Requests
+with an Authorization header or a session / read-your-writes cookie bypass the
+cache, as do responses other than 200 and those with Set-Cookie or
+Cache-Control: private / no-store. The cache sits outside the conditional-GET
+middleware, so entries keep their ETag and a matching If-None-Match gets 304
+from the cache. Each worker process has its own cache (or they share one with
+RESPONSE_CACHE_BACKEND=shared), kept consistent across workers by
+common.invalidation; stats() feeds GET /cache/stats and every cacheable
+response carries X-Cache.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import msgspec
+
+from common.etag import etag_matches
+from common.replicas import PRIMARY_COOKIE
+
+# Bolt / FastAPI paths and their DRF (/drf/..., trailing slash) equivalents
+CACHEABLE_PATHS = re.compile(
+    r"^(?:/drf)?/(?:users(?:/\d+|/batch)?|roles(?:/code/[^/]+)?|health/test)/?$"
+)
+
+HIT, STALE, MISS, BYPASS = "HIT", "STALE", "MISS", "BYPASS"
+BACKENDS = ("memory", "shared")
+
+# Response headers a 304 from the cache repeats (RFC 9110 15.4.5)
+_VALIDATOR_HEADERS = ("etag", "last-modified", "vary", "cache-control")
+
+
+@dataclass(frozen=True)
+class CacheSettings:
+    """TTLs, memory bounds and key headers of the response cache."""
+
+    ttl: float = 0.0
+    stale: float = 0.0
+    max_bytes: int = 32 * 1024 * 1024
+    max_entry_bytes: int = 1024 * 1024
+    vary: tuple[str, ...] = ("accept",)
+    private_cookies: tuple[str, ...] = (PRIMARY_COOKIE, "sessionid")
+    listen: bool = True
+    backend: str = "memory"
+    slot_bytes: int = 16 * 1024
+
+    def __post_init__(self):
+        if self.ttl < 0 or self.stale < 0:
+            raise ValueError("RESPONSE_CACHE_TTL and RESPONSE_CACHE_STALE must be >= 0")
+        if self.backend not in BACKENDS:
+            raise ValueError(
+                f"RESPONSE_CACHE_BACKEND must be one of: {', '.join(BACKENDS)}"
+            )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+
+def cache_settings(environ=os.environ) -> CacheSettings:
+    """CacheSettings from RESPONSE_CACHE_* variables."""
+    vary = environ.get("RESPONSE_CACHE_VARY")
+    return CacheSettings(
+        ttl=float(environ.get("RESPONSE_CACHE_TTL", "0")),
+        stale=float(environ.get("RESPONSE_CACHE_STALE", "0")),
+        max_bytes=int(environ.get("RESPONSE_CACHE_MAX_BYTES", 32 * 1024 * 1024)),
+        max_entry_bytes=int(environ.get("RESPONSE_CACHE_MAX_ENTRY_BYTES", 1024 * 1024)),
+        vary=(
+            tuple(v.strip().lower() for v in vary.split(",") if v.strip())
+            if vary is not None
+            else ("accept",)
+        ),
+        listen=environ.get("RESPONSE_CACHE_LISTEN", "1").lower() not in ("0", "false"),
+        backend=environ.get("RESPONSE_CACHE_BACKEND", "memory").strip().lower(),
+        slot_bytes=int(environ.get("RESPONSE_CACHE_SLOT_BYTES", 16 * 1024)),
+    )
+
+
+def cache_key(path: str, query, headers, vary: tuple[str, ...]) -> tuple:
+    """Key from the path, (name, value) query pairs in any order and the `vary` request headers."""
+    return (
+        path,
+        tuple(sorted(query)),
+        tuple((headers.get(name) or "").strip().lower() for name in vary),
+    )
+
+
+def is_private(headers, cookies, config: CacheSettings) -> bool:
+    """Whether the request carries credentials or a read-your-writes pin (never cached)."""
+    if headers.get("authorization"):
+        return True
+    return bool(cookies) and any(cookies.get(name) for name in config.private_cookies)
+
+
+def storable(status: int, headers: list[tuple[str, str]]) -> bool:
+    """200 without Set-Cookie or Cache-Control: private / no-store."""
+    if status != 200:
+        return False
+    for name, value in headers:
+        name = name.lower()
+        if name == "set-cookie":
+            return False
+        if name == "cache-control":
+            value = value.lower()
+            if "private" in value or "no-store" in value:
+                return False
+    return True
+
+
+class Entry:
+    """A cached response: status, (name, value) header pairs, body and expiry times."""
+
+    __slots__ = (
+        "body",
+        "etag",
+        "fresh_until",
+        "headers",
+        "size",
+        "stale_until",
+        "status",
+    )
+
+    def __init__(self, status, headers, body, fresh_until, stale_until):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.size = len(body) + sum(len(k) + len(v) for k, v in headers)
+        self.etag = next((v for k, v in headers if k.lower() == "etag"), None)
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+    def not_modified(self, if_none_match: str | None) -> bool:
+        return self.etag is not None and etag_matches(if_none_match, self.etag)
+
+    def validators(self) -> list[tuple[str, str]]:
+        """Headers for a 304 answered from this entry."""
+        return [(k, v) for k, v in self.headers if k.lower() in _VALIDATOR_HEADERS]
+
+
+class MemoryStore:
+    """Entries of one worker process: LRU within `max_bytes`."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, Entry] = OrderedDict()
+        self.bytes = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> Entry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: tuple, entry: Entry) -> bool:
+        self.pop(key)
+        while self._entries and self.bytes + entry.size > self.max_bytes:
+            self.bytes -= self._entries.popitem(last=False)[1].size
+            self.evictions += 1
+        self._entries[key] = entry
+        self.bytes += entry.size
+        return True
+
+    def pop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+
+    def evict(self, match) -> int:
+        keys = [key for key in self._entries if match(key[0])]
+        for key in keys:
+            self.pop(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes = 0
+
+    def keys(self) -> list[tuple]:
+        return list(self._entries)
+
+    def usage(self) -> tuple[int, int]:
+        """(entries, bytes)"""
+        return len(self._entries), self.bytes
+
+
+class SharedStore:
+    """
+    Entries in a SharedTable (common/shm_cache.py): one copy read and written by
+    every worker process on the host. Keys and entries are packed with msgspec
+    (MessagePack header list, then the body bytes as is).
+    """
+
+    def __init__(self, table):
+        self.table = table
+
+    @property
+    def evictions(self) -> int:
+        return self.table.evictions
+
+    def get(self, key: tuple) -> Entry | None:
+        found = self.table.get(_pack_key(key))
+        if found is None:
+            return None
+        value = found[0]
+        size = _META_SIZE.unpack_from(value)[0]
+        status, headers, fresh_until, stale_until = _meta_decoder.decode(
+            memoryview(value)[_META_SIZE.size : _META_SIZE.size + size]
+        )
+        body = value[_META_SIZE.size + size :]
+        return Entry(status, headers, body, fresh_until, stale_until)
+
+    def set(self, key: tuple, entry: Entry) -> bool:
+        meta = _encoder.encode(
+            (entry.status, entry.headers, entry.fresh_until, entry.stale_until)
+        )
+        value = b"".join((_META_SIZE.pack(len(meta)), meta, entry.body))
+        return self.table.set(_pack_key(key), value, entry.stale_until)
+
+    def pop(self, key: tuple) -> None:
+        self.table.delete(_pack_key(key))
+
+    def evict(self, match) -> int:
+        return self.table.delete_where(lambda packed: match(_unpack_key(packed)[0]))
+
+    def clear(self) -> None:
+        self.table.clear()
+
+    def keys(self) -> list[tuple]:
+        return [_unpack_key(packed) for packed in self.table.keys()]
+
+    def usage(self) -> tuple[int, int]:
+        return self.table.usage()
+
+
+_encoder = msgspec.msgpack.Encoder()
+_meta_decoder = msgspec.msgpack.Decoder(tuple[int, list[tuple[str, str]], float, float])
+_META_SIZE = struct.Struct("<I")
+
+
+def _pack_key(key: tuple) -> bytes:
+    return _encoder.encode(key)
+
+
+def _unpack_key(packed: bytes) -> tuple:
+    path, query, vary = msgspec.msgpack.decode(packed)
+    return path, tuple(map(tuple, query)), tuple(vary)
+
+
+class ResponseCache:
+    """
+    Entry per key in a store (MemoryStore unless given) with single-flight
+    refresh. get() returns an entry to serve or MISS; after a MISS the caller
+    runs the handler and must call put() (or release() if the handler raised).
+    Counters and pending refreshes are per process whatever the store.
+    """
+
+    def __init__(self, config: CacheSettings, clock=time.monotonic, store=None):
+        self.config = config
+        self._clock = clock
+        self.store = store if store is not None else MemoryStore(config.max_bytes)
+        self._refreshing: set[tuple] = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.stores = 0
+        self.invalidations = 0
+        self.bytes_served = 0
+
+    def get(self, key: tuple) -> tuple[Entry | None, str]:
+        """(entry, HIT or STALE) to serve, or (None, MISS)."""
+        entry = self.store.get(key)
+        if entry is not None:
+            now = self._clock()
+            if now < entry.fresh_until:
+                self.hits += 1
+                self.bytes_served += len(entry.body)
+                return entry, HIT
+            if now < entry.stale_until and key in self._refreshing:
+                self.stale_hits += 1
+                self.bytes_served += len(entry.body)
+                return entry, STALE
+            if now >= entry.stale_until:
+                self.store.pop(key)
+        self.misses += 1
+        self._refreshing.add(key)
+        return None, MISS
+
+    def put(
+        self, key: tuple, status: int, headers: list[tuple[str, str]], body: bytes
+    ) -> bool:
+        """
+        Finish a MISS: store the response if storable and small enough. Not
+        stored if the key was evicted meanwhile (the response may predate the
+        write that evicted it).
+        """
+        if key not in self._refreshing:
+            return False
+        self._refreshing.discard(key)
+        if not storable(status, headers):
+            return False
+        now = self._clock()
+        entry = Entry(
+            status,
+            headers,
+            body,
+            now + self.config.ttl,
+            now + self.config.ttl + self.config.stale,
+        )
+        if entry.size > self.config.max_entry_bytes or not self.store.set(key, entry):
+            return False
+        self.stores += 1
+        return True
+
+    def release(self, key: tuple) -> None:
+        """Finish a MISS whose handler failed."""
+        self._refreshing.discard(key)
+
+    def bypass(self) -> None:
+        self.bypasses += 1
+
+    def evict(self, match) -> int:
+        """Drop the entries (and pending refreshes) whose path satisfies `match`; returns how many."""
+        evicted = self.store.evict(match)
+        self._refreshing = {key for key in self._refreshing if not match(key[0])}
+        self.invalidations += evicted
+        return evicted
+
+    def clear(self) -> None:
+        self.store.clear()
+        self._refreshing.clear()
+
+    def stats(self) -> dict:
+        """Counters for GET /cache/stats (this worker process; entries and bytes of the store)."""
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        entries, size = self.store.usage()
+        return {
+            "enabled": self.config.enabled,
+            "backend": self.config.backend,
+            "ttl": self.config.ttl,
+            "stale": self.config.stale,
+            "entries": entries,
+            "bytes": size,
+            "max_bytes": self.config.max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "bypasses": self.bypasses,
+            "stores": self.stores,
+            "evictions": self.store.evictions,
+            "invalidations": self.invalidations,
+            "hit_ratio": round(served / lookups, 4) if lookups else 0.0,
+            "bytes_served": self.bytes_served,
+        }
+
+
+def new_cache(config: CacheSettings, name: str) -> ResponseCache:
+    """
+    ResponseCache with the configured backend. With RESPONSE_CACHE_BACKEND=shared
+    the workers of a stack share one table, found by `name` ("django" for Bolt
+    and DRF, "fastapi"); entry times are then wall-clock, valid in every process.
+    """
+    if config.enabled and config.backend == "shared":
+        from common.shm_cache import SharedTable
+
+        table = SharedTable(
+            f"response-cache-{name}",
+            slots=config.max_bytes // config.slot_bytes,
+            slot_bytes=config.slot_bytes,
+        )
+        return ResponseCache(config, clock=time.time, store=SharedStore(table))
+    return ResponseCache(config)
@@ -0,0 +1,278 @@
+"""
+Fixed-slot hash table in shared memory, one copy for all worker processes on a host.
+
+The table is a file under /dev/shm (tmpfs; the temp directory elsewhere) mapped
+with mmap by every process that opens the same name, so an entry stored by one
+Bolt or uvicorn worker is read by the others straight from the mapping, without
+a broker or a socket round trip. It is a plain file rather than
+multiprocessing.shared_memory, whose resource tracker unlinks the segment when
+the process that created it exits, and because the file descriptor carries the
+write locks.
+
+Layout: a header, one clock hand per bucket, then `slots` slots of `slot_bytes`
+each, grouped in buckets of WAYS slots. A key (bytes) hashes (crc32) to one
+bucket and may live in any of its slots. Each slot holds a sequence number, the
+key hash, key and value lengths, an expiry time (time.time(), shared by all
+processes), a reference bit, then the key and value bytes.
+
+  - Reads take no lock (seqlock): the writer makes the sequence number odd,
+    writes, then makes it even again; a reader copies the value and checks the
+    number did not change, else it reports a miss.
+  - Writes lock the bucket (fcntl byte-range lock, plus a thread lock within
+    the process) and use the slot with the same key, a free or expired slot,
+    or the clock victim: the hand skips and clears slots whose reference bit
+    was set by a read since it last passed.
+
+Values larger than a slot are not stored. POSIX only (fcntl).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections.abc import Callable
+
+WAYS = 8
+MAGIC = b"SHMTAB01"
+
+_HEADER = struct.Struct("<8sII")  # magic, slots, slot_bytes
+_HEADER_BYTES = 64
+# seq, key hash, key length, reference bit, value length, expires
+_SLOT = struct.Struct("<QIHBxId")
+_SLOT_HEADER = 32
+_SEQ = struct.Struct("<Q")
+_REF_OFFSET = 14
+
+
+def _directory() -> str:
+    return "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
+
+class SharedTable:
+    """
+    bytes -> bytes map with expiry in a shared mmap file `name`. Every process
+    opening the same name and geometry shares the entries; the first one
+    creates the file.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        slots: int,
+        slot_bytes: int = 16384,
+        directory: str | None = None,
+    ):
+        if slot_bytes <= _SLOT_HEADER:
+            raise ValueError(f"slot_bytes must be > {_SLOT_HEADER}")
+        self.buckets = max(1, slots // WAYS)
+        self.slots = self.buckets * WAYS
+        self.slot_bytes = slot_bytes
+        self.capacity = slot_bytes - _SLOT_HEADER
+        self._hands = _HEADER_BYTES
+        self._data = _HEADER_BYTES + -(-self.buckets // 64) * 64
+        self.size = self._data + self.slots * slot_bytes
+        # Geometry in the file name: processes with other settings never share a mapping
+        self.path = os.path.join(
+            directory or _directory(), f"{name}-{self.slots}x{slot_bytes}"
+        )
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._thread_lock = threading.Lock()
+        self._init_file()
+        self._mm = mmap.mmap(self._fd, self.size)
+        self._buf = memoryview(self._mm)
+        self.evictions = 0
+
+    def _init_file(self) -> None:
+        header = _HEADER.pack(MAGIC, self.slots, self.slot_bytes)
+        fcntl.lockf(self._fd, fcntl.LOCK_EX)
+        try:
+            size = os.fstat(self._fd).st_size
+            if size != self.size or os.pread(self._fd, len(header), 0) != header:
+                os.ftruncate(self._fd, 0)
+                os.ftruncate(self._fd, self.size)
+                os.pwrite(self._fd, header, 0)
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _lock(self, bucket: int | None = None):
+        """Bucket write lock (whole table if None); a context manager."""
+        return _Lock(self, bucket)
+
+    def _slot(self, bucket: int, way: int) -> int:
+        return self._data + (bucket * WAYS + way) * self.slot_bytes
+
+    def _find(self, key: bytes, key_hash: int, bucket: int) -> tuple | None:
+        """(offset, slot header) of the slot holding `key` in `bucket`, seq even when read."""
+        buf = self._buf
+        for way in range(WAYS):
+            offset = self._slot(bucket, way)
+            slot = _SLOT.unpack_from(buf, offset)
+            seq, slot_hash, key_len = slot[0], slot[1], slot[2]
+            if seq & 1 or slot_hash != key_hash or key_len != len(key):
+                continue
+            start = offset + _SLOT_HEADER
+            if buf[start : start + key_len] == key:
+                return offset, slot
+        return None
+
+    def get(self, key: bytes) -> tuple[bytes, float] | None:
+        """(value, expires) without locking, or None (missing, or being written)."""
+        key_hash = zlib.crc32(key)
+        found = self._find(key, key_hash, key_hash % self.buckets)
+        if found is None:
+            return None
+        offset, (seq, _hash, key_len, ref, value_len, expires) = found
+        buf = self._buf
+        start = offset + _SLOT_HEADER + key_len
+        value = bytes(buf[start : start + value_len])
+        # Rewritten since the key was compared: the value may be torn or another key's
+        if _SEQ.unpack_from(buf, offset)[0] != seq:
+            return None
+        if not ref:
+            buf[offset + _REF_OFFSET] = 1
+        return value, expires
+
+    def set(self, key: bytes, value: bytes, expires: float) -> bool:
+        """Store `value` until `expires` (time.time()); False if it does not fit in a slot."""
+        if len(key) + len(value) > self.capacity or not key:
+            return False
+        key_hash = zlib.crc32(key)
+        bucket = key_hash % self.buckets
+        with self._lock(bucket):
+            found = self._find(key, key_hash, bucket)
+            offset = self._victim(bucket) if found is None else found[0]
+            self._write(offset, key_hash, key, value, expires)
+        return True
+
+    def _victim(self, bucket: int) -> int:
+        """Free or expired slot of the bucket, else the clock's choice (lock held)."""
+        buf = self._buf
+        now = time.time()
+        for way in range(WAYS):
+            offset = self._slot(bucket, way)
+            _seq, _hash, key_len, _ref, _value_len, expires = _SLOT.unpack_from(
+                buf, offset
+            )
+            if key_len == 0 or expires <= now:
+                return offset
+        hand = buf[self._hands + bucket] % WAYS
+        while True:
+            offset = self._slot(bucket, hand)
+            hand = (hand + 1) % WAYS
+            if buf[offset + _REF_OFFSET]:
+                buf[offset + _REF_OFFSET] = 0
+                continue
+            buf[self._hands + bucket] = hand
+            self.evictions += 1
+            return offset
+
+    def _write(
+        self, offset: int, key_hash: int, key: bytes, value: bytes, expires: float
+    ) -> None:
+        buf = self._buf
+        seq = _SEQ.unpack_from(buf, offset)[0]
+        _SEQ.pack_into(buf, offset, seq + 1)
+        start = offset + _SLOT_HEADER
+        buf[start : start + len(key)] = key
+        buf[start + len(key) : start + len(key) + len(value)] = value
+        _SLOT.pack_into(
+            buf, offset, seq + 1, key_hash, len(key), 0, len(value), expires
+        )
+        _SEQ.pack_into(buf, offset, seq + 2)
+
+    def _clear_slot(self, offset: int) -> None:
+        seq = _SEQ.unpack_from(self._buf, offset)[0]
+        _SEQ.pack_into(self._buf, offset, seq + 1)
+        _SLOT.pack_into(self._buf, offset, seq + 2, 0, 0, 0, 0, 0.0)
+
+    def delete(self, key: bytes) -> bool:
+        key_hash = zlib.crc32(key)
+        bucket = key_hash % self.buckets
+        with self._lock(bucket):
+            found = self._find(key, key_hash, bucket)
+            if found is None:
+                return False
+            self._clear_slot(found[0])
+        return True
+
+    def delete_where(self, match: Callable[[bytes], bool]) -> int:
+        """Delete every entry whose key satisfies `match`; returns how many."""
+        deleted = 0
+        with self._lock():
+            for offset, key, _value_len, _expires in self._scan():
+                if match(key):
+                    self._clear_slot(offset)
+                    deleted += 1
+        return deleted
+
+    def clear(self) -> None:
+        with self._lock():
+            for offset, _key, _value_len, _expires in self._scan():
+                self._clear_slot(offset)
+
+    def _scan(self):
+        """(offset, key, value length, expires) of the occupied slots."""
+        buf = self._buf
+        for slot in range(self.slots):
+            offset = self._data + slot * self.slot_bytes
+            seq, _hash, key_len, _ref, value_len, expires = _SLOT.unpack_from(
+                buf, offset
+            )
+            if key_len == 0 or seq & 1:
+                continue
+            start = offset + _SLOT_HEADER
+            yield offset, bytes(buf[start : start + key_len]), value_len, expires
+
+    def keys(self) -> list[bytes]:
+        """Keys of the unexpired entries (not locked: a snapshot)."""
+        now = time.time()
+        return [key for _o, key, _v, expires in self._scan() if expires > now]
+
+    def usage(self) -> tuple[int, int]:
+        """(entries, key + value bytes) of the unexpired entries."""
+        now = time.time()
+        entries = size = 0
+        for _offset, key, value_len, expires in self._scan():
+            if expires > now:
+                entries += 1
+                size += len(key) + value_len
+        return entries, size
+
+    def close(self) -> None:
+        self._buf.release()
+        self._mm.close()
+        os.close(self._fd)
+
+    def unlink(self) -> None:
+        """Remove the file; mappings stay valid until closed."""
+        os.unlink(self.path)
+
+
+class _Lock:
+    """fcntl lock on one byte per bucket (or the whole file) plus the thread lock."""
+
+    __slots__ = ("bucket", "table")
+
+    def __init__(self, table: SharedTable, bucket: int | None):
+        self.table = table
+        self.bucket = bucket
+
+    def __enter__(self):
+        self.table._thread_lock.acquire()
+        if self.bucket is None:
+            fcntl.lockf(self.table._fd, fcntl.LOCK_EX)
+        else:
+            fcntl.lockf(self.table._fd, fcntl.LOCK_EX, 1, self.bucket + 1)
+
+    def __exit__(self, *exc):
+        if self.bucket is None:
+            fcntl.lockf(self.table._fd, fcntl.LOCK_UN)
+        else:
+            fcntl.lockf(self.table._fd, fcntl.LOCK_UN, 1, self.bucket + 1)
+        self.table._thread_lock.release()
@@ -0,0 +1,298 @@
+"""
+Slow-query log with sampled EXPLAIN (ANALYZE, BUFFERS) plans.
+
+Every statement at or above SLOW_QUERY_MS is recorded in a ring buffer of the
+last SLOW_QUERY_LOG_SIZE entries per worker process: the SQL (placeholders,
+never values), the shape of its parameters (types and lengths), duration and
+database. A sample of them (SLOW_QUERY_EXPLAIN_SAMPLE) is queued for EXPLAIN
+(ANALYZE, BUFFERS) on the database that ran it. The plan runs later, off the
+request path, in a rolled-back transaction: on a background thread for Django
+(ThreadExplainer, config/slow_queries.py) or a background task for FastAPI
+(AsyncExplainer, src/database.py). At most MAX_PENDING plans wait at a time;
+beyond that they are dropped rather than piling up load on a database that is
+already slow.
+
+Only single SELECT statements are explained: EXPLAIN ANALYZE executes the
+statement, so writes are never replayed. The staff-only /db/slow-queries
+endpoint returns the buffer, newest first:
+
+    {"threshold_ms": 100.0, "recorded": 3, "explained": 1, ..., "entries": [
+        {"id": 3, "at": "2026-01-01T12:00:00.123Z", "database": "default",
+         "sql": "SELECT ... WHERE username::text LIKE %s ...",
+         "params": ["str[6]", "int", "int"], "duration_ms": 182.4,
+         "explain": "done", "plan": ["Limit  (cost=...) (actual ...)", ...]}]}
+
+Off unless SLOW_QUERY_MS > 0.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import os
+import queue
+import random
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime
+
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS) "
+MAX_PENDING = 8
+
+# SlowQuery.explain states
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+DROPPED = "dropped"
+NOT_SAMPLED = "not sampled"
+NOT_EXPLAINABLE = "not explainable"
+
+
+@dataclass(frozen=True)
+class SlowQuerySettings:
+    """Threshold, EXPLAIN sample rate and buffer size of the slow-query log."""
+
+    threshold_ms: float = 0.0
+    explain_sample: float = 0.1
+    size: int = 100
+
+    def __post_init__(self):
+        if self.threshold_ms < 0 or not 0 <= self.explain_sample <= 1:
+            raise ValueError(
+                "SLOW_QUERY_MS must be >= 0 and SLOW_QUERY_EXPLAIN_SAMPLE in [0, 1]"
+            )
+        if self.size < 1:
+            raise ValueError("SLOW_QUERY_LOG_SIZE must be >= 1")
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0
+
+
+def slow_query_settings(environ=os.environ) -> SlowQuerySettings:
+    """SlowQuerySettings from SLOW_QUERY_* variables."""
+    return SlowQuerySettings(
+        threshold_ms=float(environ.get("SLOW_QUERY_MS", "0")),
+        explain_sample=float(environ.get("SLOW_QUERY_EXPLAIN_SAMPLE", "0.1")),
+        size=int(environ.get("SLOW_QUERY_LOG_SIZE", "100")),
+    )
+
+
+def _shape(value) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, (str, bytes, list, tuple)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def params_shape(params) -> list[str] | dict[str, str] | None:
+    """Types (and lengths of strings and arrays) of query parameters, without their values."""
+    if params is None:
+        return None
+    if isinstance(params, dict):
+        return {str(name): _shape(value) for name, value in params.items()}
+    return [_shape(value) for value in params]
+
+
+def explainable(sql: str) -> bool:
+    """Whether EXPLAIN ANALYZE can run sql safely: one SELECT statement."""
+    statement = sql.strip().rstrip(";")
+    return statement[:6].upper() == "SELECT" and ";" not in statement
+
+
+@dataclass
+class SlowQuery:
+    id: int
+    at: str
+    database: str
+    sql: str
+    params: list[str] | dict[str, str] | None
+    duration_ms: float
+    many: bool = False
+    explain: str = NOT_SAMPLED
+    plan: list[str] | None = None
+    error: str | None = None
+
+
+class SlowQueryLog:
+    """Ring buffer of slow queries; decides which of them to EXPLAIN (see module docstring)."""
+
+    def __init__(self, config: SlowQuerySettings, sample=random.random):
+        self.config = config
+        self.threshold = config.threshold_ms / 1000 if config.enabled else float("inf")
+        self._sample = sample
+        self._entries: deque[SlowQuery] = deque(maxlen=config.size)
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self.recorded = 0
+        self.explained = 0
+        self.failed = 0
+        self.dropped = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def record(
+        self, sql: str, params, seconds: float, database: str, many: bool = False
+    ) -> SlowQuery | None:
+        """
+        Entry for a statement that took `seconds`, or None when it was fast
+        (or is itself an EXPLAIN). Its explain state is PENDING when the
+        caller should queue it for a plan.
+        """
+        if seconds < self.threshold or sql.lstrip()[:7].upper() == "EXPLAIN":
+            return None
+        if many or not explainable(sql):
+            state = NOT_EXPLAINABLE
+        elif self._sample() < self.config.explain_sample:
+            state = PENDING
+        else:
+            state = NOT_SAMPLED
+        now = datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+        with self._lock:
+            entry = SlowQuery(
+                id=self._next_id,
+                at=now,
+                database=database,
+                sql=sql,
+                params=None if many else params_shape(params),
+                duration_ms=round(seconds * 1000, 2),
+                many=many,
+                explain=state,
+            )
+            self._next_id += 1
+            self.recorded += 1
+            self._entries.append(entry)
+        return entry
+
+    def plan(self, entry: SlowQuery, plan: list[str]) -> None:
+        entry.plan, entry.explain = plan, DONE
+        self.explained += 1
+
+    def fail(self, entry: SlowQuery, error: BaseException) -> None:
+        entry.error, entry.explain = f"{type(error).__name__}: {error}", FAILED
+        self.failed += 1
+
+    def drop(self, entry: SlowQuery) -> None:
+        entry.explain = DROPPED
+        self.dropped += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries = [asdict(entry) for entry in reversed(self._entries)]
+        return {
+            "threshold_ms": self.config.threshold_ms,
+            "explain_sample": self.config.explain_sample,
+            "recorded": self.recorded,
+            "explained": self.explained,
+            "explain_failed": self.failed,
+            "explain_dropped": self.dropped,
+            "entries": entries,
+        }
+
+
+class ThreadExplainer:
+    """
+    Runs explain(database, sql, params) -> plan lines for queued entries on one
+    daemon thread (started on the first submit).
+    """
+
+    def __init__(
+        self,
+        log: SlowQueryLog,
+        explain: Callable[[str, str, object], list[str]],
+        max_pending: int = MAX_PENDING,
+    ):
+        self.log = log
+        self._explain = explain
+        self._queue: queue.Queue = queue.Queue(max_pending)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+
+    def submit(self, entry: SlowQuery, sql: str, params) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="slow-query-explain", daemon=True
+                    )
+                    self._thread.start()
+        try:
+            self._queue.put_nowait((entry, sql, params))
+        except queue.Full:
+            self.log.drop(entry)
+
+    def join(self) -> None:
+        """Wait until every queued entry has its plan (tests, benchmarks)."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            entry, sql, params = self._queue.get()
+            try:
+                self.log.plan(entry, self._explain(entry.database, sql, params))
+            except Exception as e:
+                self.log.fail(entry, e)
+            finally:
+                self._queue.task_done()
+
+
+class AsyncExplainer:
+    """
+    Runs `await explain(database, sql, params)` for queued entries in one
+    background task on the event loop (started on the first submit).
+    """
+
+    def __init__(
+        self,
+        log: SlowQueryLog,
+        explain: Callable[[str, str, object], Awaitable[list[str]]],
+        max_pending: int = MAX_PENDING,
+    ):
+        self.log = log
+        self._explain = explain
+        self.max_pending = max_pending
+        self._queue: asyncio.Queue | None = None
+        self._task: asyncio.Task | None = None
+
+    def submit(self, entry: SlowQuery, sql: str, params) -> None:
+        """Queue an entry; call from a coroutine on the loop that runs the queries."""
+        task = self._task
+        if task is None or task.done():
+            self._queue = asyncio.Queue(self.max_pending)
+            self._task = asyncio.get_running_loop().create_task(self._run(self._queue))
+        try:
+            self._queue.put_nowait((entry, sql, params))
+        except asyncio.QueueFull:
+            self.log.drop(entry)
+
+    async def join(self) -> None:
+        """Wait until every queued entry has its plan (tests, benchmarks)."""
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def stop(self) -> None:
+        """Cancel the background task; queued entries keep their pending state."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+    async def _run(self, pending: asyncio.Queue) -> None:
+        while True:
+            entry, sql, params = await pending.get()
+            try:
+                self.log.plan(entry, await self._explain(entry.database, sql, params))
+            except Exception as e:
+                self.log.fail(entry, e)
+            finally:
+                pending.task_done()
@@ -0,0 +1,200 @@
+"""
+Per-request phase timings, sent as a Server-Timing header by every stack.
+
+The timing middleware starts a Timings for the request (a ContextVar, so it
+follows the request into Django's sync_to_async threads and Starlette's
+call_next task) and formats it into the header when the response is ready:
+
+    Server-Timing: auth;dur=0.21, pool;dur=0.03, db;dur=0.84, hydrate;dur=0.11,
+                   serialize;dur=0.09, app;dur=0.40, total;dur=1.68
+
+Durations are milliseconds. Phases (PHASES) are recorded where the code can see
+them: `with phase("db"): ...` around a query, or mark() when a handler returns
+and since_mark("serialize") once the framework has rendered the response.
+A phase nested inside another is subtracted from the outer one, so the phases
+never overlap; "app" is whatever the phases do not cover (routing, validation,
+middleware, framework code) and "total" is the whole request. Phases that did
+not occur are left out.
+
+Queries are also counted (query(), the "db" phase plus one): with
+query_headers the count and DB time go out as X-DB-Queries and X-DB-Time, and
+with query_metrics they are summed per endpoint (common/query_metrics.py).
+
+Outside a request (no Timings started), phase() and query() return a shared
+no-op context manager and the other functions return at once.
+"""
+
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass
+from time import perf_counter
+
+# auth: JWT checks; pool: waiting for a connection; db: executing queries;
+# hydrate: rows into model instances or schemas; serialize: objects into the body
+PHASES = ("auth", "pool", "db", "hydrate", "serialize")
+
+HEADER = "Server-Timing"
+QUERIES_HEADER = "X-DB-Queries"
+DB_TIME_HEADER = "X-DB-Time"
+
+_current: ContextVar[Timings | None] = ContextVar("server_timing", default=None)
+_inactive = nullcontext()
+
+
+@dataclass(frozen=True)
+class TimingSettings:
+    """Which of the per-request timing outputs are on."""
+
+    server_timing: bool = True
+    query_headers: bool = False
+    query_metrics: bool = True
+
+    @property
+    def enabled(self) -> bool:
+        """Whether requests are timed at all."""
+        return self.server_timing or self.query_headers or self.query_metrics
+
+
+def _flag(environ, name: str, default: bool) -> bool:
+    value = environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() in ("1", "true", "yes", "on")
+
+
+def timing_settings(environ=os.environ, debug: bool = False) -> TimingSettings:
+    """TimingSettings from SERVER_TIMING, DB_QUERY_HEADERS (default: debug) and DB_QUERY_METRICS."""
+    return TimingSettings(
+        server_timing=_flag(environ, "SERVER_TIMING", True),
+        query_headers=_flag(environ, "DB_QUERY_HEADERS", debug),
+        query_metrics=_flag(environ, "DB_QUERY_METRICS", True),
+    )
+
+
+class Timings:
+    """Phase durations (seconds) and query count of one request."""
+
+    __slots__ = ("_mark", "_stack", "durations", "queries", "start")
+
+    def __init__(self):
+        self.start = perf_counter()
+        self.durations: dict[str, float] = {}
+        self.queries = 0
+        self._stack: list[_Phase] = []
+        self._mark: float | None = None
+
+    def add(self, name: str, seconds: float) -> None:
+        self.durations[name] = self.durations.get(name, 0.0) + seconds
+
+    def total(self) -> float:
+        return perf_counter() - self.start
+
+    def header(self, total: float | None = None) -> str:
+        """Server-Timing value: the recorded phases, then app (the rest) and total."""
+        total = self.total() if total is None else total
+        durations = self.durations
+        parts = [
+            f"{name};dur={durations[name] * 1000:.2f}"
+            for name in PHASES
+            if name in durations
+        ]
+        app = max(0.0, total - sum(durations.values()))
+        parts.append(f"app;dur={app * 1000:.2f}")
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+    def headers(
+        self, config: TimingSettings, total: float | None = None
+    ) -> list[tuple[str, str]]:
+        """Response headers per config: Server-Timing, X-DB-Queries and X-DB-Time (ms)."""
+        headers = []
+        if config.server_timing:
+            headers.append((HEADER, self.header(total)))
+        if config.query_headers:
+            db_ms = self.durations.get("db", 0.0) * 1000
+            headers.append((QUERIES_HEADER, str(self.queries)))
+            headers.append((DB_TIME_HEADER, f"{db_ms:.2f}ms"))
+        return headers
+
+
+class _Phase:
+    """Context manager recording its time, less that of nested phases, under `name`."""
+
+    __slots__ = ("child", "name", "started", "timings")
+
+    def __init__(self, timings: Timings, name: str):
+        self.timings = timings
+        self.name = name
+        self.child = 0.0
+
+    def __enter__(self):
+        self.timings._stack.append(self)
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = perf_counter() - self.started
+        stack = self.timings._stack
+        stack.pop()
+        if stack:
+            stack[-1].child += elapsed
+        self.timings.add(self.name, elapsed - self.child)
+
+
+def start() -> tuple[Timings, object]:
+    """Begin timing the current request; returns (timings, token for finish())."""
+    timings = Timings()
+    return timings, _current.set(timings)
+
+
+def finish(token) -> None:
+    _current.reset(token)
+
+
+def current() -> Timings | None:
+    return _current.get()
+
+
+def phase(name: str):
+    """Context manager timing a block as phase `name` (no-op outside a timed request)."""
+    timings = _current.get()
+    if timings is None:
+        return _inactive
+    return _Phase(timings, name)
+
+
+def query():
+    """Context manager around one SQL statement: counts it and times it as "db"."""
+    timings = _current.get()
+    if timings is None:
+        return _inactive
+    timings.queries += 1
+    return _Phase(timings, "db")
+
+
+@contextmanager
+def paused():
+    """Nothing in the block is timed or counted (connection housekeeping)."""
+    token = _current.set(None)
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def mark() -> None:
+    """Note that the handler returned; since_mark() measures from here."""
+    timings = _current.get()
+    if timings is not None:
+        timings._mark = perf_counter()
+
+
+def since_mark(name: str) -> None:
+    """Record the time since mark() as phase `name` (nothing if mark() was not called)."""
+    timings = _current.get()
+    if timings is not None and timings._mark is not None:
+        timings.add(name, perf_counter() - timings._mark)
+        timings._mark = None
@@ -0,0 +1,36 @@
+"""Response micro-cache shared by the Bolt and DRF middleware and their /cache/stats endpoints."""
+
+import asyncpg
+from django.conf import settings
+
+from common.invalidation import InvalidationListener
+from common.response_cache import new_cache
+
+# Bolt and DRF workers share one table with RESPONSE_CACHE_BACKEND=shared (paths differ)
+response_cache = new_cache(settings.RESPONSE_CACHE, "django")
+
+
+async def listen_connection() -> asyncpg.Connection:
+    """Dedicated asyncpg connection for LISTEN (not one of Django's; DB_LISTEN_HOST / DB_LISTEN_PORT)."""
+    db = settings.DATABASES["default"]
+    return await asyncpg.connect(
+        host=settings.DB_LISTEN_HOST or None,
+        port=settings.DB_LISTEN_PORT or None,
+        user=db["USER"] or None,
+        password=db["PASSWORD"] or None,
+        database=db["NAME"],
+    )
+
+
+# Evicts on writes to accounts_user from any worker (common/invalidation.py)
+invalidation = InvalidationListener(listen_connection, response_cache)
+
+
+def ensure_listening() -> None:
+    """Start the LISTEN task lazily (Bolt and DRF have no startup hook); PostgreSQL only."""
+    if (
+        response_cache.config.enabled
+        and response_cache.config.listen
+        and settings.DATABASES["default"]["ENGINE"].endswith("postgresql")
+    ):
+        invalidation.ensure_started()
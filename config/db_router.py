@@ -0,0 +1,76 @@
+"""
+Read-replica routing for the Django stacks (Bolt and DRF).
+
+Replicas are configured with DB_REPLICAS (settings.REPLICA_DATABASES). Reads go
+to a replica only where a view opts in with .using(read_alias(...)): user list,
+get by id and batch on Bolt, alist/aretrieve/abatch on DRF. Everything else,
+including all writes, uses the primary. read_alias() falls back to the primary
+when no replica is within DB_REPLICA_MAX_LAG, and after a write (mark_write())
+for DB_REPLICA_STICKY_SECONDS.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from common.replicas import PRIMARY_COOKIE, REPLICA_LAG_SQL, ReplicaSet
+
+
+def _replica_lag(alias: str) -> float:
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except Exception:
+        connections[alias].close()
+        raise
+
+
+async def replica_lag(alias: str) -> float:
+    """Replication lag of a replica alias in seconds."""
+    return await sync_to_async(_replica_lag)(alias)
+
+
+replicas = ReplicaSet(
+    settings.REPLICA_DATABASES,
+    replica_lag,
+    max_lag=settings.DB_REPLICA_MAX_LAG,
+    check_interval=settings.DB_REPLICA_CHECK_INTERVAL,
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+)
+
+
+def read_alias(cookies=None) -> str:
+    """Database alias for a read-only query: a healthy replica or "default"."""
+    sticky = bool(cookies and cookies.get(PRIMARY_COOKIE))
+    return replicas.pick(sticky=sticky) or "default"
+
+
+def mark_write() -> str | None:
+    """
+    Record a write; returns a Set-Cookie value that keeps the client on the primary.
+
+    None when no replicas are configured: the cookie would only mark the client's
+    responses private (see common.response_cache) without changing where it reads.
+    """
+    if not replicas.names:
+        return None
+    replicas.mark_write()
+    seconds = int(settings.DB_REPLICA_STICKY_SECONDS)
+    return f"{PRIMARY_COOKIE}=1; Max-Age={seconds}; Path=/; HttpOnly; SameSite=Lax"
+
+
+class ReplicaRouter:
+    """Writes and migrations on the primary; reads on the primary unless a view picks a replica."""
+
+    def db_for_read(self, model, **hints):
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,30 @@
+"""Database health monitor shared by the Bolt and DRF /ready endpoints."""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+
+from common.health import HealthMonitor
+
+
+def _select_one() -> None:
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    except Exception:
+        # Drop the broken connection so the next probe reconnects.
+        connection.close()
+        raise
+
+
+async def probe_database() -> None:
+    """Run SELECT 1 on the default database (raises on failure)."""
+    await sync_to_async(_select_one)()
+
+
+db_monitor = HealthMonitor(
+    probe_database,
+    interval=settings.HEALTH_CHECK_INTERVAL,
+    timeout=settings.HEALTH_CHECK_TIMEOUT,
+    failure_threshold=settings.HEALTH_FAILURE_THRESHOLD,
+)
@@ -10,12 +10,20 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import importlib.util
 from datetime import timedelta
 from pathlib import Path
 
 from django_bolt.middleware import CompressionConfig
 from environs import Env
 
+from common.compression import compression_settings
+from common.db_json import list_renderer
+from common.invalidation import listen_address
+from common.response_cache import cache_settings
+from common.slow_queries import slow_query_settings
+from common.timing import timing_settings
+
 env = Env()
 env.read_env()
 
@@ -53,6 +61,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api_drf.middleware.TimingMiddleware",
+    "api_drf.middleware.CompressionMiddleware",
+    "api_drf.middleware.ResponseCacheMiddleware",
+    "api_drf.middleware.ConditionalGetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -100,6 +112,45 @@ DATABASES = {
     }
 }
 
+# Connection pooler mode: "session" (direct connections or PgBouncer session
+# pooling) or "transaction" (PgBouncer pool_mode=transaction). Transaction
+# pooling drops session state between transactions, so server-side cursors
+# (declared WITH HOLD) are disabled. With psycopg 3, queries use server-side
+# binding without named prepared statements, unless DB_POOL_PREPARED_STATEMENTS=1
+# (PgBouncer >= 1.21 with max_prepared_statements tracks them per client).
+DB_POOL_MODE = env.str("DB_POOL_MODE", default="session")
+DB_POOL_PREPARED_STATEMENTS = env.bool("DB_POOL_PREPARED_STATEMENTS", default=False)
+if DB_POOL_MODE == "transaction":
+    DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+    if importlib.util.find_spec("psycopg") is not None:
+        DATABASES["default"]["OPTIONS"]["server_side_binding"] = True
+        if not DB_POOL_PREPARED_STATEMENTS:
+            DATABASES["default"]["OPTIONS"]["prepare_threshold"] = None
+
+# Optional read replicas: DB_REPLICAS=host:port,host:port (same name/user/password
+# as default). Read-only user endpoints pick a replica via config.db_router.read_alias().
+REPLICA_DATABASES = []
+for _i, _replica in enumerate(env.list("DB_REPLICAS", default=[]), start=1):
+    _host, _, _port = _replica.partition(":")
+    DATABASES[f"replica{_i}"] = {
+        **DATABASES["default"],
+        "HOST": _host,
+        "PORT": int(_port) if _port else DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    REPLICA_DATABASES.append(f"replica{_i}")
+DATABASE_ROUTERS = ["config.db_router.ReplicaRouter"] if REPLICA_DATABASES else []
+# Fall back to the primary when a replica lags more than this (seconds)
+DB_REPLICA_MAX_LAG = env.float("DB_REPLICA_MAX_LAG", default=5.0)
+DB_REPLICA_CHECK_INTERVAL = env.float("DB_REPLICA_CHECK_INTERVAL", default=1.0)
+# Read-your-writes: reads stay on the primary this long after a write
+DB_REPLICA_STICKY_SECONDS = env.float("DB_REPLICA_STICKY_SECONDS", default=5.0)
+
+# /ready: background DB probe (config/health.py); ?fresh=1 forces a live check
+HEALTH_CHECK_INTERVAL = env.float("HEALTH_CHECK_INTERVAL", default=5.0)
+HEALTH_CHECK_TIMEOUT = env.float("HEALTH_CHECK_TIMEOUT", default=2.0)
+HEALTH_FAILURE_THRESHOLD = env.int("HEALTH_FAILURE_THRESHOLD", default=1)
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -152,7 +203,7 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
-    "DEFAULT_RENDERER_CLASSES": ("rest_framework.renderers.JSONRenderer",),
+    "DEFAULT_RENDERER_CLASSES": ("api_drf.renderers.JSONRenderer",),
     "DEFAULT_PARSER_CLASSES": ("rest_framework.parsers.JSONParser",),
     "DEFAULT_FILTER_BACKENDS": ("rest_framework.filters.SearchFilter",),
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -172,10 +223,82 @@ SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(seconds=3600),
 }
 
-# Django Bolt compression
-BOLT_COMPRESSION = CompressionConfig(
-    backend="gzip",
-    minimum_size=500,  # Only compress responses > 500 bytes
+# Response compression, shared with FastAPI (common/compression.py): COMPRESSION_*
+# env. Bolt compresses in Rust with the first encoding (gzip fallback when listed)
+# and COMPRESSION_MIN_SIZE; DRF uses api_drf.middleware.CompressionMiddleware.
+COMPRESSION = compression_settings()
+_BOLT_BACKENDS = {"gzip": "gzip", "br": "brotli", "zstd": "zstd"}
+BOLT_COMPRESSION = (
+    CompressionConfig(
+        backend=_BOLT_BACKENDS[COMPRESSION.encodings[0]],
+        minimum_size=COMPRESSION.min_size,
+        gzip_fallback="gzip" in COMPRESSION.encodings,
+    )
+    if COMPRESSION.encodings
+    else None
 )
 
+# Micro-cache for the public GETs, shared with FastAPI (common/response_cache.py):
+# RESPONSE_CACHE_* env, off unless RESPONSE_CACHE_TTL > 0. One cache per worker
+# process (config/cache.py), used by the Bolt and DRF ResponseCacheMiddleware.
+RESPONSE_CACHE = cache_settings()
+
+# LISTEN connection for cache invalidation (config/cache.py): DB_LISTEN_HOST /
+# DB_LISTEN_PORT, default the primary. Required with DB_POOL_MODE=transaction,
+# where LISTEN through PgBouncer would lose notifications.
+DB_LISTEN_HOST, DB_LISTEN_PORT = listen_address(
+    DATABASES["default"]["HOST"],
+    DATABASES["default"]["PORT"],
+    DB_POOL_MODE,
+    RESPONSE_CACHE.enabled and RESPONSE_CACHE.listen,
+)
+
+# Request timing, shared with FastAPI (common/timing.py), from the Bolt
+# ServerTimeMiddleware and the DRF TimingMiddleware: Server-Timing header (auth /
+# db / hydrate / serialize breakdown; SERVER_TIMING=0 turns it off), X-DB-Queries
+# and X-DB-Time (DB_QUERY_HEADERS, default DEBUG) and per-endpoint query counts
+# at /db/stats (DB_QUERY_METRICS=0 turns them off); config/timing.py
+SERVER_TIMING = timing_settings(debug=DEBUG)
+
+# Slow-query log, shared with FastAPI (common/slow_queries.py): SLOW_QUERY_* env,
+# off unless SLOW_QUERY_MS > 0. Queries at or above it are kept per worker
+# process with sampled EXPLAIN (ANALYZE, BUFFERS) plans (config/slow_queries.py),
+# at the staff-only /db/slow-queries.
+SLOW_QUERIES = slow_query_settings()
+
 DJANGO_BOLT_WORKERS = 4
+
+# psycopg 3 connection pool (Django OPTIONS["pool"]); needs psycopg[binary,pool].
+# DB_POOL_MAX_CONNECTIONS is the budget for all server processes together, split
+# evenly over DB_POOL_PROCESSES: Bolt worker processes (DJANGO_BOLT_WORKERS) or
+# the uvicorn --workers of scripts/run_drf.py, which exports DB_POOL_PROCESSES.
+# Pooled connections go back to the pool after each request, so CONN_MAX_AGE is 0.
+DB_POOL = env.bool("DB_POOL", default=False)
+DB_POOL_MAX_CONNECTIONS = env.int("DB_POOL_MAX_CONNECTIONS", default=40)
+DB_POOL_PROCESSES = env.int("DB_POOL_PROCESSES", default=DJANGO_BOLT_WORKERS)
+DB_POOL_TIMEOUT = env.float("DB_POOL_TIMEOUT", default=10.0)
+if DB_POOL:
+    _pool_size = max(1, DB_POOL_MAX_CONNECTIONS // max(1, DB_POOL_PROCESSES))
+    for _db in DATABASES.values():
+        _db["CONN_MAX_AGE"] = 0
+        _db["OPTIONS"] = {
+            **_db["OPTIONS"],
+            "pool": {
+                "min_size": min(2, _pool_size),
+                "max_size": _pool_size,
+                "timeout": DB_POOL_TIMEOUT,
+            },
+        }
+
+# Bolt user routes served by api.fastpath (values_list rows -> msgspec, no model
+# instances) instead of the ORM: comma-separated list, get, batch, me, or all
+BOLT_FASTPATH_ROUTES = env.list("BOLT_FASTPATH_ROUTES", default=[])
+
+# GET /users (Bolt and DRF): "python" serializes rows in-process, "db" has
+# PostgreSQL render the page JSON and the count in one statement (common/db_json.py)
+USERS_LIST_RENDER = list_renderer(env.str("USERS_LIST_RENDER", default="python"))
+
+# WS /ws/broadcast: per-subscriber send queue and slow-consumer policy
+# ("drop" = discard the oldest queued frame, "disconnect" = close with 1008)
+BOLT_BROADCAST_QUEUE_SIZE = env.int("BOLT_BROADCAST_QUEUE_SIZE", default=256)
+BOLT_BROADCAST_SLOW_CONSUMER = env.str("BOLT_BROADCAST_SLOW_CONSUMER", default="drop")
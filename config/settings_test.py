@@ -20,3 +20,5 @@ if os.environ.get("USE_SQLITE_FOR_TESTS"):
             "NAME": ":memory:",
         }
     }
+    REPLICA_DATABASES = []
+    DATABASE_ROUTERS = []
@@ -0,0 +1,64 @@
+"""
+Slow-query log for Bolt and DRF (SLOW_QUERIES, a common.slow_queries
+SlowQuerySettings): an execute wrapper on every Django connection records
+statements at or above SLOW_QUERY_MS, and a background thread runs the sampled
+EXPLAIN (ANALYZE, BUFFERS) on the same database alias.
+"""
+
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+
+from common.slow_queries import (
+    EXPLAIN_PREFIX,
+    PENDING,
+    SlowQueryLog,
+    ThreadExplainer,
+)
+
+slow_queries = SlowQueryLog(settings.SLOW_QUERIES)
+
+
+def explain(alias: str, sql: str, params) -> list[str]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) lines of a SELECT on `alias`, in a rolled-back
+    transaction. The connection is closed afterwards, so the explain thread does
+    not hold a pool slot between plans.
+    """
+    try:
+        with transaction.atomic(using=alias):
+            with connections[alias].cursor() as cursor:
+                cursor.execute(EXPLAIN_PREFIX + sql, params)
+                plan = [row[0] for row in cursor.fetchall()]
+            transaction.set_rollback(True, using=alias)
+    finally:
+        connections[alias].close()
+    return plan
+
+
+explainer = ThreadExplainer(slow_queries, explain)
+
+
+def _record_slow(execute, sql, params, many, context):
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = perf_counter() - start
+        if elapsed >= slow_queries.threshold:
+            alias = context["connection"].alias
+            entry = slow_queries.record(sql, params, elapsed, alias, many)
+            if entry is not None and entry.explain == PENDING:
+                explainer.submit(entry, sql, params)
+
+
+def _watch_queries(sender, connection, **kwargs):
+    """Record slow queries of each new connection (any thread, alias or pool checkout)."""
+    if _record_slow not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_slow)
+
+
+if slow_queries.enabled:
+    connection_created.connect(_watch_queries, dispatch_uid="slow_queries")
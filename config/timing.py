@@ -0,0 +1,38 @@
+"""
+Request timing for the Bolt and DRF timing middleware (SERVER_TIMING, a
+common.timing.TimingSettings): every Django query is counted and timed as
+"db", and the per-endpoint totals of this worker process are kept in
+query_metrics (/db/stats).
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+from common.query_metrics import QueryMetrics
+from common.timing import query
+
+query_metrics = QueryMetrics()
+
+
+def _timed_execute(execute, sql, params, many, context):
+    with query():
+        return execute(sql, params, many, context)
+
+
+def _time_queries(sender, connection, **kwargs):
+    """Wrap every query of each new connection (any thread, alias or pool checkout)."""
+    if _timed_execute not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_timed_execute)
+
+
+if settings.SERVER_TIMING.enabled:
+    connection_created.connect(_time_queries, dispatch_uid="server_timing")
+
+
+def finish_request(request, response, timings, duration: float) -> None:
+    """Timing headers on the response (per settings.SERVER_TIMING, read per request) and the metrics."""
+    config = settings.SERVER_TIMING
+    for name, value in timings.headers(config, duration):
+        response.headers[name] = value
+    if config.query_metrics:
+        query_metrics.record(request.method, request.path, timings, duration)
@@ -23,8 +23,8 @@ pub async fn login(state: web::Data<AppState>, body: web::Json<LoginRequest>) ->
         return HttpResponse::BadRequest()
             .json(serde_json::json!({"detail": "username and password required"}));
     }
-    let row: Option<(i64, String, Option<String>, bool)> = sqlx::query_as(
-        "SELECT id, password, role, is_staff FROM accounts_user WHERE username = $1",
+    let row: Option<(i64, String, String, bool)> = sqlx::query_as(
+        "SELECT id, password, role::text, is_staff FROM accounts_user WHERE username = $1",
     )
     .bind(&body.username)
     .fetch_optional(pool)
@@ -35,7 +35,6 @@ pub async fn login(state: web::Data<AppState>, body: web::Json<LoginRequest>) ->
         return HttpResponse::Unauthorized()
             .json(serde_json::json!({"detail": "Invalid credentials"}));
     };
-    let role = role.unwrap_or_else(|| "CUSTOMER".to_string());
     match djangohashers::check_password(&body.password, &stored_hash) {
         Ok(true) => {}
         _ => {
@@ -64,13 +64,13 @@ pub async fn list_users(
         .fetch_one(pool)
         .await,
         (true, false) => sqlx::query_scalar(
-            "SELECT COUNT(*)::bigint FROM accounts_user WHERE role = $1",
+            "SELECT COUNT(*)::bigint FROM accounts_user WHERE role = $1::user_role",
         )
         .bind(&role_filter)
         .fetch_one(pool)
         .await,
         (false, false) => sqlx::query_scalar(
-            "SELECT COUNT(*)::bigint FROM accounts_user WHERE username ILIKE $1 AND role = $2",
+            "SELECT COUNT(*)::bigint FROM accounts_user WHERE username ILIKE $1 AND role = $2::user_role",
         )
         .bind(&search_param)
         .bind(&role_filter)
@@ -81,14 +81,14 @@ pub async fn list_users(
 
     let rows: Vec<(i64, String, String)> = match (search.is_empty(), role_filter.is_empty()) {
         (true, true) => sqlx::query_as(
-            "SELECT id, username, COALESCE(role, 'CUSTOMER') FROM accounts_user ORDER BY id LIMIT $1 OFFSET $2",
+            "SELECT id, username, role::text FROM accounts_user ORDER BY id LIMIT $1 OFFSET $2",
         )
         .bind(page_size)
         .bind(offset)
         .fetch_all(pool)
         .await,
         (false, true) => sqlx::query_as(
-            "SELECT id, username, COALESCE(role, 'CUSTOMER') FROM accounts_user WHERE username ILIKE $1 ORDER BY id LIMIT $2 OFFSET $3",
+            "SELECT id, username, role::text FROM accounts_user WHERE username ILIKE $1 ORDER BY id LIMIT $2 OFFSET $3",
         )
         .bind(&search_param)
         .bind(page_size)
@@ -96,7 +96,7 @@ pub async fn list_users(
         .fetch_all(pool)
         .await,
         (true, false) => sqlx::query_as(
-            "SELECT id, username, COALESCE(role, 'CUSTOMER') FROM accounts_user WHERE role = $1 ORDER BY id LIMIT $2 OFFSET $3",
+            "SELECT id, username, role::text FROM accounts_user WHERE role = $1::user_role ORDER BY id LIMIT $2 OFFSET $3",
         )
         .bind(&role_filter)
         .bind(page_size)
@@ -104,7 +104,7 @@ pub async fn list_users(
         .fetch_all(pool)
         .await,
         (false, false) => sqlx::query_as(
-            "SELECT id, username, COALESCE(role, 'CUSTOMER') FROM accounts_user WHERE username ILIKE $1 AND role = $2 ORDER BY id LIMIT $3 OFFSET $4",
+            "SELECT id, username, role::text FROM accounts_user WHERE username ILIKE $1 AND role = $2::user_role ORDER BY id LIMIT $3 OFFSET $4",
         )
         .bind(&search_param)
         .bind(&role_filter)
@@ -146,7 +146,7 @@ pub async fn get_user(state: web::Data<AppState>, path: web::Path<i32>) -> impl
     let user_id = path.into_inner();
     let pool = &state.pool;
     let row: Option<(i64, String, String)> = sqlx::query_as(
-        "SELECT id, username, COALESCE(role, 'CUSTOMER') FROM accounts_user WHERE id = $1",
+        "SELECT id, username, role::text FROM accounts_user WHERE id = $1",
     )
     .bind(user_id)
     .fetch_optional(pool)
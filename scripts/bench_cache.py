@@ -0,0 +1,189 @@
+"""
+Response cache backends: per-process LRU (memory) vs shared memory (shared).
+
+Two measurements, no server or database needed:
+
+  1. Cost of one lookup hit and one store in a single process, for a
+     /users?page_size=100 sized response.
+  2. N worker processes serving lookups for K keys for a few seconds. A miss
+     runs a simulated handler (--handler-ms of CPU, i.e. the query and
+     serialization the cache saves) and stores the result. Reports lookups/s
+     over all processes, hit ratio, handler runs (warm-up: about K per process
+     with memory, about K in total with shared) and the bytes the cache holds on
+     the host (memory: one copy per process).
+
+Usage:
+    uv run python -m scripts.bench_cache
+    uv run python -m scripts.bench_cache --processes 4 --keys 500 --seconds 5 --handler-ms 2
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from common.response_cache import (
+    CacheSettings,
+    MemoryStore,
+    ResponseCache,
+    SharedStore,
+    cache_key,
+)
+from common.shm_cache import SharedTable
+
+BACKENDS = ("memory", "shared")
+HEADERS = [
+    ("content-type", "application/json"),
+    ("etag", 'W/"users-1712345678901234"'),
+    ("vary", "Accept"),
+]
+
+
+def _cache(backend: str, args, directory: str) -> ResponseCache:
+    config = CacheSettings(
+        ttl=3600, backend=backend, max_bytes=args.max_bytes, slot_bytes=args.slot_bytes
+    )
+    if backend == "memory":
+        return ResponseCache(config, store=MemoryStore(config.max_bytes))
+    table = SharedTable(
+        "bench-cache",
+        slots=config.max_bytes // config.slot_bytes,
+        slot_bytes=config.slot_bytes,
+        directory=directory,
+    )
+    return ResponseCache(config, clock=time.time, store=SharedStore(table))
+
+
+def _key(i: int) -> tuple:
+    return cache_key(
+        "/users", [("page", str(i)), ("page_size", "100")], {}, ("accept",)
+    )
+
+
+def _burn(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def single_process(backend: str, args, directory: str) -> tuple[float, float]:
+    """(µs per hit, µs per store)"""
+    cache = _cache(backend, args, directory)
+    body = b"x" * args.body_bytes
+    keys = [_key(i) for i in range(200)]
+    start = time.perf_counter()
+    for key in keys * 50:
+        cache.get(key)
+        cache.put(key, 200, HEADERS, body)
+    store_us = (time.perf_counter() - start) / (len(keys) * 50) * 1e6
+    start = time.perf_counter()
+    for key in keys * 50:
+        cache.get(key)
+    hit_us = (time.perf_counter() - start) / (len(keys) * 50) * 1e6
+    cache.clear()
+    return hit_us, store_us
+
+
+def _worker(backend: str, args, directory: str, start_at: float, results) -> None:
+    cache = _cache(backend, args, directory)
+    body = b"x" * args.body_bytes
+    keys = [_key(i) for i in range(args.keys)]
+    lookups = fills = 0
+    while time.time() < start_at:
+        time.sleep(0.001)
+    end = time.perf_counter() + args.seconds
+    i = os.getpid()
+    while time.perf_counter() < end:
+        i = (i * 1103515245 + 12345) & 0x7FFFFFFF
+        key = keys[i % len(keys)]
+        entry, _state = cache.get(key)
+        lookups += 1
+        if entry is None:
+            _burn(args.handler_ms / 1000)
+            cache.put(key, 200, HEADERS, body)
+            fills += 1
+    stats = cache.stats()
+    results.put((lookups, fills, stats["bytes"]))
+
+
+def multi_process(backend: str, args, directory: str) -> dict:
+    if backend == "shared":
+        _cache(backend, args, directory).clear()
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    start_at = time.time() + 2
+    processes = [
+        context.Process(
+            target=_worker, args=(backend, args, directory, start_at, results)
+        )
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    rows = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    lookups = sum(r[0] for r in rows)
+    fills = sum(r[1] for r in rows)
+    held = sum(r[2] for r in rows) if backend == "memory" else max(r[2] for r in rows)
+    return {
+        "lookups_per_sec": lookups / args.seconds,
+        "hit_ratio": 1 - fills / lookups if lookups else 0.0,
+        "fills": fills,
+        "bytes_held": held,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark response cache backends")
+    parser.add_argument("--processes", type=int, default=4, help="Worker processes")
+    parser.add_argument(
+        "--keys", type=int, default=500, help="Distinct cached responses"
+    )
+    parser.add_argument(
+        "--seconds", type=float, default=5.0, help="Duration per backend"
+    )
+    parser.add_argument(
+        "--handler-ms", type=float, default=2.0, help="CPU time of a miss (handler)"
+    )
+    parser.add_argument(
+        "--body-bytes",
+        type=int,
+        default=4800,
+        help="Response body size (page of 100 users)",
+    )
+    parser.add_argument("--max-bytes", type=int, default=32 * 1024 * 1024)
+    parser.add_argument("--slot-bytes", type=int, default=16 * 1024)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(
+        dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+    ) as directory:
+        print(f"Single process ({args.body_bytes} byte body)")
+        print(f"{'backend':<8} {'hit µs':>8} {'miss+store µs':>14}")
+        for backend in BACKENDS:
+            hit_us, store_us = single_process(backend, args, directory)
+            print(f"{backend:<8} {hit_us:>8.2f} {store_us:>14.2f}")
+
+        print(
+            f"\n{args.processes} processes, {args.keys} keys, {args.seconds:g}s, "
+            f"{args.handler_ms:g} ms per miss"
+        )
+        print(
+            f"{'backend':<8} {'lookups/s':>10} {'hit ratio':>10} {'handler runs':>13} {'cache KB':>9}"
+        )
+        for backend in BACKENDS:
+            r = multi_process(backend, args, directory)
+            print(
+                f"{backend:<8} {r['lookups_per_sec']:>10.0f} {r['hit_ratio']:>10.1%} "
+                f"{r['fills']:>13} {r['bytes_held'] / 1024:>9.0f}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,14 +20,66 @@ Usage:
     uv run python scripts/load_test.py --api nest -u http://localhost:8004
     uv run python scripts/load_test.py --api go -u http://localhost:8005
     uv run python scripts/load_test.py --api rust -u http://localhost:8006
+
+WebSocket (WS /ws echo, Bolt):
+    uv run python scripts/load_test.py --api bolt --mode ws -c 500 -d 10
+    uv run python scripts/load_test.py --api bolt --mode ws -c 1000 --ws-rate 10 \
+        --server-pid $(pgrep -d, -f runbolt)
+
+WebSocket broadcast (WS /ws/broadcast fan-out, run Bolt with --processes 1):
+    uv run python scripts/load_test.py --api bolt --mode broadcast \
+        --subscribers 1000,10000,50000 --publish-rate 10 --server-pid $(pgrep -d, -f runbolt)
+
+Scenarios (N+1 vs batched user lookups, 20 ids per operation):
+    uv run python scripts/load_test.py --api bolt --scenario users-n1 --batch-size 20
+    uv run python scripts/load_test.py --api bolt --scenario users-batch --batch-size 20
+
+Concurrent create (POST /users, half the requests race for the same usernames):
+    uv run python scripts/load_test.py --api bolt --scenario users-create -c 50 \
+        --login admin:admin --conflict-ratio 0.5
+
+Sweep (find the saturation point of each endpoint):
+    uv run python scripts/load_test.py --api bolt --sweep --slo-p99 50 --csv sweep.csv
+    uv run python scripts/load_test.py --api fastapi --sweep --sweep-mode rate \
+        --sweep-start 500 --sweep-max 64000 --csv sweep.csv
+
+Conditional GET (replay ETags; compare rps and bytes with and without --etag):
+    uv run python scripts/load_test.py --api bolt -e /users,/users/1 --etag
+
+Compression (bytes on the wire vs server CPU, identity baseline first):
+    uv run python scripts/load_test.py --api drf -e "/drf/users/?page_size=100" \
+        --accept-encoding gzip,br,zstd --server-pid $(pgrep -d, -f run_drf)
+
+Response formats (JSON vs MessagePack, rows vs ?layout=columnar; bytes, decode, server CPU):
+    uv run python scripts/load_test.py --api bolt -e "/users?page_size=100" \
+        --formats msgpack,json-columnar,msgpack-columnar --server-pid $(pgrep -d, -f runbolt)
+
+Response micro-cache (start the API with RESPONSE_CACHE_TTL=1; X-Cache hit ratio is printed):
+    uv run python scripts/load_test.py --api bolt -e /users,/users/1,/roles,/health/test
+
+Server-Timing (printed whenever the API sends it: per-endpoint auth / pool / db /
+hydrate / serialize / app breakdown, p50 and p95 per phase):
+    uv run python scripts/load_test.py --api fastapi -e "/users?page_size=100,/users/1"
+
+Connection pooling matrix (one CSV, one --label per setup; see README):
+    DB_POOL_MODE=transaction ...  # start the API against PgBouncer, then
+    uv run python scripts/load_test.py --api fastapi --sweep --label transaction \
+        --csv pooling.csv
 """
 
 import argparse
 import asyncio
+import csv
+import json
+import os
+import random
+import resource
 import time
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 
 import httpx
+import msgspec
+from websockets.asyncio.client import connect as ws_connect
 
 
 @dataclass
@@ -38,6 +90,10 @@ class LoadResult:
     status_code: int | None
     latency_ms: float
     error: str | None = None
+    wire_bytes: int = 0
+    cache: str | None = None
+    endpoint: str | None = None
+    timing: dict[str, float] | None = None
 
 
 @dataclass
@@ -48,6 +104,12 @@ class LoadStats:
     success: int = 0
     fail: int = 0
     errors: list[str] = field(default_factory=list)
+    wire_bytes: int = 0
+    not_modified: int = 0
+    cache: dict[str, int] = field(default_factory=dict)
+    cache_hit_bytes: int = 0
+    # endpoint -> Server-Timing phase -> durations (ms)
+    timing: dict[str, dict[str, list[float]]] = field(default_factory=dict)
 
     @property
     def success_rate(self) -> float:
@@ -66,21 +128,101 @@ class LoadStats:
             return 0.0
         return self.total / duration_sec
 
+    def record(self, result: LoadResult, latencies: list[float]) -> None:
+        """Count one result; successful latencies are appended to latencies."""
+        self.total += 1
+        self.wire_bytes += result.wire_bytes
+        if result.status_code == 304:
+            self.not_modified += 1
+        if result.cache:
+            self.cache[result.cache] = self.cache.get(result.cache, 0) + 1
+            if result.cache in ("HIT", "STALE"):
+                self.cache_hit_bytes += result.wire_bytes
+        if result.timing:
+            phases = self.timing.setdefault(result.endpoint or "", {})
+            for name, ms in result.timing.items():
+                phases.setdefault(name, []).append(ms)
+        if result.success:
+            self.success += 1
+            latencies.append(result.latency_ms)
+        else:
+            self.fail += 1
+            if result.error and len(self.errors) < 20:
+                self.errors.append(result.error)
+
+
+def percentile_idx(n: int, p: float) -> int:
+    """Index of the p-th percentile in a sorted list of n values."""
+    return max(0, min(int((n - 1) * p / 100), n - 1)) if n else 0
+
+
+def latency_percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    """Return (p50, p95, p99) in ms; sorts latencies in place."""
+    if not latencies:
+        return 0.0, 0.0, 0.0
+    latencies.sort()
+    n = len(latencies)
+    return (
+        latencies[percentile_idx(n, 50)],
+        latencies[percentile_idx(n, 95)],
+        latencies[percentile_idx(n, 99)],
+    )
+
+
+def parse_server_timing(value: str | None) -> dict[str, float]:
+    """Server-Timing header -> {metric: dur ms}; metrics without dur are skipped."""
+    phases: dict[str, float] = {}
+    for metric in (value or "").split(","):
+        name, *params = (part.strip() for part in metric.split(";"))
+        for param in params:
+            key, _, dur = param.partition("=")
+            if name and key.lower() == "dur":
+                try:
+                    phases[name] = phases.get(name, 0.0) + float(dur)
+                except ValueError:
+                    pass
+    return phases
+
+
+def client_limits(connections: int) -> httpx.Limits:
+    """Connection pool large enough that the client is not the bottleneck."""
+    connections = max(connections, 100)
+    return httpx.Limits(
+        max_connections=connections, max_keepalive_connections=connections
+    )
+
 
 async def single_request(
     client: httpx.AsyncClient,
     url: str,
     method: str = "GET",
+    etags: dict[str, str] | None = None,
     **kwargs,
 ) -> LoadResult:
-    """Perform one HTTP request and return LoadResult."""
+    """
+    Perform one HTTP request and return LoadResult. With `etags` (url -> ETag),
+    the last ETag seen for the URL is replayed as If-None-Match and 304 counts
+    as success.
+    """
+    if etags is not None and url in etags:
+        kwargs["headers"] = {**kwargs.get("headers", {}), "If-None-Match": etags[url]}
     start = time.perf_counter()
     try:
         resp = await client.request(method, url, **kwargs)
         latency_ms = (time.perf_counter() - start) * 1000
         ok = 200 <= resp.status_code < 300
+        if etags is not None:
+            ok = ok or resp.status_code == 304
+            if etag := resp.headers.get("etag"):
+                etags[url] = etag
         return LoadResult(
-            success=ok, status_code=resp.status_code, latency_ms=latency_ms
+            success=ok,
+            status_code=resp.status_code,
+            latency_ms=latency_ms,
+            wire_bytes=resp.num_bytes_downloaded,
+            cache=resp.headers.get("x-cache"),
+            endpoint=resp.request.url.raw_path.decode("ascii"),
+            timing=parse_server_timing(resp.headers.get("server-timing")) or None,
         )
     except Exception as e:
         latency_ms = (time.perf_counter() - start) * 1000
@@ -98,11 +240,12 @@ async def worker(
     endpoint: str,
     queue: asyncio.Queue,
     stop_event: asyncio.Event,
+    etags: dict[str, str] | None = None,
 ):
     """Worker that continuously hits the endpoint until stop_event is set."""
     url = f"{base_url.rstrip('/')}{endpoint}"
     while not stop_event.is_set():
-        result = await single_request(client, url)
+        result = await single_request(client, url, etags=etags)
         try:
             queue.put_nowait(result)
         except asyncio.QueueFull:
@@ -114,22 +257,32 @@ async def run_load_test(
     endpoints: list[str],
     duration_sec: float,
     concurrency: int,
+    headers: dict[str, str] | None = None,
+    etag: bool = False,
 ) -> tuple[LoadStats, list[float]]:
     """
     Run load test: spawn workers for each endpoint, collect results for duration_sec.
-    Returns (LoadStats, latencies).
+    With etag=True, workers replay ETags (If-None-Match). Returns (LoadStats, latencies).
     """
     stats = LoadStats()
+    etags: dict[str, str] | None = {} if etag else None
     latencies: list[float] = []
     queue: asyncio.Queue[LoadResult] = asyncio.Queue(maxsize=100_000)
     stop_event = asyncio.Event()
 
-    async with httpx.AsyncClient(timeout=30.0) as client:
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=client_limits(concurrency), headers=headers
+    ) as client:
         # Distribute workers across endpoints round-robin
         workers = [
             asyncio.create_task(
                 worker(
-                    client, base_url, endpoints[i % len(endpoints)], queue, stop_event
+                    client,
+                    base_url,
+                    endpoints[i % len(endpoints)],
+                    queue,
+                    stop_event,
+                    etags,
                 )
             )
             for i in range(concurrency)
@@ -143,14 +296,7 @@ async def run_load_test(
             while time.perf_counter() < end_time:
                 try:
                     result = await asyncio.wait_for(queue.get(), timeout=0.5)
-                    stats.total += 1
-                    if result.success:
-                        stats.success += 1
-                        latencies.append(result.latency_ms)
-                    else:
-                        stats.fail += 1
-                        if result.error and len(stats.errors) < 20:
-                            stats.errors.append(result.error)
+                    stats.record(result, latencies)
                 except asyncio.TimeoutError:
                     continue
 
@@ -168,6 +314,1070 @@ async def run_load_test(
     return stats, latencies
 
 
+async def run_rate_test(
+    base_url: str,
+    endpoints: list[str],
+    duration_sec: float,
+    rate: float,
+    max_in_flight: int = 1000,
+) -> tuple[LoadStats, list[float]]:
+    """
+    Open-loop load test: issue `rate` requests/sec regardless of response time.
+
+    Latency is measured from the scheduled send time, so queueing delay caused
+    by a saturated server is included (no coordinated omission). When more than
+    max_in_flight requests are outstanding, new arrivals are counted as failures.
+    Returns (LoadStats, latencies).
+    """
+    stats = LoadStats()
+    latencies: list[float] = []
+    urls = [f"{base_url.rstrip('/')}{e}" for e in endpoints]
+    interval = 1.0 / rate
+    in_flight = asyncio.Semaphore(max_in_flight)
+    tasks: set[asyncio.Task] = set()
+
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=client_limits(max_in_flight)
+    ) as client:
+
+        async def fire(url: str, scheduled: float) -> None:
+            try:
+                result = await single_request(client, url)
+                result.latency_ms = (time.perf_counter() - scheduled) * 1000
+                stats.record(result, latencies)
+            finally:
+                in_flight.release()
+
+        start = time.perf_counter()
+        i = 0
+        while True:
+            scheduled = start + i * interval
+            if scheduled - start >= duration_sec:
+                break
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            url = urls[i % len(urls)]
+            i += 1
+            if in_flight.locked():
+                stats.record(
+                    LoadResult(
+                        success=False,
+                        status_code=None,
+                        latency_ms=0.0,
+                        error=f"client saturated ({max_in_flight} in flight)",
+                    ),
+                    latencies,
+                )
+                continue
+            await in_flight.acquire()
+            task = asyncio.create_task(fire(url, scheduled))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    return stats, latencies
+
+
+def cache_summary(stats: LoadStats) -> str:
+    """X-Cache breakdown: hit ratio (HIT + STALE), counts per state and body bytes served from cache."""
+    seen = sum(stats.cache.values())
+    hits = stats.cache.get("HIT", 0) + stats.cache.get("STALE", 0)
+    counts = " ".join(f"{k}={v}" for k, v in sorted(stats.cache.items()))
+    return (
+        f"{hits / seen * 100:.1f}% hits ({counts}), "
+        f"{stats.cache_hit_bytes / 1024:.0f} KB from cache"
+    )
+
+
+# Server-Timing metrics in report order (common/timing.py); others follow
+TIMING_PHASES = ("auth", "pool", "db", "hydrate", "serialize", "app", "total")
+
+
+def timing_breakdown(
+    stats: LoadStats,
+) -> dict[str, list[tuple[str, float, float, float]]]:
+    """
+    Per endpoint: (phase, p50, p95, share) for each Server-Timing phase, share
+    being the phase's part of the summed durations of all phases but total.
+    """
+    breakdown = {}
+    for endpoint, phases in sorted(stats.timing.items()):
+        names = [p for p in TIMING_PHASES if p in phases]
+        names += sorted(p for p in phases if p not in TIMING_PHASES)
+        summed = sum(sum(phases[p]) for p in names if p != "total") or 1.0
+        rows = []
+        for name in names:
+            values = phases[name]
+            p50, p95, _ = latency_percentiles(values)
+            share = sum(values) / summed if name != "total" else 1.0
+            rows.append((name, p50, p95, share))
+        breakdown[endpoint] = rows
+    return breakdown
+
+
+def print_timing_report(stats: LoadStats, width: int = 30) -> None:
+    """Server-Timing breakdown per endpoint, with a bar per phase (share of the time)."""
+    print("\nServer-Timing (ms):")
+    for endpoint, rows in timing_breakdown(stats).items():
+        responses = max(len(v) for v in stats.timing[endpoint].values())
+        print(f"  {endpoint} ({responses} responses)")
+        print(f"    {'phase':<10} {'p50':>8} {'p95':>8} {'share':>6}")
+        for name, p50, p95, share in rows:
+            bar = "" if name == "total" else "#" * round(share * width)
+            print(f"    {name:<10} {p50:>8.2f} {p95:>8.2f} {share:>6.1%} {bar}")
+
+
+# ----- Compression (Accept-Encoding: bytes saved vs server CPU) -----
+
+
+@dataclass
+class CompressionPoint:
+    """One --accept-encoding run: throughput, body bytes on the wire and server CPU."""
+
+    encoding: str
+    requests: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    wire_bytes_per_req: float
+    cpu_ms_per_req: float | None = None
+
+
+def compression_savings(
+    baseline: CompressionPoint, point: CompressionPoint
+) -> tuple[float, float | None]:
+    """
+    (% of body bytes saved, extra server CPU in microseconds per KB saved) of
+    point relative to the identity baseline; CPU is None without --server-pid.
+    """
+    if baseline.wire_bytes_per_req <= 0:
+        return 0.0, None
+    saved = baseline.wire_bytes_per_req - point.wire_bytes_per_req
+    saved_pct = saved / baseline.wire_bytes_per_req * 100
+    if point.cpu_ms_per_req is None or baseline.cpu_ms_per_req is None or saved <= 0:
+        return saved_pct, None
+    extra_us = (point.cpu_ms_per_req - baseline.cpu_ms_per_req) * 1000
+    return saved_pct, extra_us / (saved / 1024)
+
+
+async def run_compression_test(
+    base_url: str,
+    endpoints: list[str],
+    duration_sec: float,
+    concurrency: int,
+    encodings: list[str],
+    server_pids: list[int] | None = None,
+) -> list[CompressionPoint]:
+    """Run the http load test once per Accept-Encoding value."""
+    points = []
+    for encoding in encodings:
+        cpu_before = read_cpu_seconds(server_pids) if server_pids else None
+        stats, latencies = await run_load_test(
+            base_url,
+            endpoints,
+            duration_sec,
+            concurrency,
+            headers={"Accept-Encoding": encoding},
+        )
+        cpu_after = read_cpu_seconds(server_pids) if server_pids else None
+        p50, _, p99 = latency_percentiles(latencies)
+        cpu_ms = None
+        if cpu_before is not None and cpu_after is not None and stats.total:
+            cpu_ms = (cpu_after - cpu_before) * 1000 / stats.total
+        points.append(
+            CompressionPoint(
+                encoding=encoding,
+                requests=stats.total,
+                rps=stats.req_per_sec(duration_sec),
+                p50_ms=p50,
+                p99_ms=p99,
+                wire_bytes_per_req=stats.wire_bytes / stats.total
+                if stats.total
+                else 0.0,
+                cpu_ms_per_req=cpu_ms,
+            )
+        )
+    return points
+
+
+def print_compression_report(points: list[CompressionPoint]) -> None:
+    """Table of rps, bytes/request and CPU per encoding, relative to identity (first row)."""
+    print(
+        f"{'encoding':<10} {'rps':>9} {'p50':>7} {'p99':>7} {'bytes/req':>10} "
+        f"{'saved':>7} {'cpu ms/req':>10} {'cpu us/KB saved':>16}"
+    )
+    baseline = points[0]
+    for point in points:
+        saved_pct, cost = compression_savings(baseline, point)
+        cpu = f"{point.cpu_ms_per_req:.3f}" if point.cpu_ms_per_req is not None else "-"
+        print(
+            f"{point.encoding:<10} {point.rps:>9.1f} {point.p50_ms:>7.1f} "
+            f"{point.p99_ms:>7.1f} {point.wire_bytes_per_req:>10.0f} "
+            f"{saved_pct:>6.1f}% {cpu:>10} "
+            f"{(f'{cost:.1f}' if cost is not None else '-'):>16}"
+        )
+
+
+# ----- Response formats (JSON vs MessagePack, rows vs columnar) -----
+
+
+RESPONSE_FORMATS = {
+    "json": ("application/json", "rows"),
+    "msgpack": ("application/msgpack", "rows"),
+    "json-columnar": ("application/json", "columnar"),
+    "msgpack-columnar": ("application/msgpack", "columnar"),
+}
+
+
+@dataclass
+class FormatPoint:
+    """One --formats run: throughput, body bytes and client decode time per request."""
+
+    name: str
+    media_type: str
+    requests: int
+    rps: float
+    p50_ms: float
+    p99_ms: float
+    body_bytes_per_req: float
+    decode_us_per_req: float
+    cpu_ms_per_req: float | None = None
+
+
+def format_endpoint(endpoint: str, layout: str) -> str:
+    """Endpoint with ?layout= appended (rows is the server default, left out)."""
+    if layout == "rows":
+        return endpoint
+    return f"{endpoint}{'&' if '?' in endpoint else '?'}layout={layout}"
+
+
+def decode_us(body: bytes, media_type: str, repeat: int = 200) -> float:
+    """Mean msgspec decode time of one body in microseconds (JSON or MessagePack by media type)."""
+    decode = msgspec.msgpack.decode if "msgpack" in media_type else msgspec.json.decode
+    start = time.perf_counter()
+    for _ in range(repeat):
+        decode(body)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+async def run_format_test(
+    base_url: str,
+    endpoints: list[str],
+    duration_sec: float,
+    concurrency: int,
+    formats: list[str],
+    server_pids: list[int] | None = None,
+) -> list[FormatPoint]:
+    """
+    Run the http load test once per response format (Accept + ?layout=), with
+    Accept-Encoding: identity so bytes are the encoded body. Decode time comes
+    from one sample response per endpoint, decoded outside the load run.
+    """
+    points = []
+    for name in formats:
+        accept, layout = RESPONSE_FORMATS[name]
+        headers = {"Accept": accept, "Accept-Encoding": "identity"}
+        paths = [format_endpoint(e, layout) for e in endpoints]
+        async with httpx.AsyncClient(timeout=30.0, headers=headers) as client:
+            samples = [await client.get(f"{base_url.rstrip('/')}{p}") for p in paths]
+        # What the server actually sent (stacks without MessagePack answer JSON)
+        media_type = samples[0].headers.get("content-type", "-").split(";", 1)[0]
+        decode = sum(
+            decode_us(r.content, r.headers.get("content-type", "")) for r in samples
+        ) / len(samples)
+
+        cpu_before = read_cpu_seconds(server_pids) if server_pids else None
+        stats, latencies = await run_load_test(
+            base_url, paths, duration_sec, concurrency, headers=headers
+        )
+        cpu_after = read_cpu_seconds(server_pids) if server_pids else None
+        p50, _, p99 = latency_percentiles(latencies)
+        cpu_ms = None
+        if cpu_before is not None and cpu_after is not None and stats.total:
+            cpu_ms = (cpu_after - cpu_before) * 1000 / stats.total
+        points.append(
+            FormatPoint(
+                name=name,
+                media_type=media_type,
+                requests=stats.total,
+                rps=stats.req_per_sec(duration_sec),
+                p50_ms=p50,
+                p99_ms=p99,
+                body_bytes_per_req=stats.wire_bytes / stats.total
+                if stats.total
+                else 0.0,
+                decode_us_per_req=decode,
+                cpu_ms_per_req=cpu_ms,
+            )
+        )
+    return points
+
+
+def print_format_report(points: list[FormatPoint]) -> None:
+    """Table of rps, bytes/request, decode and server CPU per format, sizes relative to JSON (first row)."""
+    print(
+        f"{'format':<17} {'content-type':<20} {'rps':>9} {'p50':>7} {'p99':>7} "
+        f"{'bytes/req':>10} {'size':>7} {'decode us':>10} {'cpu ms/req':>10}"
+    )
+    baseline = points[0].body_bytes_per_req
+    for point in points:
+        size = point.body_bytes_per_req / baseline * 100 if baseline else 0.0
+        cpu = f"{point.cpu_ms_per_req:.3f}" if point.cpu_ms_per_req is not None else "-"
+        print(
+            f"{point.name:<17} {point.media_type:<20} {point.rps:>9.1f} "
+            f"{point.p50_ms:>7.1f} {point.p99_ms:>7.1f} {point.body_bytes_per_req:>10.0f} "
+            f"{size:>6.1f}% {point.decode_us_per_req:>10.1f} {cpu:>10}"
+        )
+
+
+# ----- Scenarios (N+1 vs batched user lookups) -----
+
+
+SCENARIOS = ("users-n1", "users-batch", "users-create")
+
+
+def users_paths(api: str) -> tuple[str, str]:
+    """(single-user path template, batch path) for api; DRF routes have trailing slashes."""
+    if api == "drf":
+        return "/drf/users/{id}/", "/drf/users/batch/"
+    return "/users/{id}", "/users/batch"
+
+
+async def scenario_op(
+    client: httpx.AsyncClient,
+    base_url: str,
+    scenario: str,
+    api: str,
+    ids: list[int],
+) -> tuple[LoadResult, int]:
+    """
+    One client operation: fetch `ids`. Returns (operation result, HTTP requests made).
+
+    users-n1 issues one GET /users/{id} per id (concurrently, the best case for
+    that pattern); users-batch issues a single GET /users/batch?ids=. A 404 for
+    an unknown id is not a failure, since the batch endpoint reports it as missing.
+    """
+    base = base_url.rstrip("/")
+    item_path, batch_path = users_paths(api)
+    start = time.perf_counter()
+    if scenario == "users-batch":
+        result = await single_request(
+            client, base + batch_path, params={"ids": ",".join(map(str, ids))}
+        )
+        result.latency_ms = (time.perf_counter() - start) * 1000
+        return result, 1
+    results = await asyncio.gather(
+        *(single_request(client, base + item_path.format(id=i)) for i in ids)
+    )
+    latency_ms = (time.perf_counter() - start) * 1000
+    for r in results:
+        if not r.success and r.status_code != 404:
+            return LoadResult(False, r.status_code, latency_ms, r.error), len(ids)
+    return LoadResult(True, 200, latency_ms), len(ids)
+
+
+async def run_scenario_test(
+    base_url: str,
+    scenario: str,
+    api: str,
+    duration_sec: float,
+    concurrency: int,
+    batch_size: int = 20,
+    id_max: int = 1000,
+) -> tuple[LoadStats, list[float], int]:
+    """
+    Closed-loop scenario test: `concurrency` clients each repeatedly fetch
+    batch_size random ids from 1..id_max. Stats count operations, not requests.
+    Returns (LoadStats, operation latencies, total HTTP requests).
+    """
+    stats = LoadStats()
+    latencies: list[float] = []
+    requests = 0
+    size = min(batch_size, id_max)
+    connections = concurrency * (size if scenario == "users-n1" else 1)
+    stop_at = time.perf_counter() + duration_sec
+
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=client_limits(connections)
+    ) as client:
+
+        async def client_loop(seed: int) -> None:
+            nonlocal requests
+            rng = random.Random(seed)
+            while time.perf_counter() < stop_at:
+                ids = rng.sample(range(1, id_max + 1), size)
+                result, made = await scenario_op(client, base_url, scenario, api, ids)
+                requests += made
+                stats.record(result, latencies)
+
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+
+    return stats, latencies, requests
+
+
+# ----- Concurrent create (POST /users) -----
+
+
+@dataclass
+class CreateStats:
+    """POST /users outcomes: 201 created, 400 username taken, anything else an error."""
+
+    created: int = 0
+    conflicts: int = 0
+    errors: int = 0
+    server_errors: int = 0
+    latencies: list[float] = field(default_factory=list)
+    sample_errors: list[str] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return self.created + self.conflicts + self.errors
+
+    def record(
+        self, status_code: int | None, latency_ms: float, error: str | None
+    ) -> None:
+        self.latencies.append(latency_ms)
+        if status_code in (200, 201):
+            self.created += 1
+            return
+        if status_code == 400:
+            self.conflicts += 1
+            return
+        self.errors += 1
+        if status_code is not None and status_code >= 500:
+            self.server_errors += 1
+        if error and len(self.sample_errors) < 20:
+            self.sample_errors.append(error)
+
+
+def create_paths(api: str) -> tuple[str, str]:
+    """(login path, create path) for api; DRF routes have trailing slashes."""
+    if api == "drf":
+        return "/drf/auth/login/", "/drf/users/"
+    return "/auth/login", "/users"
+
+
+def create_username(
+    run_id: str, seq: int, rng: random.Random, conflict_ratio: float, hot: int
+) -> str:
+    """A fresh username, or (with probability conflict_ratio) one of `hot` shared names."""
+    if rng.random() < conflict_ratio:
+        return f"lt-{run_id}-hot-{rng.randrange(hot)}"
+    return f"lt-{run_id}-{seq}"
+
+
+async def run_create_test(
+    base_url: str,
+    api: str,
+    token: str,
+    duration_sec: float,
+    concurrency: int,
+    conflict_ratio: float = 0.5,
+    hot: int = 8,
+) -> CreateStats:
+    """
+    Closed-loop create race: `concurrency` clients POST users, a share of them
+    with usernames other clients are creating at the same moment. Every
+    duplicate should be a 400; a 5xx means the create path raced.
+    """
+    stats = CreateStats()
+    base = base_url.rstrip("/")
+    _, path = create_paths(api)
+    run_id = f"{int(time.time()):x}"
+    seq = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    stop_at = time.perf_counter() + duration_sec
+
+    async with httpx.AsyncClient(
+        timeout=30.0, limits=client_limits(concurrency), headers=headers
+    ) as client:
+
+        async def client_loop(seed: int) -> None:
+            nonlocal seq
+            rng = random.Random(seed)
+            while time.perf_counter() < stop_at:
+                seq += 1
+                body = {
+                    "username": create_username(run_id, seq, rng, conflict_ratio, hot),
+                    "password": "load-test",
+                }
+                start = time.perf_counter()
+                try:
+                    resp = await client.post(base + path, json=body)
+                    status, error = resp.status_code, None
+                    if status not in (200, 201, 400):
+                        error = f"HTTP {status}: {resp.text[:100]}"
+                except Exception as e:
+                    status, error = None, str(e)
+                stats.record(status, (time.perf_counter() - start) * 1000, error)
+
+        await asyncio.gather(*(client_loop(i) for i in range(concurrency)))
+
+    return stats
+
+
+def login_token(base_url: str, api: str, login: str) -> str:
+    """Access token for `user:password` (must be staff to create users)."""
+    username, _, password = login.partition(":")
+    path, _ = create_paths(api)
+    resp = httpx.post(
+        base_url.rstrip("/") + path,
+        json={"username": username, "password": password},
+        timeout=30.0,
+    )
+    resp.raise_for_status()
+    return resp.json()["access_token"]
+
+
+# ----- Sweep (saturation point detection) -----
+
+
+@dataclass
+class SweepPoint:
+    """One step of a sweep: a single endpoint at one concurrency / arrival rate."""
+
+    endpoint: str
+    mode: str
+    level: int
+    total: int
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    error_rate: float
+    saturated: bool
+
+
+def geometric_levels(start: int, maximum: int, factor: float) -> list[int]:
+    """Strictly increasing levels start, start*factor, ... up to maximum (inclusive)."""
+    if start < 1 or maximum < start:
+        raise ValueError("sweep levels need 1 <= start <= max")
+    if factor <= 1:
+        raise ValueError("sweep factor must be > 1")
+    levels = []
+    level = float(start)
+    while round(level) <= maximum:
+        value = int(round(level))
+        if not levels or value > levels[-1]:
+            levels.append(value)
+        level *= factor
+    if levels[-1] != maximum:
+        levels.append(maximum)
+    return levels
+
+
+def is_saturated(
+    p99_ms: float, error_rate: float, slo_p99_ms: float, max_error_rate: float
+) -> bool:
+    """A step is past the knee when p99 exceeds the SLO or errors exceed the threshold."""
+    return p99_ms > slo_p99_ms or error_rate > max_error_rate
+
+
+def max_sustainable(points: list[SweepPoint]) -> dict[str, SweepPoint | None]:
+    """Per endpoint, the highest-throughput step that stayed within the SLO."""
+    best: dict[str, SweepPoint | None] = {}
+    for point in points:
+        best.setdefault(point.endpoint, None)
+        if point.saturated:
+            continue
+        current = best[point.endpoint]
+        if current is None or point.rps > current.rps:
+            best[point.endpoint] = point
+    return best
+
+
+async def run_sweep(
+    base_url: str,
+    endpoints: list[str],
+    step_duration_sec: float,
+    mode: str,
+    levels: list[int],
+    slo_p99_ms: float,
+    max_error_rate: float,
+    max_in_flight: int = 1000,
+) -> list[SweepPoint]:
+    """
+    Step each endpoint through levels (concurrency or req/sec) until saturation.
+
+    Each endpoint is swept on its own so the knee of one does not hide another.
+    The first saturated step is recorded and ends that endpoint's sweep.
+    """
+    points: list[SweepPoint] = []
+    for endpoint in endpoints:
+        for level in levels:
+            if mode == "rate":
+                stats, latencies = await run_rate_test(
+                    base_url, [endpoint], step_duration_sec, level, max_in_flight
+                )
+            else:
+                stats, latencies = await run_load_test(
+                    base_url, [endpoint], step_duration_sec, level
+                )
+            p50, p95, p99 = latency_percentiles(latencies)
+            saturated = is_saturated(p99, stats.fail_rate, slo_p99_ms, max_error_rate)
+            point = SweepPoint(
+                endpoint=endpoint,
+                mode=mode,
+                level=level,
+                total=stats.total,
+                rps=stats.success / step_duration_sec,
+                p50_ms=p50,
+                p95_ms=p95,
+                p99_ms=p99,
+                error_rate=stats.fail_rate,
+                saturated=saturated,
+            )
+            points.append(point)
+            print(
+                f"  {endpoint:<24} {mode}={level:<7} rps={point.rps:>9.1f} "
+                f"p50={p50:.1f} p99={p99:.1f} err={point.error_rate:.1f}%"
+                + ("  <- saturated" if saturated else "")
+            )
+            if saturated:
+                break
+    return points
+
+
+def write_sweep_csv(
+    path: str, points: list[SweepPoint], api: str, label: str = ""
+) -> None:
+    """
+    Write the rps/latency curve (one row per sweep step) for plotting.
+
+    Rows are appended when the file already exists, so runs with different
+    --label values (e.g. direct / session / transaction pooling) share one file.
+    """
+    fieldnames = ["api", "label", *SweepPoint.__dataclass_fields__]
+    exists = os.path.exists(path) and os.path.getsize(path) > 0
+    with open(path, "a" if exists else "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        if not exists:
+            writer.writeheader()
+        for point in points:
+            writer.writerow({"api": api, "label": label, **asdict(point)})
+
+
+# ----- WebSocket (echo round trips) -----
+
+
+LATENCY_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+@dataclass
+class WsStats:
+    """Aggregated WebSocket load test statistics."""
+
+    connected: int = 0
+    connect_failed: int = 0
+    sent: int = 0
+    received: int = 0
+    fail: int = 0
+    connect_ms: list[float] = field(default_factory=list)
+    rtt_ms: list[float] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    server_rss_delta_kb: int | None = None
+    client_rss_delta_kb: int | None = None
+    batch: int = 1
+
+    def add_error(self, error: str) -> None:
+        self.fail += 1
+        if len(self.errors) < 20:
+            self.errors.append(error)
+
+    def kb_per_connection(self, delta_kb: int | None) -> float | None:
+        if delta_kb is None or self.connected == 0:
+            return None
+        return delta_kb / self.connected
+
+
+def ws_url(base_url: str, path: str) -> str:
+    """Turn an http(s) base URL into the ws(s) URL of path."""
+    base = base_url.rstrip("/")
+    if base.startswith("https://"):
+        base = "wss://" + base[len("https://") :]
+    elif base.startswith("http://"):
+        base = "ws://" + base[len("http://") :]
+    return f"{base}{path}"
+
+
+def read_rss_kb(pids: list[int]) -> int | None:
+    """Sum of resident set size (kB) of pids from /proc; None if unavailable."""
+    total = 0
+    try:
+        for pid in pids:
+            with open(f"/proc/{pid}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+                        break
+    except (OSError, ValueError):
+        return None
+    return total
+
+
+def client_rss_kb() -> int | None:
+    """Current RSS of this process (kB), falling back to peak RSS off Linux."""
+    rss = read_rss_kb([os.getpid()])
+    if rss is not None:
+        return rss
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def ws_message(seq: int, payload: str) -> tuple[str, str]:
+    """
+    Build the seq-th message and the echo the endpoint should send back.
+
+    payload "text" sends plain text, "json" sends a JSON object and "mixed"
+    alternates between the two.
+    """
+    if payload == "json" or (payload == "mixed" and seq % 2):
+        body = json.dumps({"seq": seq, "msg": "ping"}, separators=(",", ":"))
+        return body, f'{{"echo":{body}}}'
+    body = f"ping {seq}"
+    return body, f"Echo: {body}"
+
+
+def ws_frame(seq: int, payload: str, batch: int = 1) -> tuple[str | bytes, str | bytes]:
+    """
+    Build the seq-th frame and its expected reply.
+
+    batch > 1 packs that many newline-delimited messages into one frame (the
+    endpoint must be opened with ?batch=1). payload "binary" sends JSON
+    messages in binary frames.
+    """
+    kind = "json" if payload == "binary" else payload
+    pairs = [ws_message(seq * batch + i, kind) for i in range(batch)]
+    frame = "\n".join(body for body, _ in pairs)
+    expected = "\n".join(echo for _, echo in pairs)
+    if payload == "binary":
+        return frame.encode(), expected.encode()
+    return frame, expected
+
+
+def latency_histogram(values: list[float]) -> list[tuple[str, int]]:
+    """Count values per latency bucket (ms); labels are upper bounds."""
+    counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+    for value in values:
+        for i, bound in enumerate(LATENCY_BUCKETS_MS):
+            if value <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+    labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+    return list(zip(labels, counts))
+
+
+async def ws_connection(
+    url: str,
+    stats: WsStats,
+    ready: asyncio.Event,
+    stop_event: asyncio.Event,
+    connect_slots: asyncio.Semaphore,
+    rate: float,
+    payload: str,
+) -> None:
+    """Open one connection, wait for all peers, then ping-pong until stop_event."""
+    start = time.perf_counter()
+    try:
+        async with connect_slots:
+            ws = await ws_connect(url, open_timeout=30, max_queue=None)
+    except Exception as e:
+        stats.connect_failed += 1
+        stats.add_error(f"connect: {e}")
+        return
+    stats.connect_ms.append((time.perf_counter() - start) * 1000)
+    stats.connected += 1
+    interval = 1.0 / rate if rate > 0 else 0.0
+    try:
+        await ready.wait()
+        seq = 0
+        next_send = time.perf_counter()
+        while not stop_event.is_set():
+            if interval:
+                delay = next_send - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                next_send += interval
+            frame, expected = ws_frame(seq, payload, stats.batch)
+            seq += 1
+            sent_at = time.perf_counter()
+            await ws.send(frame)
+            stats.sent += 1
+            reply = await ws.recv()
+            stats.rtt_ms.append((time.perf_counter() - sent_at) * 1000)
+            stats.received += 1
+            if reply != expected:
+                stats.add_error(f"unexpected reply: {str(reply)[:60]}")
+    except Exception as e:
+        if not stop_event.is_set():
+            stats.add_error(str(e))
+    finally:
+        await ws.close()
+
+
+async def run_ws_test(
+    url: str,
+    connections: int,
+    duration_sec: float,
+    rate: float = 0.0,
+    payload: str = "mixed",
+    server_pids: list[int] | None = None,
+    connect_concurrency: int = 200,
+    batch: int = 1,
+) -> WsStats:
+    """
+    WebSocket echo load test.
+
+    Opens `connections` sockets (at most connect_concurrency handshakes at once),
+    measures connection setup time and the RSS growth of server_pids, then sends
+    frames for duration_sec: `rate` messages/sec per connection, or as fast as
+    the echo allows when rate is 0. Each frame waits for its echo (round trip).
+    With batch > 1 every frame carries that many messages.
+    """
+    stats = WsStats(batch=batch)
+    ready = asyncio.Event()
+    stop_event = asyncio.Event()
+    connect_slots = asyncio.Semaphore(connect_concurrency)
+    server_before = read_rss_kb(server_pids) if server_pids else None
+    client_before = client_rss_kb()
+
+    tasks = [
+        asyncio.create_task(
+            ws_connection(url, stats, ready, stop_event, connect_slots, rate, payload)
+        )
+        for _ in range(connections)
+    ]
+    while stats.connected + stats.connect_failed < connections:
+        await asyncio.sleep(0.05)
+
+    if server_before is not None:
+        server_after = read_rss_kb(server_pids)
+        if server_after is not None:
+            stats.server_rss_delta_kb = server_after - server_before
+    client_after = client_rss_kb()
+    if client_before is not None and client_after is not None:
+        stats.client_rss_delta_kb = client_after - client_before
+
+    ready.set()
+    await asyncio.sleep(duration_sec)
+    stop_event.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
+
+
+def print_ws_report(stats: WsStats, duration_sec: float) -> None:
+    """Print WebSocket results: setup time, messages/sec, RTT histogram, memory."""
+    print(f"Connections:    {stats.connected} ok, {stats.connect_failed} failed")
+    if stats.connect_ms:
+        c50, c95, c99 = latency_percentiles(stats.connect_ms)
+        print(f"Connect (ms):   p50={c50:.1f} p95={c95:.1f} p99={c99:.1f}")
+    print(f"Frames sent:    {stats.sent}")
+    print(f"Echo frames:    {stats.received}")
+    print(f"Fail:           {stats.fail}")
+    print(f"Messages/sec:   {stats.received * stats.batch / duration_sec:.1f}")
+    if stats.rtt_ms:
+        p50, p95, p99 = latency_percentiles(stats.rtt_ms)
+        print(
+            f"RTT (ms):       p50={p50:.2f} p95={p95:.2f} p99={p99:.2f} "
+            f"max={stats.rtt_ms[-1]:.2f}"
+        )
+        print("RTT histogram:")
+        total = len(stats.rtt_ms)
+        for label, count in latency_histogram(stats.rtt_ms):
+            if count:
+                print(f"  {label:>9} {count:>9} {count / total * 100:6.2f}%")
+    server_kb = stats.kb_per_connection(stats.server_rss_delta_kb)
+    if server_kb is not None:
+        print(f"Server memory:  {server_kb:.1f} kB/connection (RSS delta)")
+    client_kb = stats.kb_per_connection(stats.client_rss_delta_kb)
+    if client_kb is not None:
+        print(f"Client memory:  {client_kb:.1f} kB/connection (RSS delta)")
+    if stats.errors:
+        print("\nSample errors (max 5):")
+        for e in stats.errors[:5]:
+            print(f"  - {e[:80]}")
+
+
+# ----- WebSocket broadcast (fan-out delivery latency) -----
+
+
+@dataclass
+class BroadcastStats:
+    """One broadcast step: N subscribers, one publisher."""
+
+    subscribers: int
+    connected: int = 0
+    connect_failed: int = 0
+    published: int = 0
+    delivered: int = 0
+    latency_ms: list[float] = field(default_factory=list)
+    server_cpu_pct: float | None = None
+    server_rss_delta_kb: int | None = None
+    errors: list[str] = field(default_factory=list)
+
+    @property
+    def delivery_ratio(self) -> float:
+        expected = self.published * self.connected
+        return self.delivered / expected * 100 if expected else 0.0
+
+
+def read_cpu_seconds(pids: list[int]) -> float | None:
+    """User + system CPU time (s) of pids from /proc/<pid>/stat; None if unavailable."""
+    ticks = 0
+    try:
+        for pid in pids:
+            with open(f"/proc/{pid}/stat") as f:
+                # Fields after the ")" of comm: utime and stime are 12th and 13th.
+                fields = f.read().rsplit(")", 1)[1].split()
+            ticks += int(fields[11]) + int(fields[12])
+    except (OSError, ValueError, IndexError):
+        return None
+    return ticks / os.sysconf("SC_CLK_TCK")
+
+
+def broadcast_frame(seq: int) -> str:
+    """Published frame: sequence number and send time (perf_counter ns)."""
+    return f"{seq} {time.perf_counter_ns()}"
+
+
+def broadcast_latency_ms(frame: str | bytes, received_ns: int) -> float:
+    """Delivery latency of a frame built by broadcast_frame."""
+    if isinstance(frame, bytes):
+        frame = frame.decode()
+    return (received_ns - int(frame.split(" ", 1)[1])) / 1_000_000
+
+
+async def broadcast_subscriber(
+    url: str,
+    stats: BroadcastStats,
+    connect_slots: asyncio.Semaphore,
+    stop_event: asyncio.Event,
+) -> None:
+    """Subscribe and record the delivery latency of every frame until stop_event."""
+    try:
+        async with connect_slots:
+            ws = await ws_connect(url, open_timeout=30, max_queue=None)
+    except Exception as e:
+        stats.connect_failed += 1
+        if len(stats.errors) < 20:
+            stats.errors.append(f"connect: {e}")
+        return
+    stats.connected += 1
+    latency = stats.latency_ms
+    try:
+        async for frame in ws:
+            latency.append(broadcast_latency_ms(frame, time.perf_counter_ns()))
+            stats.delivered += 1
+    except Exception as e:
+        if not stop_event.is_set() and len(stats.errors) < 20:
+            stats.errors.append(str(e))
+    finally:
+        await ws.close()
+
+
+async def run_broadcast_test(
+    url: str,
+    subscribers: int,
+    duration_sec: float,
+    rate: float = 10.0,
+    server_pids: list[int] | None = None,
+    connect_concurrency: int = 200,
+) -> BroadcastStats:
+    """
+    Fan-out load test for WS /ws/broadcast.
+
+    Connects `subscribers` sockets, then a publish-only socket (?subscribe=0)
+    sends `rate` frames/sec for duration_sec. Latency is measured per delivery
+    from the send timestamp embedded in the frame (publisher and subscribers
+    share this process clock). Server CPU is sampled from /proc over the publish
+    window only, so it excludes connection setup.
+    """
+    stats = BroadcastStats(subscribers=subscribers)
+    stop_event = asyncio.Event()
+    connect_slots = asyncio.Semaphore(connect_concurrency)
+    server_before = read_rss_kb(server_pids) if server_pids else None
+
+    tasks = [
+        asyncio.create_task(broadcast_subscriber(url, stats, connect_slots, stop_event))
+        for _ in range(subscribers)
+    ]
+    while stats.connected + stats.connect_failed < subscribers:
+        await asyncio.sleep(0.05)
+    if server_before is not None:
+        server_after = read_rss_kb(server_pids)
+        if server_after is not None:
+            stats.server_rss_delta_kb = server_after - server_before
+
+    publish_url = url + ("&" if "?" in url else "?") + "subscribe=0"
+    interval = 1.0 / rate if rate > 0 else 0.0
+    async with ws_connect(publish_url, open_timeout=30) as publisher:
+        # Let the server register the last subscribers before publishing.
+        await asyncio.sleep(0.5)
+        cpu_before = read_cpu_seconds(server_pids) if server_pids else None
+        started = time.perf_counter()
+        next_send = started
+        deadline = started + duration_sec
+        while time.perf_counter() < deadline:
+            await publisher.send(broadcast_frame(stats.published))
+            stats.published += 1
+            next_send += interval
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            elif not interval:
+                await asyncio.sleep(0)
+        # Grace period for in-flight deliveries.
+        await asyncio.sleep(min(2.0, max(0.5, duration_sec / 5)))
+        if cpu_before is not None:
+            cpu_after = read_cpu_seconds(server_pids)
+            if cpu_after is not None:
+                elapsed = time.perf_counter() - started
+                stats.server_cpu_pct = (cpu_after - cpu_before) / elapsed * 100
+
+    stop_event.set()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return stats
+
+
+def print_broadcast_report(results: list[BroadcastStats]) -> None:
+    """Print one row per subscriber count: delivery ratio, latency, server CPU."""
+    print(
+        f"{'subscribers':>11} {'connected':>9} {'published':>9} {'delivered':>10} "
+        f"{'ratio%':>7} {'p50ms':>8} {'p95ms':>8} {'p99ms':>8} {'cpu%':>7} {'kB/conn':>8}"
+    )
+    for r in results:
+        p50 = p95 = p99 = 0.0
+        if r.latency_ms:
+            p50, p95, p99 = latency_percentiles(r.latency_ms)
+        cpu = f"{r.server_cpu_pct:.1f}" if r.server_cpu_pct is not None else "-"
+        kb = (
+            f"{r.server_rss_delta_kb / r.connected:.1f}"
+            if r.server_rss_delta_kb is not None and r.connected
+            else "-"
+        )
+        print(
+            f"{r.subscribers:>11} {r.connected:>9} {r.published:>9} {r.delivered:>10} "
+            f"{r.delivery_ratio:>7.1f} {p50:>8.2f} {p95:>8.2f} {p99:>8.2f} {cpu:>7} {kb:>8}"
+        )
+    errors = [e for r in results for e in r.errors]
+    if errors:
+        print("\nSample errors (max 5):")
+        for e in errors[:5]:
+            print(f"  - {e[:80]}")
+
+
+def parse_pids(value: str | None) -> list[int]:
+    """Parse a comma-separated PID list (e.g. from pgrep -d,)."""
+    if not value:
+        return []
+    return [int(p) for p in value.split(",") if p.strip()]
+
+
 BOLT_DEFAULTS = {
     "url": "http://localhost:8000",
     "endpoints": "/health,/health/test,/ready,/users,/roles",
@@ -244,6 +1454,169 @@ def main():
         default=None,
         help="Comma-separated endpoints (overrides default for --api)",
     )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        choices=["http", "ws", "broadcast"],
+        default="http",
+        help=(
+            "http: request/response endpoints; ws: WebSocket echo; "
+            "broadcast: WebSocket fan-out (default: http)"
+        ),
+    )
+    parser.add_argument(
+        "--server-pid",
+        default=None,
+        help="Comma-separated server PIDs for memory/CPU figures (Linux /proc)",
+    )
+    parser.add_argument(
+        "--accept-encoding",
+        default=None,
+        help=(
+            "Compression benchmark: comma-separated Accept-Encoding values "
+            "(e.g. gzip,br,zstd), one run each after an identity baseline"
+        ),
+    )
+    parser.add_argument(
+        "--formats",
+        default=None,
+        help=(
+            "Response format benchmark: comma-separated "
+            f"{', '.join(RESPONSE_FORMATS)}, one run each after a JSON baseline"
+        ),
+    )
+    parser.add_argument(
+        "--etag",
+        action="store_true",
+        help="Replay ETags as If-None-Match (304 counts as success); reports 304s and bytes",
+    )
+    parser.add_argument(
+        "--label",
+        default="",
+        help="Tag for this run (e.g. direct, session, transaction); printed and written to --csv",
+    )
+    ws = parser.add_argument_group("websocket (--mode ws)")
+    ws.add_argument(
+        "--ws-path",
+        default="/ws",
+        help="WebSocket echo path (default: /ws)",
+    )
+    ws.add_argument(
+        "--ws-rate",
+        type=float,
+        default=0.0,
+        help="Messages/sec per connection; 0 = as fast as possible (default: 0)",
+    )
+    ws.add_argument(
+        "--ws-payload",
+        choices=["text", "json", "mixed", "binary"],
+        default="mixed",
+        help="Frame kind: text, json, alternating or JSON in binary frames (default: mixed)",
+    )
+    ws.add_argument(
+        "--ws-batch",
+        type=int,
+        default=1,
+        help="Messages per frame; >1 connects with ?batch=1 (default: 1)",
+    )
+    broadcast = parser.add_argument_group("broadcast (--mode broadcast)")
+    broadcast.add_argument(
+        "--subscribers",
+        default="1000,10000,50000",
+        help="Comma-separated subscriber counts, one step each (default: 1000,10000,50000)",
+    )
+    broadcast.add_argument(
+        "--publish-rate",
+        type=float,
+        default=10.0,
+        help="Published frames/sec; 0 = as fast as possible (default: 10)",
+    )
+    scenario = parser.add_argument_group("scenarios (client request patterns)")
+    scenario.add_argument(
+        "--scenario",
+        choices=SCENARIOS,
+        default=None,
+        help=(
+            "users-n1: one GET /users/{id} per id; users-batch: one GET /users/batch?ids=; "
+            "users-create: concurrent POST /users with colliding usernames"
+        ),
+    )
+    scenario.add_argument(
+        "--batch-size",
+        type=int,
+        default=20,
+        help="User ids fetched per operation (default: 20, batch endpoint max 100)",
+    )
+    scenario.add_argument(
+        "--id-max",
+        type=int,
+        default=1000,
+        help="Ids are sampled from 1..id-max (default: 1000)",
+    )
+    scenario.add_argument(
+        "--login",
+        default="admin:admin",
+        help="Staff user:password for users-create (default: admin:admin)",
+    )
+    scenario.add_argument(
+        "--conflict-ratio",
+        type=float,
+        default=0.5,
+        help="Share of users-create requests racing for an existing username (default: 0.5)",
+    )
+    sweep = parser.add_argument_group("sweep (saturation point detection)")
+    sweep.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Step load up geometrically per endpoint until the SLO is broken",
+    )
+    sweep.add_argument(
+        "--sweep-mode",
+        choices=["concurrency", "rate"],
+        default="concurrency",
+        help="Step closed-loop workers or open-loop req/sec (default: concurrency)",
+    )
+    sweep.add_argument(
+        "--sweep-start",
+        type=int,
+        default=None,
+        help="First level (default: 1 worker / 100 req/sec)",
+    )
+    sweep.add_argument(
+        "--sweep-max",
+        type=int,
+        default=None,
+        help="Last level (default: 1024 workers / 100000 req/sec)",
+    )
+    sweep.add_argument(
+        "--sweep-factor",
+        type=float,
+        default=2.0,
+        help="Multiplier between levels (default: 2.0)",
+    )
+    sweep.add_argument(
+        "--slo-p99",
+        type=float,
+        default=100.0,
+        help="p99 latency SLO in ms; a step above it is saturated (default: 100)",
+    )
+    sweep.add_argument(
+        "--max-error-rate",
+        type=float,
+        default=1.0,
+        help="Error rate in %% above which a step is saturated (default: 1.0)",
+    )
+    sweep.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=1000,
+        help="Outstanding request cap in rate mode (default: 1000)",
+    )
+    sweep.add_argument(
+        "--csv",
+        default=None,
+        help="Append the sweep rps/latency curve to this CSV file",
+    )
     args = parser.parse_args()
 
     defaults = API_DEFAULTS.get(args.api, BOLT_DEFAULTS)
@@ -253,13 +1626,28 @@ def main():
     if not endpoints:
         endpoints = ["/health"]
 
-    print(f"Load test: {args.api.upper()} @ {base_url}")
+    if args.mode == "ws":
+        return run_ws_cli(args, base_url)
+    if args.mode == "broadcast":
+        return run_broadcast_cli(args, base_url)
+    if args.scenario:
+        return run_scenario_cli(args, base_url)
+    if args.sweep:
+        return run_sweep_cli(args, base_url, endpoints)
+    if args.formats:
+        return run_format_cli(args, base_url, endpoints)
+    if args.accept_encoding:
+        return run_compression_cli(args, base_url, endpoints)
+
+    print(f"Load test: {args.api.upper()} @ {base_url}{run_label(args)}")
     print(f"  Endpoints: {endpoints}")
     print(f"  Duration: {args.duration}s | Concurrency: {args.concurrency}")
     print("-" * 50)
 
     stats, latencies = asyncio.run(
-        run_load_test(base_url, endpoints, args.duration, args.concurrency)
+        run_load_test(
+            base_url, endpoints, args.duration, args.concurrency, etag=args.etag
+        )
     )
 
     elapsed = args.duration
@@ -271,22 +1659,258 @@ def main():
     print(f"Success rate:   {stats.success_rate:.1f}%")
     print(f"Fail rate:      {stats.fail_rate:.1f}%")
     print(f"Requests/sec:   {rps:.1f}")
+    if args.etag:
+        share = stats.not_modified / stats.total * 100 if stats.total else 0.0
+        print(f"Not modified:   {stats.not_modified} ({share:.1f}% 304)")
+    if stats.total:
+        print(f"Body bytes/req: {stats.wire_bytes / stats.total:.0f}")
+    if stats.cache:
+        print(f"Response cache: {cache_summary(stats)}")
     if latencies:
-        latencies.sort()
-        n = len(latencies)
+        p50, p95, p99 = latency_percentiles(latencies)
+        print(f"Latency (ms):   p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+    if stats.timing:
+        print_timing_report(stats)
+    if stats.errors:
+        print("\nSample errors (max 5):")
+        for e in stats.errors[:5]:
+            print(f"  - {e[:80]}")
 
-        def _percentile_idx(p: int) -> int:
-            return max(0, min(int((n - 1) * p / 100), n - 1)) if n else 0
 
-        p50 = latencies[_percentile_idx(50)]
-        p95 = latencies[_percentile_idx(95)]
-        p99 = latencies[_percentile_idx(99)]
-        print(f"Latency (ms):   p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+def run_compression_cli(args, base_url: str, endpoints: list[str]) -> None:
+    """Run --accept-encoding: identity baseline, then each encoding; print the table."""
+    encodings = [e.strip() for e in args.accept_encoding.split(",") if e.strip()]
+    encodings = ["identity"] + [e for e in encodings if e != "identity"]
+    pids = parse_pids(args.server_pid)
+    print(f"Compression: {args.api.upper()} @ {base_url}{run_label(args)}")
+    print(f"  Endpoints: {endpoints}")
+    print(
+        f"  Duration: {args.duration}s per encoding | Concurrency: {args.concurrency} | "
+        f"Accept-Encoding: {encodings}"
+    )
+    if not pids:
+        print("  (pass --server-pid to report server CPU per request)")
+    print("-" * 50)
+    points = asyncio.run(
+        run_compression_test(
+            base_url,
+            endpoints,
+            args.duration,
+            args.concurrency,
+            encodings,
+            server_pids=pids,
+        )
+    )
+    print_compression_report(points)
+
+
+def run_format_cli(args, base_url: str, endpoints: list[str]) -> None:
+    """Run --formats: JSON baseline, then each format; print the table."""
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in RESPONSE_FORMATS]
+    if unknown:
+        raise SystemExit(
+            f"Unknown format(s) {unknown}; use {', '.join(RESPONSE_FORMATS)}"
+        )
+    formats = ["json"] + [f for f in formats if f != "json"]
+    pids = parse_pids(args.server_pid)
+    print(f"Formats: {args.api.upper()} @ {base_url}{run_label(args)}")
+    print(f"  Endpoints: {endpoints}")
+    print(
+        f"  Duration: {args.duration}s per format | Concurrency: {args.concurrency} | "
+        f"Formats: {formats}"
+    )
+    if not pids:
+        print("  (pass --server-pid to report server CPU per request)")
+    print("-" * 50)
+    points = asyncio.run(
+        run_format_test(
+            base_url,
+            endpoints,
+            args.duration,
+            args.concurrency,
+            formats,
+            server_pids=pids,
+        )
+    )
+    print_format_report(points)
+
+
+def run_label(args) -> str:
+    """Header suffix for --label."""
+    return f" [{args.label}]" if args.label else ""
+
+
+def run_ws_cli(args, base_url: str) -> None:
+    """Run --mode ws against the echo endpoint and print the report."""
+    path = args.ws_path
+    if args.ws_batch > 1:
+        path += ("&" if "?" in path else "?") + "batch=1"
+    url = ws_url(base_url, path)
+    rate = f"{args.ws_rate:g} frames/s per connection" if args.ws_rate else "max"
+    print(f"WebSocket load test: {args.api.upper()} @ {url}{run_label(args)}")
+    print(
+        f"  Connections: {args.concurrency} | Duration: {args.duration}s | "
+        f"Rate: {rate} | Payload: {args.ws_payload} | Batch: {args.ws_batch}"
+    )
+    print("-" * 50)
+    stats = asyncio.run(
+        run_ws_test(
+            url,
+            args.concurrency,
+            args.duration,
+            rate=args.ws_rate,
+            payload=args.ws_payload,
+            server_pids=parse_pids(args.server_pid),
+            batch=args.ws_batch,
+        )
+    )
+    print_ws_report(stats, args.duration)
+
+
+def run_scenario_cli(args, base_url: str) -> None:
+    """Run --scenario and print operations/sec next to HTTP requests/sec."""
+    if args.scenario == "users-create":
+        return run_create_cli(args, base_url)
+    print(
+        f"Scenario: {args.scenario} | {args.api.upper()} @ {base_url}{run_label(args)}"
+    )
+    print(
+        f"  Duration: {args.duration}s | Clients: {args.concurrency} | "
+        f"Ids/op: {args.batch_size} (from 1..{args.id_max})"
+    )
+    print("-" * 50)
+    stats, latencies, requests = asyncio.run(
+        run_scenario_test(
+            base_url,
+            args.scenario,
+            args.api,
+            args.duration,
+            args.concurrency,
+            batch_size=args.batch_size,
+            id_max=args.id_max,
+        )
+    )
+    print(f"Operations:     {stats.total} ({stats.success} ok, {stats.fail} failed)")
+    print(f"Operations/sec: {stats.req_per_sec(args.duration):.1f}")
+    print(f"HTTP requests:  {requests} ({requests / args.duration:.1f}/s)")
+    if latencies:
+        p50, p95, p99 = latency_percentiles(latencies)
+        print(f"Op latency (ms): p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
     if stats.errors:
         print("\nSample errors (max 5):")
         for e in stats.errors[:5]:
             print(f"  - {e[:80]}")
 
 
+def run_create_cli(args, base_url: str) -> None:
+    """Run --scenario users-create and print created / conflict / error counts."""
+    print(f"Scenario: users-create | {args.api.upper()} @ {base_url}{run_label(args)}")
+    print(
+        f"  Duration: {args.duration}s | Clients: {args.concurrency} | "
+        f"Conflict ratio: {args.conflict_ratio:.0%}"
+    )
+    print("-" * 50)
+    token = login_token(base_url, args.api, args.login)
+    stats = asyncio.run(
+        run_create_test(
+            base_url,
+            args.api,
+            token,
+            args.duration,
+            args.concurrency,
+            conflict_ratio=args.conflict_ratio,
+        )
+    )
+    print(f"Requests:       {stats.total} ({stats.total / args.duration:.1f}/s)")
+    print(f"Created (201):  {stats.created} ({stats.created / args.duration:.1f}/s)")
+    print(f"Conflict (400): {stats.conflicts}")
+    print(f"Errors:         {stats.errors} ({stats.server_errors} 5xx)")
+    if stats.latencies:
+        p50, p95, p99 = latency_percentiles(stats.latencies)
+        print(f"Latency (ms):   p50={p50:.1f} p95={p95:.1f} p99={p99:.1f}")
+    if stats.sample_errors:
+        print("\nSample errors (max 5):")
+        for e in stats.sample_errors[:5]:
+            print(f"  - {e[:80]}")
+
+
+def run_broadcast_cli(args, base_url: str) -> None:
+    """Run --mode broadcast once per subscriber count and print the table."""
+    path = args.ws_path if args.ws_path != "/ws" else "/ws/broadcast"
+    url = ws_url(base_url, path)
+    steps = [int(n) for n in args.subscribers.split(",") if n.strip()]
+    pids = parse_pids(args.server_pid)
+    print(f"Broadcast load test: {args.api.upper()} @ {url}{run_label(args)}")
+    print(
+        f"  Subscribers: {steps} | Duration: {args.duration}s per step | "
+        f"Publish rate: {args.publish_rate:g}/s"
+    )
+    if not pids:
+        print("  (pass --server-pid to report server CPU and memory)")
+    print("-" * 50)
+    results = []
+    for subscribers in steps:
+        results.append(
+            asyncio.run(
+                run_broadcast_test(
+                    url,
+                    subscribers,
+                    args.duration,
+                    rate=args.publish_rate,
+                    server_pids=pids,
+                )
+            )
+        )
+    print_broadcast_report(results)
+
+
+def run_sweep_cli(args, base_url: str, endpoints: list[str]) -> None:
+    """Run --sweep and print the maximum sustainable throughput per endpoint."""
+    if args.sweep_mode == "rate":
+        start = args.sweep_start or 100
+        maximum = args.sweep_max or 100_000
+    else:
+        start = args.sweep_start or 1
+        maximum = args.sweep_max or 1024
+    levels = geometric_levels(start, maximum, args.sweep_factor)
+
+    print(f"Sweep: {args.api.upper()} @ {base_url}{run_label(args)}")
+    print(f"  Endpoints: {endpoints}")
+    print(f"  Mode: {args.sweep_mode} | Levels: {levels}")
+    print(
+        f"  Step: {args.duration}s | SLO: p99 <= {args.slo_p99}ms, "
+        f"errors <= {args.max_error_rate}%"
+    )
+    print("-" * 50)
+
+    points = asyncio.run(
+        run_sweep(
+            base_url,
+            endpoints,
+            args.duration,
+            args.sweep_mode,
+            levels,
+            args.slo_p99,
+            args.max_error_rate,
+            args.max_in_flight,
+        )
+    )
+
+    print("-" * 50)
+    print("Max sustainable throughput:")
+    for endpoint, point in max_sustainable(points).items():
+        if point is None:
+            print(f"  {endpoint:<24} none (saturated at first level)")
+        else:
+            print(
+                f"  {endpoint:<24} {point.rps:>9.1f} req/sec "
+                f"@ {point.mode}={point.level} (p99={point.p99_ms:.1f}ms)"
+            )
+    if args.csv:
+        write_sweep_csv(args.csv, points, args.api, args.label)
+        print(f"\nCurve written to {args.csv}")
+
+
 if __name__ == "__main__":
     main()
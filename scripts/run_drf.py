@@ -1,6 +1,7 @@
 """Run DRF API server (uvicorn). Usage: uv run drf [--port 8001]"""
 
 import argparse
+import os
 import sys
 
 
@@ -11,6 +12,9 @@ def main():
     parser.add_argument("--workers", type=int, default=4, help="Workers")
     args = parser.parse_args()
 
+    # Each uvicorn worker sizes its share of the DB_POOL connection budget from this
+    os.environ["DB_POOL_PROCESSES"] = str(args.workers)
+
     import uvicorn
 
     uvicorn.run(
@@ -0,0 +1,37 @@
+"""Bolt-compatible JWT auth (tokens from Bolt/DRF POST /auth/login) as FastAPI dependencies."""
+
+from __future__ import annotations
+
+import jwt
+from fastapi import Depends, HTTPException
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from common.timing import phase
+from src.config import JWT_ALGORITHM, JWT_SECRET
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def require_user(
+    credentials: HTTPAuthorizationCredentials | None = Depends(_bearer),
+) -> dict:
+    """Decoded JWT claims (sub, username, is_staff, ...); 401 if missing or invalid."""
+    if credentials is None or not credentials.credentials:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    try:
+        with phase("auth"):
+            claims = jwt.decode(
+                credentials.credentials, JWT_SECRET, algorithms=[JWT_ALGORITHM]
+            )
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if not claims.get("sub"):
+        raise HTTPException(status_code=401, detail="Invalid token payload")
+    return claims
+
+
+async def require_staff(claims: dict = Depends(require_user)) -> dict:
+    """Claims of a staff user (is_staff claim); 403 otherwise."""
+    if not claims.get("is_staff"):
+        raise HTTPException(status_code=403, detail="Staff only")
+    return claims
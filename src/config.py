@@ -5,6 +5,13 @@ from __future__ import annotations
 import os
 from pathlib import Path
 
+from common.compression import compression_settings
+from common.db_json import list_renderer
+from common.invalidation import listen_address
+from common.response_cache import cache_settings
+from common.slow_queries import slow_query_settings
+from common.timing import timing_settings
+
 # Load .env from project root (same as Django)
 _env_path = Path(__file__).resolve().parent.parent / ".env"
 if _env_path.exists():
@@ -19,6 +26,55 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = int(os.getenv("DB_PORT", "5432"))
 
+# Response compression: COMPRESSION_* env, same as Django (common/compression.py)
+COMPRESSION = compression_settings()
+
+# Micro-cache for the public GETs: RESPONSE_CACHE_* env, same as Django (common/response_cache.py)
+RESPONSE_CACHE = cache_settings()
+
+# Server-Timing header with the auth / pool / db / hydrate / serialize breakdown,
+# X-DB-Queries / X-DB-Time with DB_QUERY_HEADERS=1 and the /db/stats query
+# counts unless DB_QUERY_METRICS=0 (common/timing.py, same env as Django)
+SERVER_TIMING = timing_settings()
+
+# Slow-query log with sampled EXPLAIN plans: SLOW_QUERY_* env, same as Django (common/slow_queries.py)
+SLOW_QUERIES = slow_query_settings()
+
+# Connection pooler mode: "session" (direct / PgBouncer session pooling) or
+# "transaction" (PgBouncer pool_mode=transaction: asyncpg statement cache off,
+# unless DB_POOL_PREPARED_STATEMENTS=1 for PgBouncer >= 1.21 max_prepared_statements)
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "session")
+DB_POOL_PREPARED_STATEMENTS = os.getenv("DB_POOL_PREPARED_STATEMENTS", "0").lower() in (
+    "1",
+    "true",
+)
+
+# LISTEN connection for cache invalidation: DB_LISTEN_HOST / DB_LISTEN_PORT,
+# default the primary; required with DB_POOL_MODE=transaction (common/invalidation.py)
+DB_LISTEN_HOST, DB_LISTEN_PORT = listen_address(
+    DB_HOST, DB_PORT, DB_POOL_MODE, RESPONSE_CACHE.enabled and RESPONSE_CACHE.listen
+)
+
+# Optional read replicas (host:port, same name/user/password as the primary)
+DB_REPLICAS = [r.strip() for r in os.getenv("DB_REPLICAS", "").split(",") if r.strip()]
+DB_REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+DB_REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "1"))
+DB_REPLICA_STICKY_SECONDS = float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
+
+# /ready: background DB probe interval/timeout (s), failures before unhealthy
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "5"))
+HEALTH_CHECK_TIMEOUT = float(os.getenv("HEALTH_CHECK_TIMEOUT", "2"))
+HEALTH_FAILURE_THRESHOLD = int(os.getenv("HEALTH_FAILURE_THRESHOLD", "1"))
+
+# JWT (same secret as Bolt/DRF/Go/Rust: BOLT_JWT_SECRET, falling back to SECRET_KEY)
+JWT_SECRET = os.getenv("BOLT_JWT_SECRET") or os.getenv("SECRET_KEY", "")
+JWT_ALGORITHM = os.getenv("BOLT_JWT_ALGORITHM", "HS256")
+
+# GET /users: "single" = COUNT + page in one statement, "split" = two round trips (A/B)
+USERS_LIST_QUERY = os.getenv("FASTAPI_USERS_LIST_QUERY", "single")
+# GET /users: "python" (Pydantic) or "db" (PostgreSQL renders the page JSON; common/db_json.py)
+USERS_LIST_RENDER = list_renderer(os.getenv("USERS_LIST_RENDER"))
+
 # App
 APP_PORT = int(os.getenv("FASTAPI_PORT", "8002"))
 
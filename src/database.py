@@ -1,12 +1,147 @@
-"""Async PostgreSQL connection pool (asyncpg)."""
+"""Async PostgreSQL connection pools (asyncpg): primary, optional read replicas."""
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from time import perf_counter
+
 import asyncpg
 
-from src.config import DB_HOST, DB_NAME, DB_PASSWORD, DB_PORT, DB_USER
+from common.health import HealthMonitor
+from common.replicas import REPLICA_LAG_SQL, ReplicaSet
+from common.slow_queries import (
+    EXPLAIN_PREFIX,
+    PENDING,
+    AsyncExplainer,
+    SlowQueryLog,
+)
+from common.timing import paused, phase, query
+from src.config import (
+    DB_HOST,
+    DB_LISTEN_HOST,
+    DB_LISTEN_PORT,
+    DB_NAME,
+    DB_PASSWORD,
+    DB_POOL_MODE,
+    DB_POOL_PREPARED_STATEMENTS,
+    DB_PORT,
+    DB_REPLICA_CHECK_INTERVAL,
+    DB_REPLICA_MAX_LAG,
+    DB_REPLICA_STICKY_SECONDS,
+    DB_REPLICAS,
+    DB_USER,
+    HEALTH_CHECK_INTERVAL,
+    HEALTH_CHECK_TIMEOUT,
+    HEALTH_FAILURE_THRESHOLD,
+    SLOW_QUERIES,
+)
 
 _pool: asyncpg.Pool | None = None
+_replica_pools: dict[str, asyncpg.Pool] = {}
+# Read pool pinned for the current request (pin_read_pool)
+_pinned_read_pool: ContextVar[asyncpg.Pool | None] = ContextVar(
+    "pinned_read_pool", default=None
+)
+
+# The change counter is split into slots (migration accounts.0005): sum them.
+TABLE_VERSION_SQL = (
+    "SELECT sum(version)::bigint AS version, max(updated_at) AS updated_at "
+    "FROM accounts_tableversion WHERE table_name = $1"
+)
+PRIMARY = "primary"
+
+slow_queries = SlowQueryLog(SLOW_QUERIES)
+# Set while the pool or the explainer runs statements of its own (_unobserved)
+_housekeeping: ContextVar[bool] = ContextVar("db_housekeeping", default=False)
+
+
+@contextmanager
+def _unobserved():
+    """Statements in the block are neither counted, timed nor logged as slow."""
+    token = _housekeeping.set(True)
+    try:
+        with paused():
+            yield
+    finally:
+        _housekeeping.reset(token)
+
+
+@contextmanager
+def _observed(conn: TimedConnection, args: tuple, many: bool = False):
+    """One statement: counted and timed as "db", and recorded when slow."""
+    if _housekeeping.get():
+        yield
+        return
+    start = perf_counter()
+    with query():
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            if elapsed >= slow_queries.threshold:
+                sql, params = args[0], args[1:]
+                entry = slow_queries.record(sql, params, elapsed, conn.database, many)
+                if entry is not None and entry.explain == PENDING:
+                    explainer.submit(entry, sql, params)
+
+
+class TimedConnection(asyncpg.Connection):
+    """
+    Pooled connection whose queries are counted and timed as "db" (common.timing)
+    and recorded in slow_queries when slow. Observed here rather than by an
+    asyncpg query logger, whose callbacks are scheduled with call_soon and can
+    run after the request has finished.
+    """
+
+    # Pool the connection belongs to: PRIMARY or a DB_REPLICAS name (_pool_options)
+    database = PRIMARY
+
+    async def execute(self, *args, **kwargs):
+        with _observed(self, args):
+            return await super().execute(*args, **kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        with _observed(self, args, many=True):
+            return await super().executemany(*args, **kwargs)
+
+    async def fetch(self, *args, **kwargs):
+        with _observed(self, args):
+            return await super().fetch(*args, **kwargs)
+
+    async def fetchrow(self, *args, **kwargs):
+        with _observed(self, args):
+            return await super().fetchrow(*args, **kwargs)
+
+    async def fetchval(self, *args, **kwargs):
+        with _observed(self, args):
+            return await super().fetchval(*args, **kwargs)
+
+    async def reset(self, *, timeout=None):
+        # The pool's RESET ALL and co. on release: pool time, not a request query
+        with phase("pool"), _unobserved():
+            return await super().reset(timeout=timeout)
+
+
+async def _name_connection(database: str, conn: TimedConnection) -> None:
+    conn.database = database
+
+
+def _pool_options(database: str = PRIMARY) -> dict:
+    """create_pool options shared by the primary and replica pools."""
+    options = {
+        "min_size": 2,
+        "max_size": 10,
+        "command_timeout": 10,
+        "connection_class": TimedConnection,
+        "init": partial(_name_connection, database),
+    }
+    if DB_POOL_MODE == "transaction" and not DB_POOL_PREPARED_STATEMENTS:
+        # Named prepared statements would land on whichever server connection
+        # PgBouncer hands out next; unnamed statements are pooler-safe.
+        options["statement_cache_size"] = 0
+    return options
 
 
 async def get_pool() -> asyncpg.Pool:
@@ -19,16 +154,136 @@ async def get_pool() -> asyncpg.Pool:
             user=DB_USER,
             password=DB_PASSWORD,
             database=DB_NAME,
-            min_size=2,
-            max_size=10,
-            command_timeout=10,
+            **_pool_options(),
         )
     return _pool
 
 
+async def _replica_pool(name: str) -> asyncpg.Pool:
+    """Pool of a replica from DB_REPLICAS ("host:port")."""
+    pool = _replica_pools.get(name)
+    if pool is None:
+        host, _, port = name.partition(":")
+        pool = _replica_pools[name] = await asyncpg.create_pool(
+            host=host,
+            port=int(port) if port else DB_PORT,
+            user=DB_USER,
+            password=DB_PASSWORD,
+            database=DB_NAME,
+            **_pool_options(name),
+        )
+    return pool
+
+
+async def explain(database: str, sql: str, params) -> list[str]:
+    """EXPLAIN (ANALYZE, BUFFERS) lines of a SELECT on its pool, in a rolled-back transaction."""
+    pool = await get_pool() if database == PRIMARY else await _replica_pool(database)
+    with _unobserved():
+        async with pool.acquire() as conn:
+            tx = conn.transaction()
+            await tx.start()
+            try:
+                rows = await conn.fetch(EXPLAIN_PREFIX + sql, *params)
+            finally:
+                await tx.rollback()
+    return [row[0] for row in rows]
+
+
+# Sampled plans of slow_queries, one at a time in a background task
+explainer = AsyncExplainer(slow_queries, explain)
+
+
+async def replica_lag(name: str) -> float:
+    """Replication lag of a replica in seconds."""
+    pool = await _replica_pool(name)
+    async with pool.acquire() as conn:
+        return float(await conn.fetchval(REPLICA_LAG_SQL))
+
+
+replicas = ReplicaSet(
+    DB_REPLICAS,
+    replica_lag,
+    max_lag=DB_REPLICA_MAX_LAG,
+    check_interval=DB_REPLICA_CHECK_INTERVAL,
+    sticky_seconds=DB_REPLICA_STICKY_SECONDS,
+)
+
+
+async def get_read_pool() -> asyncpg.Pool:
+    """Pool for read-only queries: a replica within DB_REPLICA_MAX_LAG, else the primary."""
+    pinned = _pinned_read_pool.get()
+    if pinned is not None:
+        return pinned
+    name = replicas.pick()
+    if name is None:
+        return await get_pool()
+    return await _replica_pool(name)
+
+
+async def pin_read_pool():
+    """Pick the read pool for the rest of this request; returns (pool, reset token)."""
+    pool = await get_read_pool()
+    return pool, _pinned_read_pool.set(pool)
+
+
+def unpin_read_pool(token) -> None:
+    _pinned_read_pool.reset(token)
+
+
+@asynccontextmanager
+async def acquire(pool: asyncpg.Pool):
+    """pool.acquire() with the wait for a connection timed as the Server-Timing "pool" phase."""
+    with phase("pool"):
+        conn = await pool.acquire()
+    try:
+        yield conn
+    finally:
+        await pool.release(conn)
+
+
+async def table_version(pool: asyncpg.Pool, table: str):
+    """(version, updated_at) of a table's change counter, or None before its first write."""
+    async with acquire(pool) as conn:
+        row = await conn.fetchrow(TABLE_VERSION_SQL, table)
+    if row is None or row["version"] is None:
+        return None
+    return row["version"], row["updated_at"]
+
+
+async def listen_connection() -> asyncpg.Connection:
+    """Dedicated connection for LISTEN (outside the pools; DB_LISTEN_HOST / DB_LISTEN_PORT)."""
+    return await asyncpg.connect(
+        host=DB_LISTEN_HOST,
+        port=DB_LISTEN_PORT,
+        user=DB_USER,
+        password=DB_PASSWORD,
+        database=DB_NAME,
+    )
+
+
 async def close_pool() -> None:
-    """Close the connection pool."""
+    """Close the connection pools."""
     global _pool
+    await replicas.stop()
+    await explainer.stop()
     if _pool is not None:
         await _pool.close()
         _pool = None
+    for pool in _replica_pools.values():
+        await pool.close()
+    _replica_pools.clear()
+
+
+async def probe_database() -> None:
+    """SELECT 1 on a pooled connection (raises on failure). Used by db_monitor."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await conn.fetchval("SELECT 1")
+
+
+db_monitor = HealthMonitor(
+    probe_database,
+    interval=HEALTH_CHECK_INTERVAL,
+    timeout=HEALTH_CHECK_TIMEOUT,
+    failure_threshold=HEALTH_FAILURE_THRESHOLD,
+)
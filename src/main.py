@@ -15,9 +15,15 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from src.config import APP_PORT
-from src.database import close_pool
-from src.middleware import TimingMiddleware
+from src.config import APP_PORT, RESPONSE_CACHE
+from src.database import close_pool, db_monitor
+from src.middleware import (
+    CompressionMiddleware,
+    ConditionalGetMiddleware,
+    ResponseCacheMiddleware,
+    TimingMiddleware,
+    invalidation,
+)
 from src.routers import api_router
 import uvloop
 import asyncio
@@ -25,7 +31,12 @@ import asyncio
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    db_monitor.ensure_started()
+    if RESPONSE_CACHE.enabled and RESPONSE_CACHE.listen:
+        invalidation.ensure_started()
     yield
+    await invalidation.stop()
+    await db_monitor.stop()
     await close_pool()
 
 
@@ -36,6 +47,10 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Last added runs first: timing > compression > micro-cache > conditional GET > routes
+app.add_middleware(ConditionalGetMiddleware)
+app.add_middleware(ResponseCacheMiddleware)
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(TimingMiddleware)
 app.include_router(api_router)
 
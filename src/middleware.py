@@ -1,29 +1,324 @@
-"""Middleware: X-Server-Time, X-Response-Time (Bolt-compatible)."""
+"""Middleware: X-Server-Time, X-Response-Time (Bolt-compatible), Server-Timing; response compression; response micro-cache; conditional GET."""
 
 from __future__ import annotations
 
 import time
 from datetime import datetime, timezone
 from typing import Callable
+from urllib.parse import parse_qsl
 
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
+from starlette.requests import Request, cookie_parser
 from starlette.responses import Response
 
+from common.compression import CompressionSettings, compressor, negotiate
+from common.etag import (
+    USERS_TABLE,
+    is_conditional,
+    not_modified,
+    validators,
+    wildcard_matches,
+)
+from common.formats import request_variant
+from common import timing
+from common.invalidation import InvalidationListener
+from common.query_metrics import QueryMetrics
+from common.response_cache import (
+    BYPASS,
+    CACHEABLE_PATHS,
+    MISS,
+    ResponseCache,
+    cache_key,
+    is_private,
+    new_cache,
+)
+from src.config import COMPRESSION, RESPONSE_CACHE, SERVER_TIMING
+from src.database import (
+    listen_connection,
+    pin_read_pool,
+    table_version,
+    unpin_read_pool,
+)
+
+
+# Per-endpoint query counts and DB time of this worker process (/db/stats)
+query_metrics = QueryMetrics()
+
 
 class TimingMiddleware(BaseHTTPMiddleware):
     """
     Adds X-Server-Time (UTC) and X-Response-Time (ms) to every response.
-    Bolt-compatible observability headers.
+    Bolt-compatible observability headers. With SERVER_TIMING, also the
+    Server-Timing phase breakdown (common/timing.py) recorded by require_user,
+    the pool and connections (src/database.py), the routes and TimedRoute;
+    query counts go to query_metrics and, with DB_QUERY_HEADERS, X-DB-Queries
+    and X-DB-Time.
     """
 
+    def __init__(self, app, config: timing.TimingSettings | None = None):
+        super().__init__(app)
+        self.config = config or SERVER_TIMING
+
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        config = self.config
         start = time.perf_counter()
-        response = await call_next(request)
-        duration_ms = (time.perf_counter() - start) * 1000
+        timings, token = timing.start() if config.enabled else (None, None)
+        try:
+            response = await call_next(request)
+        finally:
+            if token is not None:
+                timing.finish(token)
+        duration = time.perf_counter() - start
+        if timings is not None:
+            for name, value in timings.headers(config, duration):
+                response.headers[name] = value
+            if config.query_metrics:
+                query_metrics.record(
+                    request.method, request.url.path, timings, duration
+                )
+        duration_ms = duration * 1000
         server_time = (
             datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
         )
         response.headers["X-Server-Time"] = server_time
         response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
         return response
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI compression (gzip, brotli, zstd) negotiated from Accept-Encoding,
+    per COMPRESSION_* settings (common.compression). Single-body responses below
+    the minimum size pass through; streamed bodies (GET /users/export) are
+    compressed incrementally.
+    """
+
+    def __init__(self, app, config: CompressionSettings | None = None):
+        self.app = app
+        self.config = config or COMPRESSION
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        accept = next(
+            (
+                v.decode("latin-1")
+                for k, v in scope["headers"]
+                if k == b"accept-encoding"
+            ),
+            None,
+        )
+        encoding = negotiate(accept, self.config.available)
+        if encoding is None:
+            return await self.app(scope, receive, send)
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.config))
+
+
+class _CompressingSend:
+    """ASGI send wrapper: decides on the first body message, then compresses or passes through."""
+
+    def __init__(self, send, encoding: str, config: CompressionSettings):
+        self.send = send
+        self.encoding = encoding
+        self.config = config
+        self.start: dict | None = None
+        self.compressor = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" in headers or not self.config.compressible(
+                headers.get("content-type")
+            ):
+                self.passthrough = True
+                return await self.send(message)
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            return await self.send(message)
+
+        body = message.get("body", b"")
+        more = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=list(start["headers"]))
+            if not more and len(body) < self.config.min_size:
+                self.passthrough = True
+                await self.send(start)
+                return await self.send(message)
+            headers.add_vary_header("Accept-Encoding")
+            headers["Content-Encoding"] = self.encoding
+            self.compressor = compressor(
+                self.encoding, self.config.level(self.encoding)
+            )
+            if more:
+                del headers["Content-Length"]
+                await self.send({**start, "headers": headers.raw})
+            else:
+                body = self.compressor.compress(body) + self.compressor.flush()
+                headers["Content-Length"] = str(len(body))
+                await self.send({**start, "headers": headers.raw})
+                return await self.send({"type": "http.response.body", "body": body})
+
+        out = self.compressor.compress(body)
+        if not more:
+            out += self.compressor.flush()
+        if out or not more:
+            await self.send(
+                {"type": "http.response.body", "body": out, "more_body": more}
+            )
+
+
+# One per worker process (or shared by the workers); GET /cache/stats reads it
+response_cache = new_cache(RESPONSE_CACHE, "fastapi")
+# Evicts on writes to accounts_user from any worker; started in the lifespan
+invalidation = InvalidationListener(listen_connection, response_cache)
+
+
+class ResponseCacheMiddleware:
+    """
+    Pure ASGI micro-cache for the public GETs (common/response_cache.py,
+    RESPONSE_CACHE_*). Serves fresh or stale copies and stores single-body 200
+    responses on a miss; X-Cache tells which. Sits between compression and
+    conditional GET, so entries are uncompressed and keep their ETag. Writes
+    to accounts_user evict entries in every worker (invalidation).
+    """
+
+    def __init__(self, app, cache: ResponseCache | None = None):
+        self.app = app
+        self.cache = cache or response_cache
+
+    async def __call__(self, scope, receive, send):
+        cache = self.cache
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not cache.config.enabled
+            or not CACHEABLE_PATHS.match(scope["path"])
+        ):
+            return await self.app(scope, receive, send)
+        headers = Headers(scope=scope)
+        cookies = cookie_parser(headers["cookie"]) if "cookie" in headers else None
+        if is_private(headers, cookies, cache.config):
+            cache.bypass()
+            return await self.app(scope, receive, _MarkingSend(send, BYPASS))
+        query = parse_qsl(
+            scope["query_string"].decode("latin-1"), keep_blank_values=True
+        )
+        key = cache_key(scope["path"], query, headers, cache.config.vary)
+        entry, state = cache.get(key)
+        if entry is not None:
+            if entry.not_modified(headers.get("if-none-match")):
+                status, response_headers, body = 304, entry.validators(), b""
+            else:
+                status, response_headers, body = entry.status, entry.headers, entry.body
+            raw = [
+                (k.encode("latin-1"), v.encode("latin-1")) for k, v in response_headers
+            ]
+            raw.append((b"x-cache", state.encode()))
+            await send(
+                {"type": "http.response.start", "status": status, "headers": raw}
+            )
+            return await send({"type": "http.response.body", "body": body})
+        capture = _MarkingSend(send, MISS)
+        try:
+            await self.app(scope, receive, capture)
+        except BaseException:
+            cache.release(key)
+            raise
+        if capture.body is None:
+            cache.release(key)
+        else:
+            cache.put(key, capture.status, capture.headers, capture.body)
+
+
+class _MarkingSend:
+    """ASGI send wrapper: adds X-Cache and keeps status, headers and a single-message body."""
+
+    def __init__(self, send, state: str):
+        self.send = send
+        self.state = state
+        self.status = 0
+        self.headers: list[tuple[str, str]] = []
+        self.body: bytes | None = None
+        self.streamed = False
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+            self.headers = [
+                (k.decode("latin-1"), v.decode("latin-1"))
+                for k, v in message["headers"]
+            ]
+            message = {
+                **message,
+                "headers": [*message["headers"], (b"x-cache", self.state.encode())],
+            }
+        elif message["type"] == "http.response.body":
+            if self.body is None and not self.streamed and not message.get("more_body"):
+                self.body = message.get("body", b"")
+            else:
+                self.streamed, self.body = True, None
+        await self.send(message)
+
+
+class ConditionalGetMiddleware:
+    """
+    ETag / Last-Modified on GET /users, /users/{id} and /users/batch (common/etag.py).
+    A matching If-None-Match / If-Modified-Since gets 304 before the route runs.
+    The read pool is pinned for the request, so the validators and the body
+    come from the same database. The ETag is per representation (Accept,
+    ?layout=; common.formats), hence Vary: Accept.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or not is_conditional(
+                scope["path"], QueryParams(scope["query_string"]).get("ids")
+            )
+        ):
+            return await self.app(scope, receive, send)
+        pool, token = await pin_read_pool()
+        try:
+            state = await table_version(pool, USERS_TABLE)
+            if state is None:
+                return await self.app(scope, receive, send)
+            request_headers = Headers(scope=scope)
+            variant = request_variant(
+                request_headers.get("accept"),
+                QueryParams(scope["query_string"]).get("layout"),
+            )
+            headers = validators(*state, variant)
+            headers["Vary"] = "Accept"
+            if not_modified(
+                headers["ETag"],
+                state[1],
+                request_headers.get("if-none-match"),
+                request_headers.get("if-modified-since"),
+                wildcard=wildcard_matches(scope["path"]),
+            ):
+                return await Response(status_code=304, headers=headers)(
+                    scope, receive, send
+                )
+
+            async def send_with_validators(message):
+                if (
+                    message["type"] == "http.response.start"
+                    and message["status"] == 200
+                ):
+                    response_headers = MutableHeaders(raw=list(message["headers"]))
+                    for name, value in headers.items():
+                        response_headers[name] = value
+                    message = {**message, "headers": response_headers.raw}
+                await send(message)
+
+            await self.app(scope, receive, send_with_validators)
+        finally:
+            unpin_read_pool(token)
@@ -1,8 +1,11 @@
-"""Health check routes: /health, /health/test, /ready."""
+"""Health check routes: /health, /health/test, /ready; response cache counters: /cache/stats; query counts: /db/stats; slow-query log: /db/slow-queries (staff)."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 
-from src.database import get_pool
+from common.health import is_fresh, ready_payload
+from src.auth import require_staff
+from src.database import db_monitor, slow_queries
+from src.middleware import invalidation, query_metrics, response_cache
 from src.schemas.health import HealthResponse, HealthTestResponse, ReadyResponse
 
 router = APIRouter()
@@ -24,18 +27,27 @@ async def health_test():
 
 
 @router.get("/ready", response_model=ReadyResponse)
-async def ready():
-    """Readiness check (DB). Returns 503 if unhealthy (Bolt-compatible)."""
-    try:
-        pool = await get_pool()
-        async with pool.acquire() as conn:
-            await conn.fetchval("SELECT 1")
-        return ReadyResponse(
-            status="healthy",
-            checks={"database": "ok"},
-        )
-    except Exception:
-        raise HTTPException(
-            status_code=503,
-            detail={"status": "unhealthy", "checks": {"database": "error"}},
-        )
+async def ready(fresh: str | None = None):
+    """Readiness from the cached DB monitor state (?fresh=1 for a live check). 503 if unhealthy."""
+    state = await db_monitor.get(fresh=is_fresh(fresh))
+    if not state.healthy:
+        raise HTTPException(status_code=503, detail=ready_payload(state))
+    return ReadyResponse(**ready_payload(state))
+
+
+@router.get("/cache/stats")
+async def cache_stats():
+    """Response micro-cache counters of this worker process (hit ratio, bytes served, LISTEN state)."""
+    return {**response_cache.stats(), "invalidation": invalidation.stats()}
+
+
+@router.get("/db/stats")
+async def db_stats():
+    """SQL queries and DB time per endpoint of this worker process (common/query_metrics.py)."""
+    return query_metrics.stats()
+
+
+@router.get("/db/slow-queries", dependencies=[Depends(require_staff)])
+async def db_slow_queries():
+    """Slow queries of this worker process with sampled EXPLAIN plans, newest first. Staff only."""
+    return slow_queries.snapshot()
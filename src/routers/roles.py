@@ -3,9 +3,10 @@
 from fastapi import APIRouter, HTTPException
 
 from src.config import ROLE_CHOICES
+from src.routing import TimedRoute
 from src.schemas.roles import RoleSchema
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("", response_model=list[RoleSchema])
@@ -1,12 +1,137 @@
-"""User routes: /users, /users/{user_id}."""
+"""User routes: /users, /users/batch, /users/export, /users/{user_id}. Reads also answer in MessagePack and ?layout=columnar (common.formats)."""
 
-from fastapi import APIRouter, HTTPException, Query
+from functools import lru_cache
 
-from src.config import VALID_ROLES
-from src.database import get_pool
-from src.schemas.users import UserListResponse, UserSchema
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 
-router = APIRouter()
+from common.batch import in_request_order, parse_ids
+from common.db_json import dumps, page_sql
+from common.export import (
+    CHUNK_ROWS,
+    EXPORT_FORMATS,
+    export_headers,
+    parse_format,
+    stream_rows,
+)
+from common.formats import (
+    MEDIA_TYPES,
+    columns,
+    encode,
+    negotiate_format,
+    parse_layout,
+    records,
+)
+from common.timing import phase
+from src.auth import require_staff
+from src.config import USERS_LIST_QUERY, USERS_LIST_RENDER, VALID_ROLES
+from src.database import acquire, get_read_pool
+from src.routing import TimedRoute
+from src.schemas.users import UserBatchResponse, UserListResponse, UserSchema
+
+router = APIRouter(route_class=TimedRoute)
+
+
+def _user_filters(
+    search: str | None, role: str | None
+) -> tuple[tuple[bool, bool], list]:
+    """Filter shape (has_search, has_role) and its args for ?search= / ?role= (unknown roles ignored)."""
+    args: list = []
+    search = (search or "").strip()
+    if search:
+        args.append(f"%{search}%")
+    role_filter = (role or "").strip().upper()
+    has_role = role_filter in VALID_ROLES
+    if has_role:
+        args.append(role_filter)
+    return (bool(search), has_role), args
+
+
+@lru_cache(maxsize=None)
+def _where_clause(shape: tuple[bool, bool]) -> str:
+    """WHERE clause for a filter shape; placeholders follow _user_filters arg order."""
+    has_search, has_role = shape
+    conditions = []
+    if has_search:
+        conditions.append(f"username ILIKE ${len(conditions) + 1}")
+    if has_role:
+        conditions.append(f"role = ${len(conditions) + 1}")
+    return " AND ".join(conditions) if conditions else "1=1"
+
+
+@lru_cache(maxsize=None)
+def _list_sql(shape: tuple[bool, bool], strategy: str) -> tuple[str, ...]:
+    """
+    Pre-built list statements per filter shape.
+
+    "single": one round trip. The scalar COUNT subquery is joined to the page
+    (LATERAL ... ON TRUE), so the total is returned even for a page past the end
+    (one row with NULL user columns). "split": COUNT, then the page (two round trips).
+    """
+    where = _where_clause(shape)
+    n = sum(shape)
+    page = (
+        f"SELECT id, username, role FROM accounts_user WHERE {where} "
+        f"ORDER BY id LIMIT ${n + 1} OFFSET ${n + 2}"
+    )
+    if strategy == "split":
+        return (f"SELECT COUNT(*)::int FROM accounts_user WHERE {where}", page)
+    return (
+        "SELECT c.total, p.id, p.username, p.role "
+        f"FROM (SELECT COUNT(*)::int AS total FROM accounts_user WHERE {where}) c "
+        f"LEFT JOIN LATERAL ({page}) p ON TRUE",
+    )
+
+
+async def _fetch_page(
+    conn, shape: tuple[bool, bool], args: list, limit: int, offset: int, strategy: str
+):
+    """(total, user rows) of one list page with the "single" or "split" statements."""
+    statements = _list_sql(shape, strategy)
+    if len(statements) == 1:
+        rows = await conn.fetch(statements[0], *args, limit, offset)
+        return rows[0]["total"], [r for r in rows if r["id"] is not None]
+    total = await conn.fetchval(statements[0], *args)
+    return total, await conn.fetch(statements[1], *args, limit, offset)
+
+
+@lru_cache(maxsize=None)
+def _list_json_sql(shape: tuple[bool, bool]) -> str:
+    """USERS_LIST_RENDER=db: (total, page JSON array) in one statement per filter shape."""
+    n = sum(shape)
+    filtered = (
+        f"SELECT id, username, role FROM accounts_user WHERE {_where_clause(shape)}"
+    )
+    return page_sql(filtered, f"${n + 1}", f"${n + 2}")
+
+
+def _page_links(page: int, page_size: int, offset: int, count: int, total: int):
+    """next / previous query strings; count is the number of users on this page."""
+    next_url = (
+        f"?page={page + 1}&page_size={page_size}" if (offset + count) < total else None
+    )
+    prev_url = f"?page={page - 1}&page_size={page_size}" if page > 1 else None
+    return next_url, prev_url
+
+
+def _representation(accept: str | None, layout: str | None) -> tuple[str, str]:
+    """(format, layout) from Accept and ?layout= (common.formats); 400 for an unknown layout."""
+    try:
+        return negotiate_format(accept), parse_layout(layout)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def _items(rows, layout: str):
+    """User rows as parallel arrays (columnar) or dicts, for a negotiated body."""
+    with phase("hydrate"):
+        return columns(rows) if layout == "columnar" else records(rows)
+
+
+def _negotiated(payload: dict, fmt: str) -> Response:
+    with phase("serialize"):
+        body = encode(payload, fmt)
+    return Response(body, media_type=MEDIA_TYPES[fmt])
 
 
 @router.get("", response_model=UserListResponse)
@@ -16,58 +141,51 @@ async def list_users(
     role_code: str | None = Query(None, alias="role_code"),
     page: int = Query(1, ge=1),
     page_size: int = Query(10, ge=1, le=100, alias="page_size"),
+    layout: str | None = Query(None),
+    accept: str | None = Header(None),
 ):
     """List users with search and role filter (Bolt-compatible, paginated)."""
-    pool = await get_pool()
-    role_filter = (role or role_code or "").strip().upper()
-    if role_filter and role_filter not in VALID_ROLES:
-        role_filter = ""
-
-    conditions = []
-    args: list = []
-    idx = 1
-    if search and search.strip():
-        conditions.append(f"username ILIKE ${idx}")
-        args.append(f"%{search.strip()}%")
-        idx += 1
-    if role_filter:
-        conditions.append(f"role = ${idx}")
-        args.append(role_filter)
-        idx += 1
-
-    where_clause = " AND ".join(conditions) if conditions else "1=1"
+    fmt, layout = _representation(accept, layout)
+    pool = await get_read_pool()
+    shape, args = _user_filters(search, role or role_code)
     offset = (page - 1) * page_size
-    args.extend([page_size, offset])
 
-    async with pool.acquire() as conn:
-        count_row = await conn.fetchrow(
-            f"SELECT COUNT(*)::int as cnt FROM accounts_user WHERE {where_clause}",
-            *args[: idx - 1],
-        )
-        total = count_row["cnt"] if count_row else 0
+    if USERS_LIST_RENDER == "db" and (fmt, layout) == ("json", "rows"):
+        async with acquire(pool) as conn:
+            total, items = await conn.fetchrow(
+                _list_json_sql(shape), *args, page_size, offset
+            )
+        count = max(0, min(page_size, total - offset))
+        next_url, prev_url = _page_links(page, page_size, offset, count, total)
+        with phase("serialize"):
+            body = (
+                f'{{"results":{items},"count":{total},'
+                f'"next":{dumps(next_url)},"previous":{dumps(prev_url)}}}'
+            ).encode()
+        return Response(body, media_type="application/json")
 
-        rows = await conn.fetch(
-            f"""
-            SELECT id, username, role FROM accounts_user
-            WHERE {where_clause}
-            ORDER BY id
-            LIMIT ${idx} OFFSET ${idx + 1}
-            """,
-            *args,
+    async with acquire(pool) as conn:
+        total, rows = await _fetch_page(
+            conn, shape, args, page_size, offset, USERS_LIST_QUERY
         )
 
-    results = [
-        UserSchema(id=r["id"], username=r["username"], role=r["role"] or "CUSTOMER")
-        for r in rows
-    ]
-
-    next_url = (
-        f"?page={page + 1}&page_size={page_size}"
-        if (offset + len(results)) < total
-        else None
-    )
-    prev_url = f"?page={page - 1}&page_size={page_size}" if page > 1 else None
+    if (fmt, layout) != ("json", "rows"):
+        next_url, prev_url = _page_links(page, page_size, offset, len(rows), total)
+        return _negotiated(
+            {
+                "results": _items(rows, layout),
+                "count": total,
+                "next": next_url,
+                "previous": prev_url,
+            },
+            fmt,
+        )
 
+    with phase("hydrate"):
+        results = [
+            UserSchema(id=r["id"], username=r["username"], role=r["role"]) for r in rows
+        ]
+    next_url, prev_url = _page_links(page, page_size, offset, len(results), total)
     return UserListResponse(
         results=results,
         count=total,
@@ -76,19 +194,89 @@ async def list_users(
     )
 
 
+@router.get("/batch", response_model=UserBatchResponse)
+async def get_users_batch(
+    ids: str | None = Query(None),
+    layout: str | None = Query(None),
+    accept: str | None = Header(None),
+):
+    """Up to 100 users by ?ids=1,2,3 in one query, in request order (before /{user_id})."""
+    fmt, layout = _representation(accept, layout)
+    try:
+        id_list = parse_ids(ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    pool = await get_read_pool()
+    async with acquire(pool) as conn:
+        rows = await conn.fetch(
+            "SELECT id, username, role FROM accounts_user WHERE id = ANY($1::bigint[])",
+            id_list,
+        )
+    found, missing = in_request_order(id_list, rows, key=lambda r: r["id"])
+    if (fmt, layout) != ("json", "rows"):
+        return _negotiated({"items": _items(found, layout), "missing": missing}, fmt)
+    with phase("hydrate"):
+        items = [
+            UserSchema(id=r["id"], username=r["username"], role=r["role"])
+            for r in found
+        ]
+    return UserBatchResponse(items=items, missing=missing)
+
+
+@router.get("/export", dependencies=[Depends(require_staff)])
+async def export_users(
+    format: str | None = Query(None),
+    search: str | None = Query(None),
+    role: str | None = Query(None),
+    role_code: str | None = Query(None),
+):
+    """Stream all matching users as NDJSON or CSV (?format=csv) from a server-side cursor. Staff only."""
+    try:
+        fmt = parse_format(format)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    shape, args = _user_filters(search, role or role_code)
+    sql = (
+        "SELECT id, username, role FROM accounts_user "
+        f"WHERE {_where_clause(shape)} ORDER BY id"
+    )
+
+    async def body():
+        pool = await get_read_pool()
+        async with acquire(pool) as conn, conn.transaction():
+            rows = (
+                (r["id"], r["username"], r["role"])
+                async for r in conn.cursor(sql, *args, prefetch=CHUNK_ROWS)
+            )
+            async for chunk in stream_rows(rows, fmt):
+                yield chunk
+
+    return StreamingResponse(
+        body(), media_type=EXPORT_FORMATS[fmt], headers=export_headers(fmt)
+    )
+
+
 @router.get("/{user_id}", response_model=UserSchema)
-async def get_user(user_id: int):
-    """Get user by ID."""
-    pool = await get_pool()
-    async with pool.acquire() as conn:
+async def get_user(
+    user_id: int,
+    layout: str | None = Query(None),
+    accept: str | None = Header(None),
+):
+    """Get user by ID (?layout= is accepted but a single user has no columns)."""
+    fmt, _ = _representation(accept, layout)
+    pool = await get_read_pool()
+    async with acquire(pool) as conn:
         row = await conn.fetchrow(
             "SELECT id, username, role FROM accounts_user WHERE id = $1",
             user_id,
         )
     if row is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return UserSchema(
-        id=row["id"],
-        username=row["username"],
-        role=row["role"] or "CUSTOMER",
-    )
+    if fmt != "json":
+        return _negotiated(_items([row], "rows")[0], fmt)
+    with phase("hydrate"):
+        return UserSchema(
+            id=row["id"],
+            username=row["username"],
+            role=row["role"],
+        )
@@ -0,0 +1,50 @@
+"""TimedRoute: FastAPI's response validation and rendering as the Server-Timing "serialize" phase."""
+
+from __future__ import annotations
+
+import inspect
+from functools import wraps
+
+from fastapi.routing import APIRoute
+
+from common import timing
+
+
+def _marking(endpoint):
+    """Async endpoint wrapper calling timing.mark() when the endpoint returns."""
+
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        result = await endpoint(*args, **kwargs)
+        timing.mark()
+        return result
+
+    wrapper.marks_return = True
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute recording the time from the endpoint's return to the finished
+    Response (response_model validation, serialization, JSONResponse render)
+    as "serialize". The endpoint wrapper keeps the endpoint's signature
+    (functools.wraps), so parameters and OpenAPI are unchanged. Sync endpoints
+    are left alone (no "serialize" phase).
+    """
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint) and not getattr(
+            endpoint, "marks_return", False
+        ):
+            endpoint = _marking(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+
+        async def timed_handler(request):
+            response = await handler(request)
+            timing.since_mark("serialize")
+            return response
+
+        return timed_handler
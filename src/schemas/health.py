@@ -15,3 +15,4 @@ class HealthTestResponse(BaseModel):
 class ReadyResponse(BaseModel):
     status: str
     checks: dict[str, str]
+    monitor: dict[str, float | int] | None = None
@@ -14,3 +14,8 @@ class UserListResponse(BaseModel):
     count: int
     next: str | None = None
     previous: str | None = None
+
+
+class UserBatchResponse(BaseModel):
+    items: list[UserSchema]
+    missing: list[int]
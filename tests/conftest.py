@@ -118,3 +118,24 @@ def test_user(transactional_db):
         email="admin@test.local",
         role=Role.ADMIN,
     )
+
+
+@pytest.fixture
+def query_budget(settings):
+    """
+    query_budget(response, n): fail if the request behind a Bolt or DRF test
+    client response ran more than n SQL queries. Reads X-DB-Queries (every
+    query on any connection or thread, config.timing), turned on for the test.
+    """
+    from dataclasses import replace
+
+    settings.SERVER_TIMING = replace(settings.SERVER_TIMING, query_headers=True)
+
+    def check(response, n: int) -> int:
+        queries = int(response.headers["X-DB-Queries"])
+        assert queries <= n, (
+            f"{queries} SQL queries, budget {n} (DB time {response.headers['X-DB-Time']})"
+        )
+        return queries
+
+    return check
@@ -0,0 +1,139 @@
+"""Response compression: Accept-Encoding negotiation, codecs, DRF and FastAPI middleware."""
+
+import asyncio
+import gzip
+
+import pytest
+
+from common.compression import (
+    CompressionSettings,
+    compress,
+    compression_settings,
+    negotiate,
+)
+
+
+def test_negotiate_q_values_and_server_preference():
+    """Highest client q-value wins; ties go to the server's order; q=0 refuses."""
+    server = ("zstd", "br", "gzip")
+    assert negotiate("gzip, br", server) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", server) == "gzip"
+    assert negotiate("br;q=0, gzip", server) == "gzip"
+    assert negotiate("*", server) == "zstd"
+    assert negotiate("identity", server) is None
+    assert negotiate("", server) is None
+    assert negotiate("gzip", ()) is None
+
+
+def test_settings_from_env_and_content_types():
+    config = compression_settings(
+        {
+            "COMPRESSION_ENCODINGS": "br, gzip",
+            "COMPRESSION_MIN_SIZE": "1024",
+            "COMPRESSION_TYPES": "application/json,text/csv",
+            "COMPRESSION_GZIP_LEVEL": "1",
+        }
+    )
+    assert config.encodings == ("br", "gzip")
+    assert config.min_size == 1024
+    assert config.level("gzip") == 1
+    assert config.compressible("application/json")
+    assert config.compressible("text/csv; charset=utf-8")
+    assert not config.compressible("image/png")
+    assert not config.compressible(None)
+    assert compression_settings({"COMPRESSION_ENCODINGS": ""}).encodings == ()
+    with pytest.raises(ValueError):
+        compression_settings({"COMPRESSION_ENCODINGS": "deflate"})
+
+
+def test_gzip_round_trip():
+    body = b'{"items": []}' * 100
+    assert gzip.decompress(compress(body, "gzip", 6)) == body
+
+
+def _run_asgi(middleware, chunks, content_type="application/json", accept="gzip"):
+    """Send `chunks` as response bodies through `middleware`; return (headers, body)."""
+
+    async def app(scope, receive, send):
+        headers = [(b"content-type", content_type.encode())]
+        if len(chunks) == 1:
+            headers.append((b"content-length", str(len(chunks[0])).encode()))
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        for i, chunk in enumerate(chunks):
+            await send(
+                {
+                    "type": "http.response.body",
+                    "body": chunk,
+                    "more_body": i < len(chunks) - 1,
+                }
+            )
+
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "headers": [(b"accept-encoding", accept.encode())]}
+    asyncio.run(middleware(app)(scope, None, send))
+    headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    return headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def test_fastapi_middleware_compresses_large_and_streamed_bodies():
+    from src.middleware import CompressionMiddleware
+
+    def middleware(app):
+        return CompressionMiddleware(app, CompressionSettings(min_size=100))
+
+    body = b'{"id": 1, "username": "admin"}\n' * 50
+    headers, out = _run_asgi(middleware, [body])
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(out)
+    assert gzip.decompress(out) == body
+
+    headers, out = _run_asgi(middleware, [body, body, b""])
+    assert "content-length" not in headers
+    assert gzip.decompress(out) == body * 2
+
+
+def test_fastapi_middleware_skips_small_identity_and_other_types():
+    from src.middleware import CompressionMiddleware
+
+    def middleware(app):
+        return CompressionMiddleware(app, CompressionSettings(min_size=100))
+
+    headers, out = _run_asgi(middleware, [b"{}"])
+    assert "content-encoding" not in headers and out == b"{}"
+    big = b"x" * 1000
+    headers, out = _run_asgi(middleware, [big], accept="identity")
+    assert "content-encoding" not in headers and out == big
+    headers, out = _run_asgi(middleware, [big], content_type="image/png")
+    assert "content-encoding" not in headers and out == big
+
+
+def test_drf_middleware_compresses_and_weakens_etag(settings, rf):
+    """DRF responses are compressed per settings.COMPRESSION; strong ETags become weak."""
+    from django.http import HttpResponse
+
+    from api_drf.middleware import CompressionMiddleware
+
+    settings.COMPRESSION = CompressionSettings(min_size=100)
+    body = b'{"id": 1, "username": "admin", "role": "ADMIN"}' * 20
+
+    def view(request):
+        return HttpResponse(
+            body, content_type="application/json", headers={"ETag": '"v1"'}
+        )
+
+    response = CompressionMiddleware(view)(
+        rf.get("/drf/users/", HTTP_ACCEPT_ENCODING="gzip")
+    )
+    assert response["Content-Encoding"] == "gzip"
+    assert response["Vary"] == "Accept-Encoding"
+    assert response["ETag"] == 'W/"v1"'
+    assert gzip.decompress(response.content) == body
+
+    response = CompressionMiddleware(view)(rf.get("/drf/users/"))
+    assert not response.has_header("Content-Encoding")
+    assert response.content == body
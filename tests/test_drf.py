@@ -115,3 +115,66 @@ def test_drf_users_me_with_jwt(drf_client, test_user):
     assert data["id"] == test_user.id
     assert data["username"] == "admin"
     assert "role" in data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drf_users_batch(drf_client, test_user):
+    """GET /drf/users/batch/?ids= returns items in request order and missing ids."""
+    r = drf_client.get(f"/drf/users/batch/?ids={test_user.id + 1000},{test_user.id}")
+    assert r.status_code == 200
+    data = r.json()
+    assert [u["id"] for u in data["items"]] == [test_user.id]
+    assert data["missing"] == [test_user.id + 1000]
+    assert drf_client.get("/drf/users/batch/?ids=abc").status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drf_users_create_sets_role_and_rejects_duplicate(drf_client, test_user):
+    """POST /drf/users/ stores the role at insert time; a taken username is 400, not 500."""
+    test_user.is_staff = True
+    test_user.save(update_fields=["is_staff"])
+    login_r = drf_client.post(
+        "/drf/auth/login/",
+        {"username": "admin", "password": "admin"},
+        format="json",
+    )
+    drf_client.credentials(
+        HTTP_AUTHORIZATION=f"Bearer {login_r.json()['access_token']}"
+    )
+    body = {"username": "drf-new", "password": "pw", "role": "SHOPKEEPER"}
+    r = drf_client.post("/drf/users/", body, format="json")
+    assert r.status_code == 201
+    assert r.json()["role"] == "SHOPKEEPER"
+
+    r = drf_client.post("/drf/users/", body, format="json")
+    assert r.status_code == 400
+    assert "username" in r.json()
+
+    from django.contrib.auth import get_user_model
+
+    user = get_user_model().objects.get(username="drf-new")
+    assert user.role == "SHOPKEEPER"
+    assert user.check_password("pw")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drf_users_list_db_render_is_byte_identical(drf_client, test_user, settings):
+    """USERS_LIST_RENDER=db: same status and bytes as JSONRenderer, including 404 past the end."""
+    from django.contrib.auth import get_user_model
+
+    get_user_model().objects.create_user(username="drf-dbü", password="x")
+    paths = [
+        "/drf/users/",
+        "/drf/users/?page=2&page_size=1",
+        "/drf/users/?page=last&page_size=1",
+        "/drf/users/?role=customer",
+        "/drf/users/?page=99",
+    ]
+    settings.USERS_LIST_RENDER = "python"
+    expected = [drf_client.get(path) for path in paths]
+    settings.USERS_LIST_RENDER = "db"
+    for path, python in zip(paths, expected):
+        db = drf_client.get(path)
+        assert db.status_code == python.status_code, path
+        if python.status_code == 200:
+            assert db.content == python.content, path
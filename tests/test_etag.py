@@ -0,0 +1,130 @@
+"""Conditional GET on user reads: ETag / Last-Modified validators, 304 on Bolt and DRF."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from rest_framework.test import APIClient
+
+from common.etag import (
+    etag_matches,
+    http_date,
+    is_conditional,
+    not_modified,
+    users_etag,
+    wildcard_matches,
+)
+
+
+def test_etag_weak_comparison():
+    etag = users_etag(7)
+    assert etag == 'W/"users-7"'
+    assert etag_matches('W/"users-7"', etag)
+    assert etag_matches('"users-7"', etag)
+    assert etag_matches('"other", W/"users-7"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches("*", etag, wildcard=False)
+    assert not etag_matches('W/"users-6"', etag)
+    assert not etag_matches(None, etag)
+    # other representations (common.formats) get their own tag
+    assert users_etag(7, "msgpack") == 'W/"users-7-msgpack"'
+    assert not etag_matches(users_etag(7, "msgpack"), etag)
+
+
+def test_not_modified_prefers_if_none_match():
+    updated = datetime(2026, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    etag = users_etag(7)
+    since = http_date(updated)
+    assert since == "Thu, 01 Jan 2026 12:00:00 GMT"
+    assert not_modified(etag, updated, None, since)
+    assert not not_modified(etag, updated + timedelta(seconds=1), None, since)
+    # If-None-Match wins: a stale ETag is modified even when the date matches
+    assert not not_modified(etag, updated, 'W/"users-6"', since)
+    assert not not_modified(etag, updated, None, "not a date")
+    assert not not_modified(etag, updated, None, None)
+
+
+def test_is_conditional_skips_rejected_batches():
+    """Batch requests the handler answers with 400 get no counter lookup."""
+    assert is_conditional("/users")
+    assert is_conditional("/drf/users/7/")
+    assert is_conditional("/users/batch", "1,2")
+    assert not is_conditional("/users/batch")
+    assert not is_conditional("/drf/users/batch/", "1,x")
+    assert not is_conditional("/roles")
+
+
+def test_wildcard_only_for_collections():
+    """A wildcard If-None-Match gets an early 304 on the list and batch, not on one user."""
+    assert wildcard_matches("/users") and wildcard_matches("/drf/users/batch/")
+    assert not wildcard_matches("/users/7") and not wildcard_matches("/drf/users/7/")
+
+
+@pytest.mark.django_db
+def test_table_version_sums_slots():
+    """The counter's version is the sum of its slot rows; updated_at the latest."""
+    from asgiref.sync import async_to_sync
+
+    from accounts.models import TableVersion
+
+    aget = async_to_sync(TableVersion.aget)
+    assert aget("etag_test") is None
+    early = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    late = early + timedelta(hours=1)
+    TableVersion.objects.create(
+        table_name="etag_test", slot=0, version=5, updated_at=early
+    )
+    TableVersion.objects.create(
+        table_name="etag_test", slot=3, version=7, updated_at=late
+    )
+    assert aget("etag_test") == (12, late)
+
+
+def _create_user(username):
+    from django.contrib.auth import get_user_model
+
+    return get_user_model().objects.create_user(username=username, password="x")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bolt_user_get_304_until_write(client, test_user):
+    """GET /users/{id} carries an ETag; replaying it gets 304 until the table changes."""
+    r = client.get(f"/users/{test_user.id}")
+    assert r.status_code == 200
+    etag = r.headers["etag"]
+    assert etag.startswith('W/"users-')
+    assert "last-modified" in r.headers
+
+    r = client.get(f"/users/{test_user.id}", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.content == b""
+    assert r.headers["etag"] == etag
+
+    _create_user("etag-bolt")
+    r = client.get(f"/users/{test_user.id}", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert r.headers["etag"] != etag
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drf_users_list_304_until_write(test_user):
+    """GET /drf/users/ answers a matching If-None-Match with 304 until the table changes."""
+    drf_client = APIClient()
+    r = drf_client.get("/drf/users/")
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+
+    r = drf_client.get("/drf/users/", HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 304
+
+    _create_user("etag-drf")
+    r = drf_client.get("/drf/users/", HTTP_IF_NONE_MATCH=etag)
+    assert r.status_code == 200
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bolt_wildcard_if_none_match_on_missing_user_is_404(client, test_user):
+    """A wildcard If-None-Match on /users/{id} lets the handler answer: 404 when missing."""
+    star = {"If-None-Match": "*"}
+    assert client.get(f"/users/{test_user.id + 1000}", headers=star).status_code == 404
+    assert client.get(f"/users/{test_user.id}", headers=star).status_code == 200
+    assert client.get("/users", headers=star).status_code == 304
@@ -0,0 +1,88 @@
+"""Response formats for user reads: Accept negotiation, columnar layout, MessagePack on Bolt."""
+
+import msgspec
+import pytest
+
+from accounts.schemas import UserSchema
+from common.formats import (
+    columns,
+    encode,
+    negotiate_format,
+    parse_layout,
+    records,
+    request_variant,
+    variant,
+)
+
+
+def test_negotiate_format_prefers_json_on_ties():
+    """MessagePack only when ranked above JSON; exact types override wildcards."""
+    assert negotiate_format(None) == "json"
+    assert negotiate_format("*/*") == "json"
+    assert negotiate_format("application/msgpack") == "msgpack"
+    assert (
+        negotiate_format("application/x-msgpack, application/json;q=0.9") == "msgpack"
+    )
+    assert negotiate_format("application/json, application/msgpack") == "json"
+    assert negotiate_format("application/msgpack;q=0.5, application/json") == "json"
+    assert negotiate_format("application/msgpack;q=0, */*") == "json"
+    assert negotiate_format("application/vnd.msgpack, */*;q=0.1") == "msgpack"
+
+
+def test_layout_and_variant():
+    assert parse_layout(None) == "rows"
+    assert parse_layout(" Columnar ") == "columnar"
+    with pytest.raises(ValueError):
+        parse_layout("tree")
+    assert variant("json", "rows") == ""
+    assert variant("msgpack", "columnar") == "msgpack-columnar"
+    assert request_variant("application/msgpack", "tree") == "msgpack"
+    assert request_variant(None, "columnar") == "columnar"
+
+
+def test_columns_and_records_from_dicts_and_structs():
+    structs = [UserSchema(1, "a", "ADMIN"), UserSchema(2, "b", "CUSTOMER")]
+    # database rows may carry extra columns (the list's total)
+    dicts = [
+        {"id": 1, "username": "a", "role": "ADMIN", "total": 2},
+        {"id": 2, "username": "b", "role": "CUSTOMER", "total": 2},
+    ]
+    expected = {"id": [1, 2], "username": ["a", "b"], "role": ["ADMIN", "CUSTOMER"]}
+    assert columns(structs) == columns(dicts) == expected
+    assert columns([]) == {"id": [], "username": [], "role": []}
+    assert records(dicts) == [msgspec.structs.asdict(s) for s in structs]
+    assert msgspec.msgpack.decode(encode(expected, "msgpack")) == expected
+    assert encode(expected, "json") == msgspec.json.encode(expected)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bolt_users_msgpack_and_columnar(client, test_user):
+    """Same envelope in every format; ETags differ per representation."""
+    msgpack = {"Accept": "application/msgpack"}
+    json_page = client.get("/users?page_size=5")
+    r = client.get("/users?page_size=5", headers=msgpack)
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("application/msgpack")
+    assert msgspec.msgpack.decode(r.content) == json_page.json()
+    assert r.headers["etag"] != json_page.headers["etag"]
+
+    r = client.get("/users?page_size=5&layout=columnar")
+    data = r.json()
+    assert data["total"] == json_page.json()["total"]
+    assert data["items"] == columns(json_page.json()["items"])
+
+    missing_id = test_user.id + 1000
+    r = client.get(
+        f"/users/batch?ids={test_user.id},{missing_id}&layout=columnar", headers=msgpack
+    )
+    assert msgspec.msgpack.decode(r.content) == {
+        "items": {
+            "id": [test_user.id],
+            "username": ["admin"],
+            "role": [test_user.role],
+        },
+        "missing": [missing_id],
+    }
+    r = client.get(f"/users/{test_user.id}", headers=msgpack)
+    assert msgspec.msgpack.decode(r.content)["username"] == "admin"
+    assert client.get("/users?layout=tree").status_code == 400
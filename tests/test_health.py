@@ -31,3 +31,58 @@ def test_ready(client):
     assert "status" in data
     assert data["status"] in ("healthy", "unhealthy")
     assert "checks" in data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_ready_fresh(client):
+    """GET /ready?fresh=1 runs a live DB check and reports monitor details."""
+    r = client.get("/ready?fresh=1")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["checks"]["database"] == "ok"
+    assert data["monitor"]["consecutive_failures"] == 0
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_caches_and_counts_failures():
+    """Probe results are cached between reads; failures are counted consecutively."""
+    from common.health import HealthMonitor
+
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        if len(calls) > 1:
+            raise ConnectionError("db down")
+
+    monitor = HealthMonitor(probe, interval=60, failure_threshold=2)
+    state = await monitor.get()
+    assert state.healthy and len(calls) == 1
+    assert (await monitor.get()) is state
+    assert len(calls) == 1
+
+    state = await monitor.get(fresh=True)
+    assert state.healthy and state.consecutive_failures == 1
+    state = await monitor.get(fresh=True)
+    assert not state.healthy and state.consecutive_failures == 2
+    assert state.error == "db down"
+    await monitor.stop()
+
+
+@pytest.mark.asyncio
+async def test_health_monitor_single_flight():
+    """Concurrent live checks share one probe."""
+    import asyncio
+
+    from common.health import HealthMonitor
+
+    calls = []
+
+    async def probe():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+
+    monitor = HealthMonitor(probe, interval=60)
+    states = await asyncio.gather(*(monitor.check() for _ in range(10)))
+    assert len(calls) == 1
+    assert all(s is states[0] for s in states)
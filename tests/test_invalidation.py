@@ -0,0 +1,144 @@
+"""Cross-worker cache invalidation: NOTIFY payloads, eviction, LISTEN task, PostgreSQL triggers."""
+
+import asyncio
+
+import pytest
+
+from common.invalidation import (
+    InvalidationListener,
+    listen_address,
+    parse_payload,
+    user_paths,
+)
+from common.response_cache import CacheSettings, ResponseCache, cache_key
+
+PATHS = ("/users", "/users/batch", "/users/1", "/users/2", "/drf/users/2/", "/roles")
+
+
+def _fill(cache):
+    for path in PATHS:
+        key = cache_key(path, [], {}, ("accept",))
+        cache.get(key)
+        cache.put(key, 200, [], b"{}")
+    return cache
+
+
+def _cached_paths(cache):
+    return sorted(key[0] for key in cache.store.keys())
+
+
+def test_payload_and_user_paths():
+    assert parse_payload("3,1") == {1, 3}
+    assert parse_payload("*") is None and parse_payload("x") is None
+    match = user_paths(frozenset({2}))
+    assert [p for p in PATHS if match(p)] == [
+        "/users",
+        "/users/batch",
+        "/users/2",
+        "/drf/users/2/",
+    ]
+    assert not user_paths(None)("/roles") and user_paths(None)("/users/1")
+
+
+def test_listen_address_refuses_transaction_pooler():
+    """LISTEN goes to DB_LISTEN_HOST; behind a transaction pooler it is required."""
+    assert listen_address("db", 5432, "session", True, {}) == ("db", 5432)
+    direct = {"DB_LISTEN_HOST": "pg", "DB_LISTEN_PORT": "5433"}
+    assert listen_address("bouncer", 6432, "transaction", True, direct) == ("pg", 5433)
+    assert listen_address("bouncer", 6432, "transaction", False, {}) == (
+        "bouncer",
+        6432,
+    )
+    with pytest.raises(ValueError, match="DB_LISTEN_HOST"):
+        listen_address("bouncer", 6432, "transaction", True, {})
+
+
+def test_evict_drops_entries_and_pending_refreshes():
+    cache = _fill(ResponseCache(CacheSettings(ttl=60)))
+    pending = cache_key("/users", [("page", "2")], {}, ("accept",))
+    assert cache.get(pending)[0] is None
+    assert cache.evict(user_paths(frozenset({2}))) == 4
+    assert _cached_paths(cache) == ["/roles", "/users/1"]
+    # the page was read before the write: not stored
+    assert not cache.put(pending, 200, [], b"{}")
+    assert cache.stats()["invalidations"] == 4
+
+
+class FakeConnection:
+    """asyncpg.Connection surface used by InvalidationListener."""
+
+    def __init__(self):
+        self.listeners = {}
+        self.on_terminate = None
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate = callback
+
+    async def add_listener(self, channel, callback):
+        self.listeners[channel] = callback
+
+    async def execute(self, query):
+        return "SELECT 1"
+
+    async def close(self, timeout=None):
+        self.closed = True
+
+    def notify(self, channel, payload):
+        self.listeners[channel](self, 1, channel, payload)
+
+    def terminate(self):
+        self.on_terminate(self)
+
+
+async def test_listener_evicts_and_reconnects():
+    connections = []
+
+    async def connect():
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    cache = _fill(ResponseCache(CacheSettings(ttl=60)))
+    listener = InvalidationListener(connect, cache, retry=0.01, keepalive=0.05)
+    listener.ensure_started()
+    await asyncio.sleep(0.02)
+    assert listener.connected and cache.stats()["entries"] == 0  # cleared on connect
+
+    _fill(cache)
+    connections[0].notify("accounts_user_changed", "1")
+    assert _cached_paths(cache) == ["/drf/users/2/", "/roles", "/users/2"]
+
+    connections[0].terminate()
+    await asyncio.sleep(0.05)
+    assert len(connections) == 2 and connections[0].closed
+    assert listener.stats()["connects"] == 2 and cache.stats()["entries"] == 0
+    await listener.stop()
+    assert connections[1].closed and not listener.connected
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_user_writes_notify_listener():
+    """Triggers from migration accounts.0004 reach a LISTEN connection on commit."""
+    from asgiref.sync import sync_to_async
+
+    from accounts.models import User
+    from config.cache import listen_connection
+
+    cache = ResponseCache(CacheSettings(ttl=60))
+    listener = InvalidationListener(listen_connection, cache, retry=0.1)
+    listener.ensure_started()
+    for _ in range(50):
+        if listener.connected:
+            break
+        await asyncio.sleep(0.05)
+    _fill(cache)
+
+    await sync_to_async(User.objects.create)(username="notify_me")
+    for _ in range(50):
+        if listener.notifications:
+            break
+        await asyncio.sleep(0.05)
+    await listener.stop()
+    assert listener.notifications == 1
+    paths = _cached_paths(cache)
+    assert "/users" not in paths and "/users/batch" not in paths and "/roles" in paths
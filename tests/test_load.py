@@ -9,11 +9,40 @@ Then:
 """
 
 import os
+import random
 import subprocess
 import sys
 
+import msgspec
 import pytest
 
+from scripts.load_test import (
+    BroadcastStats,
+    CompressionPoint,
+    CreateStats,
+    LoadResult,
+    LoadStats,
+    SweepPoint,
+    broadcast_frame,
+    broadcast_latency_ms,
+    cache_summary,
+    compression_savings,
+    create_paths,
+    create_username,
+    decode_us,
+    format_endpoint,
+    geometric_levels,
+    is_saturated,
+    latency_histogram,
+    max_sustainable,
+    parse_server_timing,
+    timing_breakdown,
+    users_paths,
+    write_sweep_csv,
+    ws_frame,
+    ws_url,
+)
+
 
 @pytest.mark.integration
 def test_load_test_bolt():
@@ -60,3 +89,173 @@ def test_load_test_drf():
     )
     out = result.stdout
     assert "Total requests:" in out and "Requests/sec:" in out
+
+
+def _point(endpoint, level, rps, saturated):
+    return SweepPoint(
+        endpoint=endpoint,
+        mode="concurrency",
+        level=level,
+        total=100,
+        rps=rps,
+        p50_ms=1.0,
+        p95_ms=2.0,
+        p99_ms=3.0,
+        error_rate=0.0,
+        saturated=saturated,
+    )
+
+
+def test_geometric_levels():
+    """Sweep levels grow by factor and always end at the maximum."""
+    assert geometric_levels(1, 16, 2) == [1, 2, 4, 8, 16]
+    assert geometric_levels(10, 50, 2) == [10, 20, 40, 50]
+    assert geometric_levels(1, 3, 1.2) == [1, 2, 3]
+    with pytest.raises(ValueError):
+        geometric_levels(1, 10, 1.0)
+
+
+def test_is_saturated():
+    """A step is saturated when p99 breaks the SLO or errors exceed the threshold."""
+    assert not is_saturated(40.0, 0.0, slo_p99_ms=50, max_error_rate=1.0)
+    assert is_saturated(60.0, 0.0, slo_p99_ms=50, max_error_rate=1.0)
+    assert is_saturated(10.0, 2.5, slo_p99_ms=50, max_error_rate=1.0)
+
+
+def test_max_sustainable_ignores_saturated_steps():
+    """Max sustainable throughput is the best non-saturated step per endpoint."""
+    points = [
+        _point("/health", 1, 1000.0, False),
+        _point("/health", 2, 1800.0, False),
+        _point("/health", 4, 2500.0, True),
+        _point("/users", 1, 300.0, True),
+    ]
+    best = max_sustainable(points)
+    assert best["/health"].level == 2
+    assert best["/users"] is None
+
+
+def test_write_sweep_csv_appends_labelled_runs(tmp_path):
+    """Runs with different --label values share one CSV (header written once)."""
+    path = str(tmp_path / "pooling.csv")
+    write_sweep_csv(path, [_point("/users", 1, 900.0, False)], "bolt", "direct")
+    write_sweep_csv(path, [_point("/users", 1, 700.0, False)], "bolt", "transaction")
+    lines = (tmp_path / "pooling.csv").read_text().splitlines()
+    assert lines[0].startswith("api,label,")
+    assert [line.split(",")[1] for line in lines[1:]] == ["direct", "transaction"]
+
+
+def test_ws_url():
+    """HTTP base URLs map to ws:// / wss:// URLs."""
+    assert ws_url("http://localhost:8000/", "/ws") == "ws://localhost:8000/ws"
+    assert ws_url("https://api.example.com", "/ws") == "wss://api.example.com/ws"
+
+
+def test_ws_frame_expected_echo():
+    """Mixed payload alternates text and JSON frames with the matching echo."""
+    text, expected_text = ws_frame(0, "mixed")
+    assert expected_text == f"Echo: {text}"
+    body, expected_json = ws_frame(1, "mixed")
+    assert expected_json == '{"echo":' + body + "}"
+
+
+def test_ws_frame_batch_and_binary():
+    """Batched frames join messages with newlines; binary frames are bytes."""
+    frame, expected = ws_frame(0, "text", batch=3)
+    assert frame.count("\n") == 2 and expected.count("\n") == 2
+    frame, expected = ws_frame(0, "binary")
+    assert isinstance(frame, bytes) and expected == b'{"echo":' + frame + b"}"
+
+
+def test_latency_histogram_buckets():
+    """Each value lands in the first bucket whose upper bound it does not exceed."""
+    counts = dict(latency_histogram([0.05, 0.3, 3.0, 5000.0]))
+    assert counts["<=0.1ms"] == 1
+    assert counts["<=0.5ms"] == 1
+    assert counts["<=5ms"] == 1
+    assert counts[">1000ms"] == 1
+
+
+def test_broadcast_latency_from_frame():
+    """Delivery latency is read back from the timestamp in the published frame."""
+    frame = broadcast_frame(7)
+    assert frame.startswith("7 ")
+    sent_ns = int(frame.split()[1])
+    assert broadcast_latency_ms(frame.encode(), sent_ns + 2_500_000) == 2.5
+
+
+def test_broadcast_delivery_ratio():
+    stats = BroadcastStats(subscribers=10, connected=8, published=5, delivered=36)
+    assert stats.delivery_ratio == 90.0
+    assert BroadcastStats(subscribers=1).delivery_ratio == 0.0
+
+
+def test_users_paths():
+    assert users_paths("bolt") == ("/users/{id}", "/users/batch")
+    assert users_paths("drf") == ("/drf/users/{id}/", "/drf/users/batch/")
+
+
+def test_create_stats_and_usernames():
+    """users-create: 201 created, 400 conflict, other statuses (5xx) are errors."""
+    stats = CreateStats()
+    for status in (201, 400, 400, 500, None):
+        stats.record(status, 1.0, None if status != 500 else "HTTP 500")
+    assert (stats.created, stats.conflicts, stats.errors) == (1, 2, 2)
+    assert stats.server_errors == 1 and stats.total == 5
+    rng = random.Random(0)
+    assert create_username("r", 7, rng, 0.0, 8) == "lt-r-7"
+    assert create_username("r", 7, rng, 1.0, 8).startswith("lt-r-hot-")
+    assert create_paths("drf") == ("/drf/auth/login/", "/drf/users/")
+
+
+def test_compression_savings_against_identity():
+    """Bytes saved % and extra server CPU per KB saved, relative to identity."""
+    identity = CompressionPoint("identity", 100, 100.0, 1.0, 2.0, 10240, 0.5)
+    gzip = CompressionPoint("gzip", 100, 90.0, 1.2, 2.5, 2048, 0.9)
+    saved_pct, cpu_us_per_kb = compression_savings(identity, gzip)
+    assert saved_pct == 80.0
+    assert cpu_us_per_kb == pytest.approx(50.0)
+    no_cpu = CompressionPoint("br", 100, 90.0, 1.2, 2.5, 1024, None)
+    assert compression_savings(identity, no_cpu) == (90.0, None)
+
+
+def test_format_endpoint_and_decode():
+    """--formats: ?layout= appended to the endpoint; decode time from the media type."""
+    assert format_endpoint("/users", "rows") == "/users"
+    assert format_endpoint("/users", "columnar") == "/users?layout=columnar"
+    assert format_endpoint("/users?page_size=100", "columnar") == (
+        "/users?page_size=100&layout=columnar"
+    )
+    body = msgspec.msgpack.encode({"id": [1, 2]})
+    assert decode_us(body, "application/msgpack", repeat=3) > 0
+    assert decode_us(b'{"id":[1,2]}', "application/json", repeat=3) > 0
+
+
+def test_cache_summary_from_x_cache():
+    """X-Cache states are counted; HIT and STALE bytes count as served from cache."""
+    stats, latencies = LoadStats(), []
+    for cache in ("MISS", "HIT", "HIT", "STALE", None):
+        stats.record(
+            LoadResult(True, 200, 1.0, wire_bytes=1024, cache=cache), latencies
+        )
+    assert stats.cache == {"MISS": 1, "HIT": 2, "STALE": 1}
+    assert cache_summary(stats) == "75.0% hits (HIT=2 MISS=1 STALE=1), 3 KB from cache"
+
+
+def test_server_timing_breakdown_per_endpoint():
+    header = 'db;dur=3.0, hydrate;dur=0.5;desc="ORM", cache;desc=miss, app;dur=1.5, total;dur=5'
+    assert parse_server_timing(header) == {
+        "db": 3.0,
+        "hydrate": 0.5,
+        "app": 1.5,
+        "total": 5.0,
+    }
+    assert parse_server_timing(None) == {}
+    stats = LoadStats()
+    for timing in (parse_server_timing(header), {"db": 1.0, "app": 1.0, "total": 2.0}):
+        stats.record(LoadResult(True, 200, 1.0, endpoint="/users/1", timing=timing), [])
+    stats.record(LoadResult(True, 200, 1.0, endpoint="/roles"), [])
+    (rows,) = timing_breakdown(stats).values()
+    assert [r[0] for r in rows] == ["db", "hydrate", "app", "total"]
+    assert rows[0][1:] == (1.0, 1.0, 4.0 / 7)
+    assert rows[-1][3] == 1.0
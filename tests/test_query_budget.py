@@ -0,0 +1,78 @@
+"""SQL query budget per endpoint (query_budget fixture): Bolt and DRF reads, login and /users/me."""
+
+import pytest
+
+# (path, budget); {id} is test_user. Users reads: the users table version
+# (conditional GET), then count + page or the one SELECT.
+READS = [
+    ("/roles", 0),
+    ("/roles/code/ADMIN", 0),
+    ("/health/test", 0),
+    ("/users?page_size=10", 3),
+    ("/users?search=adm&page_size=10", 3),
+    ("/users/{id}", 2),
+    ("/users/batch?ids={id},999999", 2),
+]
+DRF_READS = [
+    ("/drf/roles/", 0),
+    ("/drf/users/?page_size=10", 3),
+    ("/drf/users/{id}/", 2),
+    ("/drf/users/batch/?ids={id},999999", 2),
+]
+
+
+@pytest.fixture
+def drf_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(("path", "budget"), READS)
+def test_bolt_read_budget(client, test_user, query_budget, path, budget):
+    response = client.get(path.format(id=test_user.id))
+    assert response.status_code == 200
+    query_budget(response, budget)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(("path", "budget"), DRF_READS)
+def test_drf_read_budget(drf_client, test_user, query_budget, path, budget):
+    response = drf_client.get(path.format(id=test_user.id))
+    assert response.status_code == 200
+    query_budget(response, budget)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bolt_login_and_me_budget(client, test_user, query_budget):
+    login = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    query_budget(login, 1)
+    token = login.json()["access_token"]
+    me = client.get("/users/me", headers={"Authorization": f"Bearer {token}"})
+    assert me.status_code == 200
+    query_budget(me, 2)  # JWT user, then the user row
+
+
+@pytest.mark.django_db(transaction=True)
+def test_drf_login_and_me_budget(drf_client, test_user, query_budget):
+    login = drf_client.post(
+        "/drf/auth/login/", {"username": "admin", "password": "admin"}, format="json"
+    )
+    query_budget(login, 1)
+    drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {login.json()['access_token']}")
+    me = drf_client.get("/drf/users/me/")
+    assert me.status_code == 200
+    query_budget(me, 1)  # BoltJWTAuthentication loads the user
+
+
+@pytest.mark.django_db(transaction=True)
+def test_db_stats_counts_queries_per_endpoint(client, test_user):
+    from config.timing import query_metrics
+
+    query_metrics.clear()
+    for _ in range(2):
+        client.get(f"/users/{test_user.id}")
+    row = client.get("/db/stats").json()["endpoints"]["GET /users/{id}"]
+    assert row["requests"] == 2 and row["max_queries"] >= 1
+    assert row["queries"] == 2 * row["queries_per_request"]
@@ -0,0 +1,55 @@
+"""Read-replica selection: lag fallback, stickiness, Django routing defaults."""
+
+import asyncio
+
+import pytest
+
+from common.replicas import ReplicaSet
+
+
+def _replica_set(lags: dict[str, float], **kwargs) -> ReplicaSet:
+    async def lag_query(name):
+        return lags[name]
+
+    return ReplicaSet(list(lags), lag_query, max_lag=5.0, check_interval=60, **kwargs)
+
+
+async def _checked(replicas: ReplicaSet) -> ReplicaSet:
+    for monitor in replicas.monitors.values():
+        await monitor.check()
+    return replicas
+
+
+@pytest.mark.asyncio
+async def test_replica_pick_skips_lagging_replicas():
+    """Replicas behind max_lag are skipped; none healthy means the primary (None)."""
+    replicas = await _checked(_replica_set({"r1": 0.2, "r2": 30.0}))
+    assert {replicas.pick() for _ in range(4)} == {"r1"}
+    assert replicas.lag["r2"] == 30.0
+
+    lagging = await _checked(_replica_set({"r1": 10.0}))
+    assert lagging.pick() is None
+    await replicas.stop()
+    await lagging.stop()
+
+
+@pytest.mark.asyncio
+async def test_replica_pick_unchecked_and_sticky():
+    """Unknown lag and recent writes both read from the primary."""
+    replicas = _replica_set({"r1": 0.0}, sticky_seconds=60)
+    assert replicas.pick() is None  # starts the monitors, no state yet
+    await asyncio.sleep(0.01)
+    assert replicas.pick() == "r1"
+    assert replicas.pick(sticky=True) is None
+    replicas.mark_write()
+    assert replicas.pick() is None
+    await replicas.stop()
+
+
+def test_read_alias_without_replicas():
+    """With no DB_REPLICAS configured every read uses the primary and writes set no cookie."""
+    from config.db_router import mark_write, read_alias
+
+    assert read_alias() == "default"
+    assert read_alias({"db_primary": "1"}) == "default"
+    assert mark_write() is None
@@ -0,0 +1,186 @@
+"""Response micro-cache: TTL, stale-while-revalidate, LRU byte budget, bypass; FastAPI and Bolt middleware."""
+
+import asyncio
+
+import pytest
+
+from common.response_cache import (
+    CACHEABLE_PATHS,
+    HIT,
+    MISS,
+    STALE,
+    CacheSettings,
+    ResponseCache,
+    cache_key,
+    cache_settings,
+    is_private,
+    storable,
+)
+
+JSON = [("content-type", "application/json"), ("etag", 'W/"users-1"')]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_settings_paths_and_keys():
+    config = cache_settings(
+        {"RESPONSE_CACHE_TTL": "0.5", "RESPONSE_CACHE_VARY": "Accept, Accept-Encoding"}
+    )
+    assert config.enabled and config.vary == ("accept", "accept-encoding")
+    assert not cache_settings({}).enabled
+    with pytest.raises(ValueError):
+        CacheSettings(ttl=-1)
+    assert cache_settings({"RESPONSE_CACHE_BACKEND": "Shared"}).backend == "shared"
+    with pytest.raises(ValueError):
+        cache_settings({"RESPONSE_CACHE_BACKEND": "redis"})
+    for path in (
+        "/users",
+        "/users/7",
+        "/users/batch",
+        "/roles",
+        "/roles/code/ADMIN",
+        "/health/test",
+        "/drf/users/",
+    ):
+        assert CACHEABLE_PATHS.match(path), path
+    for path in ("/users/me", "/users/export", "/ready", "/drf/auth/login/"):
+        assert not CACHEABLE_PATHS.match(path), path
+    headers = {"accept": "Application/JSON "}
+    assert cache_key(
+        "/users", [("b", "2"), ("a", "1")], headers, ("accept",)
+    ) == cache_key(
+        "/users", [("a", "1"), ("b", "2")], {"accept": "application/json"}, ("accept",)
+    )
+    assert cache_key("/users", [], {}, ("accept",)) != cache_key(
+        "/users", [], headers, ("accept",)
+    )
+
+
+def test_private_requests_and_storable_responses():
+    config = CacheSettings(ttl=1)
+    assert is_private({"authorization": "Bearer x"}, None, config)
+    assert is_private({}, {"db_primary": "1"}, config)
+    assert not is_private({}, {"theme": "dark"}, config)
+    assert storable(200, JSON)
+    assert not storable(404, JSON)
+    assert not storable(200, [*JSON, ("Set-Cookie", "a=1")])
+    assert not storable(200, [*JSON, ("Cache-Control", "Private")])
+
+
+def test_ttl_and_single_flight_stale_while_revalidate():
+    clock = Clock()
+    cache = ResponseCache(CacheSettings(ttl=1, stale=2), clock=clock)
+    assert cache.get("k") == (None, MISS)
+    assert cache.put("k", 200, JSON, b"{}")
+    assert cache.get("k")[1] == HIT
+
+    clock.now += 1.5
+    # first request after expiry refreshes; concurrent ones get the stale copy
+    assert cache.get("k") == (None, MISS)
+    entry, state = cache.get("k")
+    assert state == STALE and entry.body == b"{}"
+    cache.release("k")  # refresh failed: the next request tries again
+    assert cache.get("k") == (None, MISS)
+    cache.put("k", 200, JSON, b"[]")
+    assert cache.get("k")[0].body == b"[]"
+
+    clock.now += 10
+    assert cache.get("k") == (None, MISS)
+    stats = cache.stats()
+    assert (stats["hits"], stats["stale_hits"], stats["misses"]) == (2, 1, 4)
+    assert stats["entries"] == 0 and stats["bytes_served"] == 6
+
+
+def test_lru_byte_budget_and_not_modified():
+    entry_size = len(b"x" * 100) + sum(len(k) + len(v) for k, v in JSON)
+    cache = ResponseCache(
+        CacheSettings(ttl=60, max_bytes=entry_size * 2, max_entry_bytes=500)
+    )
+    for key in ("a", "b"):
+        cache.get(key)
+        cache.put(key, 200, JSON, b"x" * 100)
+    cache.get("a")  # a is now most recently used
+    cache.get("c")
+    cache.put("c", 200, JSON, b"x" * 100)
+    assert cache.get("b")[1] == MISS
+    assert cache.get("a")[1] == HIT
+    assert not cache.put("big", 200, JSON, b"x" * 1000)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["bytes"] <= entry_size * 2
+
+    entry = cache.get("a")[0]
+    assert entry.not_modified('W/"users-1"') and not entry.not_modified('W/"users-2"')
+    assert entry.validators() == [("etag", 'W/"users-1"')]
+
+
+def _asgi_get(middleware, path="/roles", headers=()):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(k.encode(), v.encode()) for k, v in headers],
+    }
+    asyncio.run(middleware(scope, None, send))
+    response_headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    return sent[0]["status"], response_headers, sent[1]["body"]
+
+
+def test_fastapi_middleware_hit_bypass_and_304():
+    from src.middleware import ResponseCacheMiddleware
+
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"etag", b'W/"users-1"')],
+            }
+        )
+        await send({"type": "http.response.body", "body": b'{"ok":true}'})
+
+    middleware = ResponseCacheMiddleware(app, ResponseCache(CacheSettings(ttl=60)))
+    assert _asgi_get(middleware)[1]["x-cache"] == "MISS"
+    status, headers, body = _asgi_get(middleware)
+    assert (status, headers["x-cache"], body) == (200, "HIT", b'{"ok":true}')
+    assert (
+        _asgi_get(middleware, headers=[("authorization", "Bearer x")])[1]["x-cache"]
+        == "BYPASS"
+    )
+    status, headers, body = _asgi_get(
+        middleware, headers=[("if-none-match", 'W/"users-1"')]
+    )
+    assert (status, body) == (304, b"")
+    assert "x-cache" not in _asgi_get(middleware, path="/ready")[1]
+    assert calls == ["/roles", "/roles", "/ready"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_bolt_roles_served_from_cache(client, monkeypatch):
+    from config.cache import response_cache
+
+    # listen=False: the LISTEN task clears the cache when it connects
+    monkeypatch.setattr(response_cache, "config", CacheSettings(ttl=60, listen=False))
+    response_cache.clear()
+    first, second = client.get("/roles"), client.get("/roles")
+    assert (first.headers["x-cache"], second.headers["x-cache"]) == ("MISS", "HIT")
+    assert second.content == first.content
+    assert (
+        client.get("/roles", headers={"Authorization": "Bearer x"}).headers["x-cache"]
+        == "BYPASS"
+    )
+    assert client.get("/cache/stats").json()["hits"] >= 1
@@ -27,8 +27,8 @@ def test_user_schema_from_user():
 
 @pytest.mark.django_db
 def test_user_schema_from_user_default_role():
-    """UserSchema.from_user uses CUSTOMER when role is empty."""
-    user = User(id=2, username="norole", role=None)
+    """A user created without a role gets CUSTOMER from the model default (role is NOT NULL)."""
+    user = User(id=2, username="norole")
     schema = UserSchema.from_user(user)
     assert schema.role == Role.CUSTOMER
 
@@ -0,0 +1,102 @@
+"""Shared-memory cache: slots, expiry, clock eviction, seqlock reads, other processes, ResponseCache backend."""
+
+import multiprocessing
+import time
+import zlib
+
+import pytest
+
+from common.response_cache import (
+    HIT,
+    MISS,
+    CacheSettings,
+    ResponseCache,
+    SharedStore,
+    cache_key,
+)
+from common.shm_cache import WAYS, SharedTable
+
+
+@pytest.fixture
+def table(tmp_path):
+    t = SharedTable("test", slots=WAYS, slot_bytes=256, directory=str(tmp_path))
+    yield t
+    t.close()
+
+
+def test_set_get_expiry_and_size_limit(table):
+    later = time.time() + 60
+    assert table.get(b"a") is None
+    assert table.set(b"a", b"1", later)
+    assert table.set(b"a", b"22", later)  # same slot, replaced
+    assert table.get(b"a") == (b"22", later)
+    assert not table.set(b"big", b"x" * 256, later)
+    assert table.usage() == (1, 3)
+    table.set(b"old", b"x", time.time() - 1)
+    assert table.keys() == [b"a"]
+    assert table.delete(b"a") and table.get(b"a") is None
+
+
+def test_clock_keeps_recently_read_entries(table):
+    later = time.time() + 60
+    for i in range(WAYS):
+        table.set(b"k%d" % i, b"v", later)
+    table.get(b"k0")
+    table.set(b"new", b"v", later)
+    assert table.get(b"k0") is not None and table.get(b"k1") is None
+    assert table.evictions == 1
+    assert table.delete_where(lambda key: key.startswith(b"k")) == WAYS - 1
+    assert table.keys() == [b"new"]
+
+
+def test_torn_read_is_a_miss(table):
+    table.set(b"a", b"1", time.time() + 60)
+    offset = table._find(b"a", *_hash_bucket(table, b"a"))[0]
+    table._buf[offset] += 1  # writer in progress: odd sequence number
+    assert table.get(b"a") is None
+    table._buf[offset] += 1
+    assert table.get(b"a") is not None
+
+
+def _hash_bucket(table, key):
+    key_hash = zlib.crc32(key)
+    return key_hash, key_hash % table.buckets
+
+
+def _write_from_child(directory):
+    table = SharedTable("test", slots=WAYS, slot_bytes=256, directory=directory)
+    table.set(b"child", b"hello", time.time() + 60)
+    table.close()
+
+
+def test_entries_are_shared_between_processes(table, tmp_path):
+    process = multiprocessing.get_context("spawn").Process(
+        target=_write_from_child, args=(str(tmp_path),)
+    )
+    process.start()
+    process.join(30)
+    assert process.exitcode == 0
+    assert table.get(b"child")[0] == b"hello"
+
+
+def test_response_cache_on_shared_store(tmp_path):
+    config = CacheSettings(ttl=60, backend="shared")
+    tables = [
+        SharedTable("rc", slots=64, slot_bytes=1024, directory=str(tmp_path))
+        for _ in range(2)
+    ]
+    worker_a, worker_b = (
+        ResponseCache(config, clock=time.time, store=SharedStore(t)) for t in tables
+    )
+    key = cache_key("/users", [("page", "1")], {}, ("accept",))
+    headers = [("content-type", "application/json"), ("etag", 'W/"users-1"')]
+    assert worker_a.get(key) == (None, MISS)
+    assert worker_a.put(key, 200, headers, b'{"items":[]}')
+    entry, state = worker_b.get(key)  # warmed by the other worker
+    assert state == HIT and entry.body == b'{"items":[]}'
+    assert entry.headers == headers and entry.etag == 'W/"users-1"'
+    assert worker_b.store.keys() == [key]
+    assert worker_b.evict(lambda path: path == "/users") == 1
+    assert worker_a.get(key) == (None, MISS)
+    for t in tables:
+        t.close()
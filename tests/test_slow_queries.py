@@ -0,0 +1,173 @@
+"""Slow-query log: threshold, sampling, ring buffer, background EXPLAIN (thread and asyncio); Django plans, staff-only endpoints."""
+
+import asyncio
+import threading
+
+import pytest
+
+from common.slow_queries import (
+    DONE,
+    DROPPED,
+    FAILED,
+    NOT_EXPLAINABLE,
+    NOT_SAMPLED,
+    PENDING,
+    AsyncExplainer,
+    SlowQueryLog,
+    SlowQuerySettings,
+    ThreadExplainer,
+    explainable,
+    params_shape,
+    slow_query_settings,
+)
+
+SQL = "SELECT id FROM accounts_user WHERE username LIKE %s LIMIT %s"
+
+
+@pytest.fixture
+def drf_client():
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+def _log(sample=0.0, size=3, random=lambda: 0.5):
+    return SlowQueryLog(
+        SlowQuerySettings(threshold_ms=10, explain_sample=sample, size=size), random
+    )
+
+
+def test_settings_from_env():
+    assert not slow_query_settings({}).enabled
+    config = slow_query_settings(
+        {
+            "SLOW_QUERY_MS": "50",
+            "SLOW_QUERY_EXPLAIN_SAMPLE": "1",
+            "SLOW_QUERY_LOG_SIZE": "10",
+        }
+    )
+    assert config == SlowQuerySettings(threshold_ms=50, explain_sample=1, size=10)
+    with pytest.raises(ValueError):
+        SlowQuerySettings(explain_sample=2)
+
+
+def test_params_shape_and_explainable():
+    assert params_shape(("%adm%", 10, None, [1, 2])) == [
+        "str[5]",
+        "int",
+        "null",
+        "list[2]",
+    ]
+    assert params_shape({"name": "x"}) == {"name": "str[1]"}
+    assert params_shape(None) is None
+    assert explainable(" select 1;") and explainable(SQL)
+    assert not explainable("UPDATE accounts_user SET role = %s")
+    assert not explainable("SELECT 1; DELETE FROM accounts_user")
+
+
+def test_threshold_sampling_and_ring_buffer():
+    log = _log(sample=0.5, random=iter([0.1, 0.9, 0.9]).__next__)
+    assert log.record(SQL, ("%a%", 10), 0.005, "default") is None  # fast
+    assert log.record("EXPLAIN " + SQL, (), 1.0, "default") is None
+    assert log.record(SQL, ("%a%", 10), 0.02, "default").explain == PENDING
+    assert log.record(SQL, ("%b%", 10), 0.03, "default").explain == NOT_SAMPLED
+    assert (
+        log.record(
+            "INSERT INTO t VALUES (%s)", [(1,)], 0.05, "default", many=True
+        ).explain
+        == NOT_EXPLAINABLE
+    )
+    log.record(SQL, ("%c%", 10), 0.04, "replica_0")
+    snapshot = log.snapshot()
+    assert snapshot["recorded"] == 4
+    assert [e["id"] for e in snapshot["entries"]] == [4, 3, 2]  # newest first, size 3
+    newest = snapshot["entries"][0]
+    assert newest["database"] == "replica_0" and newest["duration_ms"] == 40.0
+    assert newest["params"] == ["str[3]", "int"] and "%c%" not in str(newest)
+    assert not SlowQueryLog(SlowQuerySettings()).record(SQL, (), 10.0, "default")
+
+
+def test_thread_explainer_plans_failures_and_drops():
+    log = _log(sample=1.0)
+    started, release = threading.Event(), threading.Event()
+
+    def explain(database, sql, params):
+        started.set()
+        release.wait(5)
+        if params[0] == "boom":
+            raise RuntimeError("canceled")
+        return [f"Seq Scan on {database}"]
+
+    explainer = ThreadExplainer(log, explain, max_pending=1)
+    first, second, third = (
+        log.record(SQL, (p, 1), 0.02, "default") for p in ("a", "boom", "c")
+    )
+    explainer.submit(first, SQL, ("a", 1))
+    assert started.wait(5)  # first is running, the queue is empty
+    explainer.submit(second, SQL, ("boom", 1))
+    explainer.submit(third, SQL, ("c", 1))  # queue full
+    release.set()
+    explainer.join()
+    assert first.explain == DONE and first.plan == ["Seq Scan on default"]
+    assert second.explain == FAILED and second.error == "RuntimeError: canceled"
+    assert third.explain == DROPPED
+    assert (log.explained, log.failed, log.dropped) == (1, 1, 1)
+
+
+def test_async_explainer():
+    log = _log(sample=1.0)
+
+    async def explain(database, sql, params):
+        await asyncio.sleep(0)
+        return [f"Index Scan ({params[0]})"]
+
+    async def run():
+        explainer = AsyncExplainer(log, explain)
+        entry = log.record(SQL, ("a", 1), 0.02, "primary")
+        explainer.submit(entry, SQL, ("a", 1))
+        await explainer.join()
+        await explainer.stop()
+        return entry
+
+    entry = asyncio.run(run())
+    assert entry.explain == DONE and entry.plan == ["Index Scan (a)"]
+    assert log.snapshot()["explained"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_django_explain_runs_analyze(test_user):
+    from config.slow_queries import explain
+
+    plan = explain(
+        "default",
+        'SELECT "id" FROM "accounts_user" WHERE "username" = %s',
+        ["admin"],
+    )
+    assert any("actual time" in line for line in plan)
+    assert any(line.startswith("Execution Time") for line in plan)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_slow_queries_endpoints_are_staff_only(
+    client, drf_client, test_user, monkeypatch
+):
+    from config.slow_queries import slow_queries
+
+    monkeypatch.setattr(slow_queries, "threshold", 0.001)  # SLOW_QUERY_MS is 0 in tests
+
+    assert client.get("/db/slow-queries").status_code == 401
+    assert drf_client.get("/drf/db/slow-queries/").status_code in (401, 403)
+    login = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    assert client.get("/db/slow-queries", headers=headers).status_code == 403
+
+    test_user.is_staff = True
+    test_user.save(update_fields=["is_staff"])
+    login = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    token = login.json()["access_token"]
+    slow_queries.record(SQL, ("%adm%", 10), 10.0, "default")
+    r = client.get("/db/slow-queries", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 200
+    assert r.json()["entries"][0]["params"] == ["str[5]", "int"]
+    drf_client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+    assert drf_client.get("/drf/db/slow-queries/").status_code == 200
@@ -0,0 +1,164 @@
+"""Server-Timing: phase accounting, header format, context propagation, query counts and metrics; FastAPI and Bolt headers."""
+
+import asyncio
+import time
+
+import pytest
+
+from common import timing
+
+
+def _phases(header: str) -> dict[str, float]:
+    return {
+        name: float(dur.removeprefix("dur="))
+        for name, dur in (part.split(";") for part in header.split(", "))
+    }
+
+
+def test_nested_phases_are_exclusive_and_app_is_the_rest():
+    timings, token = timing.start()
+    try:
+        with timing.phase("hydrate"):
+            with timing.phase("db"):
+                time.sleep(0.02)
+            time.sleep(0.01)
+        with timing.phase("db"):
+            time.sleep(0.01)
+    finally:
+        timing.finish(token)
+    assert timing.current() is None
+    d = timings.durations
+    assert 0.03 <= d["db"] < 0.045 and 0.01 <= d["hydrate"] < 0.02
+    phases = _phases(timings.header(0.1))
+    assert list(phases) == ["db", "hydrate", "app", "total"]
+    assert phases["total"] == 100.0
+    assert phases["app"] == pytest.approx(
+        100 - phases["db"] - phases["hydrate"], abs=0.02
+    )
+
+
+def test_inactive_outside_a_request():
+    assert timing.phase("db") is timing.phase("auth")  # shared no-op
+    with timing.phase("db"):
+        pass
+    timing.mark()
+    timing.since_mark("serialize")
+
+
+def test_mark_and_since_mark():
+    timings, token = timing.start()
+    try:
+        timing.since_mark("serialize")  # no mark: nothing
+        timing.mark()
+        time.sleep(0.01)
+        timing.since_mark("serialize")
+        timing.since_mark("serialize")  # mark used up
+    finally:
+        timing.finish(token)
+    assert 0.01 <= timings.durations["serialize"] < 0.02
+    assert timings.header(0.05).startswith("serialize;dur=")
+
+
+def test_phases_recorded_from_threads_and_tasks():
+    async def request():
+        timings, token = timing.start()
+        try:
+
+            def query():
+                with timing.phase("db"):
+                    time.sleep(0.01)
+
+            await asyncio.to_thread(query)  # like sync_to_async
+            await asyncio.create_task(asyncio.to_thread(query))  # like call_next
+        finally:
+            timing.finish(token)
+        return timings
+
+    assert asyncio.run(request()).durations["db"] >= 0.02
+
+
+def test_query_counts_and_db_headers():
+    timings, token = timing.start()
+    try:
+        for _ in range(3):
+            with timing.query():
+                time.sleep(0.001)
+        with timing.paused(), timing.query():  # e.g. the pool's reset on release
+            pass
+    finally:
+        timing.finish(token)
+    assert timings.queries == 3
+    config = timing.TimingSettings(server_timing=False, query_headers=True)
+    headers = dict(timings.headers(config, 0.01))
+    assert headers["X-DB-Queries"] == "3"
+    assert headers["X-DB-Time"] == f"{timings.durations['db'] * 1000:.2f}ms"
+    assert timing.HEADER not in headers
+    assert [name for name, _ in timings.headers(timing.TimingSettings())] == [
+        timing.HEADER
+    ]
+
+
+def test_timing_settings_from_env():
+    assert timing.timing_settings({}) == timing.TimingSettings()
+    assert timing.timing_settings({}, debug=True).query_headers
+    config = timing.timing_settings(
+        {"SERVER_TIMING": "0", "DB_QUERY_HEADERS": "0", "DB_QUERY_METRICS": "false"},
+        debug=True,
+    )
+    assert not config.enabled
+
+
+def test_query_metrics_per_endpoint():
+    from common.query_metrics import OTHER, QueryMetrics, endpoint
+
+    assert endpoint("GET", "/drf/users/12/") == "GET /drf/users/{id}/"
+    metrics = QueryMetrics(max_endpoints=2)
+    for queries, path in ((2, "/users/1"), (3, "/users/2"), (1, "/roles"), (5, "/x")):
+        timings = timing.Timings()
+        timings.queries = queries
+        timings.add("db", 0.001 * queries)
+        metrics.record("GET", path, timings, 0.01)
+    stats = metrics.stats()
+    assert stats["requests"] == 4 and stats["queries"] == 11
+    row = stats["endpoints"]["GET /users/{id}"]
+    assert row["requests"] == 2 and row["max_queries"] == 3
+    assert row["queries_per_request"] == 2.5 and row["db_ms"] == 5.0
+    assert row["db_share"] == 0.25
+    assert stats["endpoints"][OTHER]["queries"] == 5  # over max_endpoints
+
+
+def test_fastapi_timed_route_and_middleware():
+    from fastapi import APIRouter, FastAPI
+    from fastapi.testclient import TestClient
+
+    from src.middleware import TimingMiddleware
+    from src.routing import TimedRoute
+
+    router = APIRouter(route_class=TimedRoute)
+
+    @router.get("/items/{item_id}")
+    async def get_item(item_id: int, q: str | None = None) -> dict:
+        with timing.query():
+            await asyncio.sleep(0.005)
+        return {"id": item_id, "q": q}
+
+    app = FastAPI()
+    app.add_middleware(
+        TimingMiddleware, config=timing.TimingSettings(query_headers=True)
+    )
+    app.include_router(router, prefix="/v1")
+    response = TestClient(app).get("/v1/items/3?q=x")
+    assert response.json() == {"id": 3, "q": "x"}
+    phases = _phases(response.headers["server-timing"])
+    assert list(phases) == ["db", "serialize", "app", "total"]
+    assert phases["db"] >= 5
+    assert response.headers["x-response-time"] == f"{phases['total']:.2f}ms"
+    assert response.headers["x-db-queries"] == "1"
+
+
+def test_bolt_user_read_has_server_timing(client, test_user):
+    response = client.get(f"/users/{test_user.id}")
+    assert response.status_code == 200
+    phases = _phases(response.headers["server-timing"])
+    assert {"db", "serialize", "app", "total"} <= set(phases)
+    assert "server-timing" in client.get("/roles").headers
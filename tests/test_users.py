@@ -1,4 +1,4 @@
-"""User endpoints: list, search, get by id, me (JWT) — sync, in-process."""
+"""User endpoints: list, search, get by id, batch, me (JWT) — sync, in-process."""
 
 import pytest
 
@@ -50,3 +50,310 @@ def test_users_me_with_jwt(client, test_user):
     assert data["id"] == test_user.id
     assert data["username"] == "admin"
     assert "role" in data
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_batch_request_order_and_missing(client, test_user):
+    """GET /users/batch?ids= returns users in request order and lists unknown ids."""
+    missing_id = test_user.id + 1000
+    r = client.get(f"/users/batch?ids={missing_id},{test_user.id},{test_user.id}")
+    assert r.status_code == 200
+    data = r.json()
+    assert [u["id"] for u in data["items"]] == [test_user.id]
+    assert data["items"][0]["username"] == "admin"
+    assert data["missing"] == [missing_id]
+
+
+def test_users_batch_rejects_bad_ids(client):
+    """GET /users/batch with no, malformed or too many ids returns 400."""
+    assert client.get("/users/batch").status_code == 400
+    assert client.get("/users/batch?ids=1,x").status_code == 400
+    too_many = ",".join(str(i) for i in range(1, 102))
+    assert client.get(f"/users/batch?ids={too_many}").status_code == 400
+
+
+def test_parse_ids():
+    """Ids keep request order, duplicates are dropped, limits are enforced."""
+    from common.batch import parse_ids
+
+    assert parse_ids("3, 1,3,,2") == [3, 1, 2]
+    with pytest.raises(ValueError):
+        parse_ids("")
+    with pytest.raises(ValueError):
+        parse_ids("0")
+    with pytest.raises(ValueError):
+        parse_ids("1,2,3", limit=2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_fastpath_matches_orm(client, test_user, settings):
+    """BOLT_FASTPATH_ROUTES=all serves the same responses as the ORM routes."""
+    from django_bolt import BoltAPI
+    from django_bolt.testing import TestClient
+
+    from api.routes import users
+
+    settings.BOLT_FASTPATH_ROUTES = ["all"]
+    fast_api = BoltAPI()
+    users.register(fast_api)
+    paths = [
+        "/users?page=1&page_size=5",
+        "/users?search=adm&role=ADMIN",
+        f"/users/{test_user.id}",
+        f"/users/{test_user.id + 1000}",
+        f"/users/batch?ids={test_user.id + 1000},{test_user.id}",
+    ]
+    with TestClient(fast_api) as fast_client:
+        for path in paths:
+            orm, fast = client.get(path), fast_client.get(path)
+            assert fast.status_code == orm.status_code, path
+            assert fast.json() == orm.json(), path
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_list_db_render_is_byte_identical(client, test_user, settings):
+    """USERS_LIST_RENDER=db returns the same bytes as the paginated msgspec path."""
+    from django.contrib.auth import get_user_model
+    from django_bolt import BoltAPI
+    from django_bolt.testing import TestClient
+
+    from api.routes import users
+
+    get_user_model().objects.create_user(
+        username='q"uote\\ü', password="x", role="SHOPKEEPER"
+    )
+    settings.USERS_LIST_RENDER = "db"
+    db_api = BoltAPI()
+    users.register(db_api)
+    paths = [
+        "/users",
+        "/users?page=2&page_size=1",
+        "/users?page=99&page_size=1",
+        "/users?role=shopkeeper",
+        "/users?search=nobody",
+    ]
+    with TestClient(db_api) as db_client:
+        for path in paths:
+            python, db = client.get(path), db_client.get(path)
+            assert db.status_code == python.status_code == 200, path
+            assert db.content == python.content, path
+
+
+def test_list_renderer_setting():
+    from common.db_json import list_renderer
+
+    assert list_renderer(None) == "python"
+    assert list_renderer(" DB ") == "db"
+    with pytest.raises(ValueError):
+        list_renderer("orjson")
+
+
+def _staff_token(client, user):
+    user.is_staff = True
+    user.save(update_fields=["is_staff"])
+    r = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    return r.json()["access_token"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_create_duplicate_is_400(client, test_user):
+    """POST /users with a taken username returns 400 from the ON CONFLICT insert."""
+    token = _staff_token(client, test_user)
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"username": "created1", "password": "pw", "role": "shopkeeper"}
+    r = client.post("/users", json=body, headers=headers)
+    assert r.status_code in (200, 201)
+    assert r.json()["role"] == "SHOPKEEPER"
+    assert r.json()["id"]
+
+    r = client.post("/users", json=body, headers=headers)
+    assert r.status_code == 400
+    assert r.json()["detail"] == "Username already exists"
+
+    from django.contrib.auth import get_user_model
+
+    assert get_user_model().objects.get(username="created1").check_password("pw")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_bulk_json_array(client, test_user):
+    """POST /users/bulk creates valid rows and reports per-row errors."""
+    token = _staff_token(client, test_user)
+    rows = [
+        {"username": "bulk1", "password": "pw-1", "role": "shopkeeper"},
+        {"username": "admin", "password": "pw"},
+        {"username": "bulk2", "password": "pw-2", "role": "nope"},
+        {"username": "bulk1", "password": "pw-3"},
+    ]
+    r = client.post(
+        "/users/bulk", json=rows, headers={"Authorization": f"Bearer {token}"}
+    )
+    assert r.status_code == 200
+    data = r.json()
+    assert data["created"] == 1
+    assert data["failed"] == 3
+    assert data["rows_per_sec"] > 0
+    results = data["results"]
+    assert [row["status"] for row in results] == ["created", "error", "error", "error"]
+    assert results[0]["username"] == "bulk1" and results[0]["id"]
+    assert results[1]["error"] == "Username already exists"
+
+    from django.contrib.auth import get_user_model
+
+    user = get_user_model().objects.get(username="bulk1")
+    assert user.role == "SHOPKEEPER"
+    assert user.check_password("pw-1")
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_bulk_normalizes_rows(client, test_user):
+    """Bulk rows are stripped and normalized like POST /users; only created rows count as throughput."""
+    from django.contrib.auth import get_user_model
+
+    headers = {"Authorization": f"Bearer {_staff_token(client, test_user)}"}
+    rows = [
+        {"username": " bulk3 ", "password": "x", "email": " Ann@EXAMPLE.COM "},
+        {"username": "bulk3", "password": "y"},
+    ]
+    data = client.post("/users/bulk", json=rows, headers=headers).json()
+    assert data["created"] == 1
+    assert data["results"][1]["error"] == "Duplicate username in request"
+    user = get_user_model().objects.get(username="bulk3")
+    assert user.email == "Ann@example.com"
+
+    data = client.post("/users/bulk", json=[rows[1]], headers=headers).json()
+    assert data["created"] == 0 and data["failed"] == 1
+    assert data["rows_per_sec"] == 0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_bulk_ndjson(client, test_user):
+    """POST /users/bulk accepts newline-delimited JSON."""
+    token = _staff_token(client, test_user)
+    body = (
+        b'{"username": "nd1", "password": "x"}\n{"username": "nd2", "password": "y"}\n'
+    )
+    r = client.post(
+        "/users/bulk",
+        content=body,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": "application/x-ndjson",
+        },
+    )
+    assert r.status_code == 200
+    assert r.json()["created"] == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_bulk_requires_staff(client, test_user):
+    """POST /users/bulk without staff returns 403."""
+    r = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    token = r.json()["access_token"]
+    r = client.post(
+        "/users/bulk", json=[], headers={"Authorization": f"Bearer {token}"}
+    )
+    assert r.status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_export_ndjson_and_csv(client, test_user):
+    """GET /users/export streams NDJSON by default and CSV with ?format=csv; filters apply."""
+    import json
+
+    token = _staff_token(client, test_user)
+    headers = {"Authorization": f"Bearer {token}"}
+    r = client.get("/users/export?search=adm", headers=headers)
+    assert r.status_code == 200
+    assert r.content
+    assert r.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert rows == [{"id": test_user.id, "username": "admin", "role": "ADMIN"}]
+
+    r = client.get("/users/export?format=csv&role=customer", headers=headers)
+    assert r.status_code == 200
+    assert r.text.splitlines() == ["id,username,role"]
+
+    r = client.get("/users/export?format=csv", headers=headers)
+    assert r.text.splitlines() == ["id,username,role", f"{test_user.id},admin,ADMIN"]
+
+    assert client.get("/users/export?format=xml", headers=headers).status_code == 400
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_users_export_rows_keyset_chunks(test_user):
+    """Export rows are read in id order across keyset chunk boundaries."""
+    from asgiref.sync import sync_to_async
+    from django.contrib.auth import get_user_model
+
+    from api.routes.users import _export_rows
+
+    User = get_user_model()
+    for username in ("exp1", "exp2", "exp3"):
+        await sync_to_async(User.objects.create_user)(username=username, password="x")
+    rows = [row async for row in _export_rows(User.objects.all(), chunk_rows=2)]
+    assert [r[1] for r in rows] == ["admin", "exp1", "exp2", "exp3"]
+    assert [r[0] for r in rows] == sorted(r[0] for r in rows)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_users_export_requires_staff(client, test_user):
+    """GET /users/export without staff returns 401/403."""
+    assert client.get("/users/export").status_code == 401
+    r = client.post("/auth/login", json={"username": "admin", "password": "admin"})
+    token = r.json()["access_token"]
+    r = client.get("/users/export", headers={"Authorization": f"Bearer {token}"})
+    assert r.status_code == 403
+
+
+@pytest.mark.django_db(transaction=True)
+def test_user_role_is_not_null(test_user):
+    """role is NOT NULL (enum user_role on PostgreSQL), so readers never coalesce it."""
+    from django.contrib.auth import get_user_model
+    from django.db import IntegrityError
+
+    with pytest.raises(IntegrityError):
+        get_user_model().objects.filter(pk=test_user.pk).update(role=None)
+
+
+@pytest.mark.django_db(transaction=True)
+async def test_fastapi_list_strategies_agree():
+    """FastAPI GET /users: the "single" COUNT + LATERAL page statement matches "split"."""
+    from asgiref.sync import sync_to_async
+    from django.contrib.auth import get_user_model
+
+    from config.cache import listen_connection
+    from src.routers.users import _fetch_page, _user_filters
+
+    create = sync_to_async(get_user_model().objects.create_user)
+    for username, role in (
+        ("alice", "CUSTOMER"),
+        ("bob", "SHOPKEEPER"),
+        ("alina", "CUSTOMER"),
+        ("carl", "ADMIN"),
+    ):
+        await create(username=username, password="x", role=role)
+
+    cases = [
+        # (search, role, page_size, offset) -> (total, usernames)
+        ((None, None, 2, 0), (4, ["alice", "bob"])),
+        ((None, None, 10, 0), (4, ["alice", "bob", "alina", "carl"])),
+        (("AL", None, 10, 0), (2, ["alice", "alina"])),
+        ((None, "customer", 1, 1), (2, ["alina"])),
+        (("al", "SHOPKEEPER", 10, 0), (0, [])),
+        ((None, None, 10, 40), (4, [])),
+        (("al", None, 10, 2), (2, [])),
+    ]
+    conn = await listen_connection()
+    try:
+        for (search, role, limit, offset), expected in cases:
+            shape, args = _user_filters(search, role)
+            pages = {}
+            for strategy in ("single", "split"):
+                total, rows = await _fetch_page(
+                    conn, shape, args, limit, offset, strategy
+                )
+                pages[strategy] = (total, [r["username"] for r in rows])
+            assert pages["single"] == pages["split"] == expected, (search, role)
+    finally:
+        await conn.close()
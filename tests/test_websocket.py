@@ -1,4 +1,6 @@
-"""WebSocket /ws echo endpoint (in-process WebSocketTestClient)."""
+"""WebSocket /ws echo and /ws/broadcast endpoints (in-process WebSocketTestClient)."""
+
+import asyncio
 
 import pytest
 
@@ -12,3 +14,111 @@ async def test_ws_echo(api):
         await ws.send_text("hello")
         reply = await ws.receive_text()
     assert "hello" in reply or "echo" in reply.lower()
+
+
+@pytest.mark.asyncio
+async def test_ws_echo_json_envelope(api):
+    """JSON text frames come back wrapped in {"echo": ...} with the payload untouched."""
+    from django_bolt.testing import WebSocketTestClient
+
+    async with WebSocketTestClient(api, "/ws") as ws:
+        await ws.send_text('{"seq": 1, "msg": "ping"}')
+        reply = await ws.receive_json()
+    assert reply == {"echo": {"seq": 1, "msg": "ping"}}
+
+
+@pytest.mark.asyncio
+async def test_ws_echo_binary(api):
+    """Binary frames are echoed as binary (JSON enveloped, other bytes prefixed)."""
+    from django_bolt.testing import WebSocketTestClient
+
+    async with WebSocketTestClient(api, "/ws") as ws:
+        await ws.send_bytes(b"[1,2,3]")
+        assert await ws.receive_bytes() == b'{"echo":[1,2,3]}'
+        await ws.send_bytes(b"\x00\x01")
+        assert await ws.receive_bytes() == b"Echo: \x00\x01"
+
+
+@pytest.mark.asyncio
+async def test_ws_echo_batch(api):
+    """With ?batch=1 newline-delimited messages are echoed in one frame."""
+    from django_bolt.testing import WebSocketTestClient
+
+    async with WebSocketTestClient(api, "/ws", query_string="batch=1") as ws:
+        await ws.send_text('{"a":1}\nhello\n2')
+        reply = await ws.receive_text()
+    assert reply == '{"echo":{"a":1}}\nEcho: hello\n{"echo":2}'
+
+
+def test_echo_helpers_do_not_reencode():
+    """The envelope splices the original payload, whitespace included."""
+    from api.routes.websocket import echo_bytes, echo_text, is_json
+
+    assert echo_text('{"a": 1}') == '{"echo":{"a": 1}}'
+    assert echo_text("not json") == "Echo: not json"
+    assert echo_bytes(b'"s"') == b'{"echo":"s"}'
+    assert not is_json('{"a": 1')
+
+
+@pytest.mark.asyncio
+async def test_ws_broadcast_fan_out(api):
+    """A frame from a publish-only client reaches every subscriber unchanged."""
+    from django_bolt.testing import WebSocketTestClient
+
+    async with (
+        WebSocketTestClient(api, "/ws/broadcast") as sub1,
+        WebSocketTestClient(api, "/ws/broadcast") as sub2,
+        WebSocketTestClient(api, "/ws/broadcast", query_string="subscribe=0") as pub,
+    ):
+        await asyncio.sleep(0.05)
+        await pub.send_text('{"n":1}')
+        assert await sub1.receive_text() == '{"n":1}'
+        assert await sub2.receive_text() == '{"n":1}'
+
+
+class _SlowWebSocket:
+    """Stand-in WebSocket whose sends never complete."""
+
+    def __init__(self):
+        self.closed_with = None
+
+    async def send_text(self, data):
+        await asyncio.Event().wait()
+
+    async def close(self, code=1000, reason=""):
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_broadcast_hub_drop_policy_keeps_newest():
+    """With policy "drop" a full queue evicts its oldest frame."""
+    from api.broadcast import BroadcastHub
+
+    hub = BroadcastHub(queue_size=2, policy="drop")
+    subscriber = hub.subscribe(_SlowWebSocket())
+    await asyncio.sleep(0)
+    for frame in ("a", "b", "c", "d"):
+        hub.publish(frame)
+    assert hub.dropped == 2
+    assert [subscriber.queue.get_nowait() for _ in range(2)] == ["c", "d"]
+    await hub.unsubscribe(subscriber)
+    assert len(hub) == 0
+
+
+@pytest.mark.asyncio
+async def test_broadcast_hub_disconnect_policy():
+    """With policy "disconnect" a slow subscriber is removed and closed with 1008."""
+    from api.broadcast import BroadcastHub
+
+    hub = BroadcastHub(queue_size=1, policy="disconnect")
+    websocket = _SlowWebSocket()
+    hub.subscribe(websocket)
+    await asyncio.sleep(0)
+    for frame in ("a", "b", "c"):
+        hub.publish(frame)
+    assert len(hub._pending) == 1
+    await asyncio.sleep(0.01)
+    assert hub.disconnected == 1
+    assert not hub._pending
+    assert len(hub) == 0
+    assert websocket.closed_with == 1008